@@ -1,5 +1,6 @@
-from typing import Optional, List, Union, Dict
+from typing import Optional, List, Union, Dict, Iterable, Iterator
 
+import numpy as np
 import pandas as pd
 
 from Dane.Dane import wczytaj_csv, _optymalizuj_pamiec
@@ -83,6 +84,75 @@ def usun_duplikaty(
             'liczba_duplikatow': 0
         }
 
+
+def usun_duplikaty_strumieniowo(
+    chunki: Iterable[pd.DataFrame],
+    kolumny: Optional[List[str]] = None,
+    wyswietlaj_info: bool = True
+) -> Iterator[pd.DataFrame]:
+    """
+    Strumieniowa wersja usun_duplikaty (tryb 'pierwszy') dla porcji
+    z wczytaj_csv_strumieniowo.
+
+    Zamiast widzianych wierszy pamiętana jest posortowana tablica ich 64-bitowych
+    skrótów (8 bajtów na unikalny wiersz), więc pamięć nie zależy od szerokości danych.
+    Wiersze są porównywane wyłącznie po skrócie: dwa różne wiersze o tym samym
+    skrócie zostaną uznane za duplikat i drugi z nich zostanie pominięty bez
+    ostrzeżenia. Prawdopodobieństwo takiej kolizji dla n unikalnych wierszy wynosi
+    około n² / 2^65 (ok. 3e-8 dla 10 mln wierszy); jeśli nawet ono jest
+    nieakceptowalne, należy użyć usun_duplikaty na całym DataFrame.
+    Tryby 'ostatni' i 'wszystkie' wymagają znajomości dalszej części pliku,
+    dlatego nie mają wersji strumieniowej.
+
+    Parametry:
+    ---------
+    chunki : Iterable[pd.DataFrame]
+        Kolejne porcje danych.
+    kolumny : List[str], opcjonalnie
+        Lista kolumn, na podstawie których sprawdzamy duplikaty.
+        Jeśli None, sprawdzane są wszystkie kolumny.
+    wyswietlaj_info : bool
+        Czy wyświetlać informacje diagnostyczne.
+
+    Zwraca:
+    -------
+    Iterator[pd.DataFrame]
+        Porcje bez wierszy powtarzających się w bieżącej lub wcześniejszych porcjach.
+    """
+    widziane = np.empty(0, dtype=np.uint64)
+    liczba_duplikatow = 0
+    liczba_wierszy = 0
+
+    for chunk in chunki:
+        if kolumny:
+            nieistniejace = [col for col in kolumny if col not in chunk.columns]
+            if nieistniejace:
+                raise ValueError(f"Brakujące kolumny: {nieistniejace}")
+            klucze = kolumny
+        else:
+            klucze = chunk.columns.tolist()
+
+        skroty = pd.util.hash_pandas_object(chunk[klucze], index=False).to_numpy()
+
+        # Duplikaty wewnątrz porcji i względem poprzednich porcji
+        maska = pd.Series(skroty).duplicated().to_numpy()
+        if len(widziane):
+            pozycje = np.minimum(np.searchsorted(widziane, skroty), len(widziane) - 1)
+            maska |= widziane[pozycje] == skroty
+
+        # Wstawienie tylko nowych skrótów w miejsca z searchsorted - bez ponownego
+        # sortowania całej tablicy widzianych przy każdej porcji
+        nowe = np.sort(skroty[~maska])
+        widziane = np.insert(widziane, np.searchsorted(widziane, nowe), nowe)
+        liczba_duplikatow += int(maska.sum())
+        liczba_wierszy += len(chunk)
+
+        yield chunk[~maska]
+
+    if wyswietlaj_info:
+        print(f"[INFO] Liczba wierszy przed: {liczba_wierszy}, po: {liczba_wierszy - liczba_duplikatow}")
+        print(f"[INFO] Usunięto {liczba_duplikatow} duplikatów")
+
 # df = wczytaj_csv(
 #     sciezka_pliku="online_retail_II.csv",
 #     kolumny_daty=["InvoiceDate"],
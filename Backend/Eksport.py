@@ -0,0 +1,252 @@
+from typing import Optional, Callable, Tuple, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+import bz2
+import importlib.util
+import lzma
+import os
+import zlib
+
+import pandas as pd
+
+
+# Domyślna liczba wierszy zapisywanych w jednej porcji (grupie wierszy Parquet, rekordzie Arrow)
+ROZMIAR_PORCJI_EKSPORTU = 100_000
+
+# Rozszerzenia plików -> (format, kompresja)
+ROZSZERZENIA_EKSPORTU = {
+    '.parquet': ('parquet', 'snappy'),
+    '.pq': ('parquet', 'snappy'),
+    '.feather': ('feather', 'lz4'),
+    '.arrow': ('feather', 'lz4'),
+    '.csv': ('csv', None),
+    '.csv.gz': ('csv', 'gzip'),
+    '.csv.bz2': ('csv', 'bz2'),
+    '.csv.xz': ('csv', 'xz'),
+}
+
+# Zstandard jest opcjonalny - .csv.zst tylko, gdy pakiet zstandard jest zainstalowany
+if importlib.util.find_spec('zstandard') is not None:
+    ROZSZERZENIA_EKSPORTU['.csv.zst'] = ('csv', 'zstd')
+
+
+def eksportuj_dane(
+        df: pd.DataFrame,
+        sciezka_pliku: str,
+        format: Optional[str] = None,
+        kompresja: Optional[str] = None,
+        rozmiar_porcji: int = ROZMIAR_PORCJI_EKSPORTU,
+        liczba_watkow: Optional[int] = None,
+        postep: Optional[Callable[[int, int], None]] = None,
+        wyswietlaj_informacje: bool = False
+) -> str:
+    """
+    Zapisuje DataFrame do pliku CSV (także skompresowanego), Parquet lub Feather.
+
+    Dane są zapisywane porcjami po rozmiar_porcji wierszy, więc dodatkowa
+    pamięć zależy od rozmiaru porcji, a nie całego DataFrame'u. W CSV porcje
+    są kompresowane równolegle w puli wątków (zlib, bz2, lzma i zstd zwalniają
+    GIL) jako kolejne, niezależne strumienie - ich połączenie jest poprawnym
+    plikiem .gz/.bz2/.xz/.zst. Plik powstaje pod nazwą tymczasową i jest
+    podmieniany dopiero po udanym zapisie.
+
+    Parametry:
+    ---------
+    df : pd.DataFrame
+        Dane do zapisu
+    sciezka_pliku : str
+        Ścieżka pliku wynikowego
+    format : str, opcjonalnie
+        'csv', 'parquet' lub 'feather'. Jeśli None, wynika z rozszerzenia pliku.
+    kompresja : str, opcjonalnie
+        CSV: None, 'gzip', 'bz2', 'xz', 'zstd'; Parquet: 'snappy', 'zstd', 'gzip'...;
+        Feather: 'lz4', 'zstd' lub None. Jeśli None, wynika z rozszerzenia pliku.
+    rozmiar_porcji : int
+        Liczba wierszy w jednej porcji zapisu
+    liczba_watkow : int, opcjonalnie
+        Liczba wątków kompresji CSV (domyślnie liczba rdzeni)
+    postep : Callable[[int, int], None], opcjonalnie
+        Funkcja wywoływana z (zapisane wiersze, wszystkie wiersze) po każdej porcji.
+        Może być wywoływana z wątku roboczego.
+    wyswietlaj_informacje : bool
+        Czy wyświetlać informacje diagnostyczne
+
+    Zwraca:
+    ------
+    str
+        Ścieżka zapisanego pliku
+    """
+    format_z_nazwy, kompresja_z_nazwy = _format_z_rozszerzenia(sciezka_pliku)
+    format = format or format_z_nazwy
+    if format not in ('csv', 'parquet', 'feather'):
+        raise ValueError("Parametr 'format' musi być 'csv', 'parquet' lub 'feather'.")
+    if kompresja is None and format == format_z_nazwy:
+        kompresja = kompresja_z_nazwy
+
+    if wyswietlaj_informacje:
+        print(f"[INFO] Eksport {len(df)} wierszy do {os.path.basename(sciezka_pliku)} "
+              f"(format: {format}, kompresja: {kompresja})")
+
+    rozmiar_porcji = max(1, rozmiar_porcji)
+    tymczasowa = f"{sciezka_pliku}.{os.getpid()}.tmp"
+    try:
+        if format == 'csv':
+            _zapisz_csv(df, tymczasowa, kompresja, rozmiar_porcji, liczba_watkow, postep)
+        else:
+            _zapisz_arrow(df, tymczasowa, format, kompresja, rozmiar_porcji, postep)
+        os.replace(tymczasowa, sciezka_pliku)
+    except Exception:
+        if os.path.exists(tymczasowa):
+            os.remove(tymczasowa)
+        raise
+
+    if wyswietlaj_informacje:
+        print(f"[SUKCES] Zapisano {sciezka_pliku} ({os.path.getsize(sciezka_pliku) / 1024**2:.1f} MB)")
+    return sciezka_pliku
+
+
+def _format_z_rozszerzenia(sciezka_pliku: str) -> Tuple[str, Optional[str]]:
+    """Format i kompresja na podstawie rozszerzenia (najdłuższe pasujące), domyślnie CSV"""
+    nazwa = sciezka_pliku.lower()
+    for rozszerzenie in sorted(ROZSZERZENIA_EKSPORTU, key=len, reverse=True):
+        if nazwa.endswith(rozszerzenie):
+            return ROZSZERZENIA_EKSPORTU[rozszerzenie]
+    return 'csv', None
+
+
+def _kompresor(kompresja: Optional[str]) -> Callable[[bytes], bytes]:
+    """Funkcja kompresująca jedną porcję do samodzielnego strumienia (członka pliku)"""
+    if kompresja is None:
+        return lambda dane: dane
+    if kompresja == 'gzip':
+        # wbits=31 - pełny nagłówek i stopka gzip, jak przy gzip.compress
+        def gzip_porcja(dane: bytes) -> bytes:
+            kompresor = zlib.compressobj(6, zlib.DEFLATED, 31)
+            return kompresor.compress(dane) + kompresor.flush()
+        return gzip_porcja
+    if kompresja == 'bz2':
+        return lambda dane: bz2.compress(dane, 9)
+    if kompresja == 'xz':
+        # Niski preset - przy eksporcie liczy się czas, domyślny preset 6 jest kilkukrotnie wolniejszy
+        return lambda dane: lzma.compress(dane, preset=1)
+    if kompresja == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Kompresja zstd wymaga pakietu zstandard. Zainstaluj go: pip install zstandard")
+        return lambda dane: zstandard.ZstdCompressor(level=3).compress(dane)
+    raise ValueError(f"Nieobsługiwana kompresja CSV: {kompresja}")
+
+
+def _zapisz_csv(df: pd.DataFrame, sciezka_pliku: str, kompresja: Optional[str],
+                rozmiar_porcji: int, liczba_watkow: Optional[int],
+                postep: Optional[Callable[[int, int], None]]) -> None:
+    """CSV porcjami: formatowanie w wątku głównym, kompresja porcji w puli wątków"""
+    kompresuj = _kompresor(kompresja)
+    liczba_watkow = liczba_watkow or os.cpu_count() or 1
+    calosc = len(df)
+    formaty_dat = _formaty_dat(df)
+
+    with open(sciezka_pliku, 'wb') as plik, ThreadPoolExecutor(max_workers=liczba_watkow) as pula:
+        w_toku = []  # (zadanie, liczba wierszy) - w kolejności pliku
+        zapisane = 0
+
+        def zapisz_najstarsza():
+            nonlocal zapisane
+            zadanie, wiersze = w_toku.pop(0)
+            plik.write(zadanie.result())
+            zapisane += wiersze
+            if postep:
+                postep(zapisane, calosc)
+
+        for start in range(0, max(calosc, 1), rozmiar_porcji):
+            porcja = df.iloc[start:start + rozmiar_porcji]
+            if formaty_dat:
+                # Format dat ustalony dla całej kolumny - pandas wybierałby go osobno dla każdej porcji
+                porcja = porcja.assign(**{kolumna: porcja[kolumna].dt.strftime(fmt)
+                                          for kolumna, fmt in formaty_dat.items()})
+            tekst = porcja.to_csv(index=False, header=(start == 0)).encode('utf-8')
+            w_toku.append((pula.submit(kompresuj, tekst), len(porcja)))
+            # Ograniczenie liczby porcji w pamięci
+            if len(w_toku) >= 2 * liczba_watkow:
+                zapisz_najstarsza()
+
+        while w_toku:
+            zapisz_najstarsza()
+
+
+def _formaty_dat(df: pd.DataFrame) -> Dict[str, str]:
+    """
+    Format zapisu każdej kolumny dat (bez strefy czasowej) wyznaczony z całej
+    kolumny tak jak robi to df.to_csv: sama data, gdy wszystkie godziny to północ,
+    mikrosekundy tylko, gdy występują
+    """
+    formaty = {}
+    for kolumna in df.columns:
+        seria = df[kolumna]
+        if not pd.api.types.is_datetime64_any_dtype(seria) or getattr(seria.dt, 'tz', None) is not None:
+            continue
+        seria = seria.dropna()
+        if (seria == seria.dt.normalize()).all():
+            formaty[kolumna] = '%Y-%m-%d'
+        elif (seria.dt.microsecond == 0).all():
+            formaty[kolumna] = '%Y-%m-%d %H:%M:%S'
+        else:
+            formaty[kolumna] = '%Y-%m-%d %H:%M:%S.%f'
+    return formaty
+
+
+def _zapisz_arrow(df: pd.DataFrame, sciezka_pliku: str, format: str, kompresja: Optional[str],
+                  rozmiar_porcji: int, postep: Optional[Callable[[int, int], None]]) -> None:
+    """Parquet (grupa wierszy na porcję) lub Feather/Arrow IPC (rekord na porcję)"""
+    import pyarrow as pa
+
+    schemat, tekstowe = _schemat_arrow(df)
+    calosc = len(df)
+
+    if format == 'parquet':
+        import pyarrow.parquet as pq
+        zapisujacy = pq.ParquetWriter(sciezka_pliku, schemat, compression=kompresja or 'none')
+        zapisz = zapisujacy.write_table
+    else:
+        opcje = pa.ipc.IpcWriteOptions(compression=kompresja, use_threads=True)
+        zapisujacy = pa.ipc.new_file(sciezka_pliku, schemat, options=opcje)
+        zapisz = zapisujacy.write_table
+
+    try:
+        for start in range(0, calosc, rozmiar_porcji):
+            porcja = df.iloc[start:start + rozmiar_porcji]
+            if tekstowe:
+                porcja = porcja.assign(**{kolumna: porcja[kolumna].astype(str).where(porcja[kolumna].notna())
+                                          for kolumna in tekstowe})
+            zapisz(pa.Table.from_pandas(porcja, schema=schemat, preserve_index=False))
+            if postep:
+                postep(min(start + rozmiar_porcji, calosc), calosc)
+    finally:
+        zapisujacy.close()
+
+
+def _schemat_arrow(df: pd.DataFrame):
+    """
+    Wspólny schemat Arrow dla wszystkich porcji. Typy kolumn object są
+    wnioskowane z wszystkich niepustych wartości kolumny (kolejno, po jednej kolumnie);
+    kolumny o wartościach niezgodnych typów (np. liczby i tekst) zapisywane są
+    jako tekst. Zwraca (schemat, lista kolumn do zamiany na tekst).
+    """
+    import pyarrow as pa
+
+    schemat = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    tekstowe = []
+    for i, pole in enumerate(schemat):
+        if df[pole.name].dtype != object:
+            continue
+        wartosci = df[pole.name].dropna()
+        try:
+            # Pełna konwersja kolumny (infer_type nie sprawdza wszystkich wartości)
+            typ = pa.array(wartosci, from_pandas=True).type if len(wartosci) else pa.string()
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            typ = pa.string()
+            tekstowe.append(pole.name)
+        if pa.types.is_null(typ):
+            typ = pa.string()
+        schemat = schemat.set(i, pole.with_type(typ))
+    return schemat, tekstowe
@@ -3,7 +3,7 @@ from typing import Union, List, Dict
 import numpy as np
 import pandas as pd
 
-from Dane.Dane import _optymalizuj_pamiec, wczytaj_csv
+from Dane.Dane import _optymalizuj_pamiec, _jako_liczby_obliczen, wczytaj_csv
 
 
 def jedno_gorace_kodowanie(
@@ -68,8 +68,9 @@ def jedno_gorace_kodowanie(
                 print(f"[INFO] Zakodowano kolumnę '{kolumna}' metodą One-Hot")
                 print(f"  Wartości unikalne: {wartosci_unikalne}")
 
-        # Optymalizacja pamięci po kodowaniu
-        df_zakodowany = _optymalizuj_pamiec(df_zakodowany)
+        # Optymalizacja pamięci po kodowaniu (tylko nowe kolumny)
+        nowe_kolumny = [col for col in df_zakodowany.columns if col not in df.columns]
+        df_zakodowany = _optymalizuj_pamiec(df_zakodowany, kolumny=nowe_kolumny)
 
         if wyswietl_informacje:
             print(f"[INFO] Nowy rozmiar danych: {df_zakodowany.shape}")
@@ -177,8 +178,9 @@ def binarne_kodowanie(
                 print(f"  Liczba bitów: {liczba_bitow}")
                 print(f"  Przykładowe mapowania: {dict(list(mapping.items())[:3])}...")
 
-        # Optymalizacja pamięci po kodowaniu
-        df_zakodowany = _optymalizuj_pamiec(df_zakodowany)
+        # Optymalizacja pamięci po kodowaniu (tylko nowe kolumny)
+        nowe_kolumny = [col for col in df_zakodowany.columns if col not in df.columns]
+        df_zakodowany = _optymalizuj_pamiec(df_zakodowany, kolumny=nowe_kolumny)
 
         if wyswietlaj_informacje:
             print(f"[INFO] Nowy rozmiar danych: {df_zakodowany.shape}")
@@ -285,7 +287,8 @@ def kodowanie_docelowe(
             mapowania[kolumna] = mapping
 
             # Zamieniamy wartości kategoryczne na zakodowane średnie
-            df_encoded[f"{kolumna}_target"] = df_encoded[kolumna].map(mapping).fillna(globalna_srednia)
+            df_encoded[f"{kolumna}_target"] = _jako_liczby_obliczen(
+                df_encoded[kolumna].map(mapping).astype(float).fillna(globalna_srednia))
 
             if wyswietlaj_informacje:
                 print(f"[INFO] Zakodowano kolumne '{kolumna}' metoda Target Encoding")
@@ -295,8 +298,8 @@ def kodowanie_docelowe(
         # Usun oryginalne kolumny kategoryczne
         df_encoded = df_encoded.drop(columns=kolumny)
 
-        # Optymalizacja pamięci po kodowaniu
-        df_encoded = _optymalizuj_pamiec(df_encoded)
+        # Optymalizacja pamięci po kodowaniu (tylko nowe kolumny)
+        df_encoded = _optymalizuj_pamiec(df_encoded, kolumny=[f"{kolumna}_target" for kolumna in kolumny])
 
         if wyswietlaj_informacje:
             print(f"[INFO] Nowy rozmiar danych: {df_encoded.shape}")
@@ -1,8 +1,9 @@
 import pandas as pd
 import numpy as np
-from typing import Optional, Dict, List, Union, Any
+from typing import Optional, Dict, List, Union, Any, Iterable, Iterator
 
-from Dane.Dane import _optymalizuj_pamiec, wczytaj_csv
+from Backend.Statystyka import oblicz_statystyki_strumieniowo
+from Dane.Dane import _optymalizuj_pamiec, _jako_liczby_obliczen, wczytaj_csv
 
 
 def minmax_scaler(
@@ -57,15 +58,17 @@ def minmax_scaler(
                     print(f"[UWAGA] Kolumna '{kolumna}' ma stałą wartość - zostanie pominięta.")
                 continue
 
-            wynik_df[kolumna] = (wynik_df[kolumna] - min_val) / (max_val - min_val)
+            # Obliczenia w typie z polityki typów (float32 domyślnie), bez powrotu do float64
+            wartosci = _jako_liczby_obliczen(wynik_df[kolumna])
+            wynik_df[kolumna] = (wartosci - wartosci.dtype.type(min_val)) / wartosci.dtype.type(max_val - min_val)
             skale[kolumna] = (min_val, max_val)
 
             if wyswietlaj_informacje:
                 print(f"[INFO] Skalowano kolumnę '{kolumna}' do zakresu [0, 1]")
                 print(f"  Min: {min_val:.4f}, Max: {max_val:.4f}")
 
-        # Optymalizacja pamięci
-        wynik_df = _optymalizuj_pamiec(wynik_df)
+        # Optymalizacja pamięci (tylko kolumny przeskalowane)
+        wynik_df = _optymalizuj_pamiec(wynik_df, kolumny=list(skale))
 
         # Zwróć tylko DataFrame lub pełny słownik z informacjami
         if zwroc_tylko_dane:
@@ -116,13 +119,99 @@ def standard_scaler(
             if wyswietlaj_informacje:
                 print(f"[UWAGA] {c}: stała wartość, pomijam")
             continue
-        wynik_df[c] = (wynik_df[c] - μ) / σ
+        wartosci = _jako_liczby_obliczen(wynik_df[c])
+        wynik_df[c] = (wartosci - wartosci.dtype.type(μ)) / wartosci.dtype.type(σ)
         skale.loc[c] = [μ,σ]
         if wyswietlaj_informacje:
             print(f"[INFO] Standaryzowano {c}: mean={μ:.4f}, std={σ:.4f}")
 
-    wynik_df = _optymalizuj_pamiec(wynik_df)
+    wynik_df = _optymalizuj_pamiec(wynik_df, kolumny=skale.dropna().index.tolist())
 
     if zwroc_tylko_dane:
         return wynik_df
     return {'df_scaled': wynik_df, 'skale': skale}
+
+
+def dopasuj_skale_strumieniowo(
+        chunki: Iterable[pd.DataFrame],
+        kolumny: Optional[List[str]] = None,
+        metoda: str = 'minmax'
+) -> Union[Dict[str, tuple], pd.DataFrame]:
+    """
+    Wyznacza parametry skalowania w jednym przebiegu po porcjach z wczytaj_csv_strumieniowo.
+
+    Parametry:
+    ---------
+    chunki : Iterable[pd.DataFrame]
+        Kolejne porcje danych.
+    kolumny : List[str], opcjonalnie
+        Lista kolumn do skalowania. Jeśli None, wszystkie kolumny numeryczne.
+    metoda : str
+        'minmax' lub 'standard'.
+
+    Zwraca:
+    -------
+    Union[Dict[str, tuple], pd.DataFrame]
+        Parametry w formacie klucza 'skale' z minmax_scaler ({'kolumna': (min, max)})
+        lub standard_scaler (DataFrame z kolumnami 'mean' i 'std').
+        Kolumny o stałej wartości są pomijane, tak jak w wersjach nie-strumieniowych.
+    """
+    if metoda not in ('minmax', 'standard'):
+        raise ValueError("Metoda musi być 'minmax' lub 'standard'.")
+
+    statystyki = oblicz_statystyki_strumieniowo(chunki, kolumny)
+    if not statystyki:
+        raise ValueError("Brak kolumn numerycznych do skalowania.")
+
+    if metoda == 'minmax':
+        return {kol: (st['min'], st['max']) for kol, st in statystyki.items() if st['min'] != st['max']}
+
+    skale = pd.DataFrame(index=list(statystyki), columns=['mean', 'std'], dtype=float)
+    for kol, st in statystyki.items():
+        n = st['liczba_wartości']
+        # standard_scaler używa odchylenia z próby (ddof=1)
+        std = st['odchylenie_std'] * np.sqrt(n / (n - 1)) if n > 1 else 0.0
+        if std != 0:
+            skale.loc[kol] = [st['średnia'], std]
+    return skale
+
+
+def skaluj_strumieniowo(
+        chunki: Iterable[pd.DataFrame],
+        skale: Union[Dict[str, tuple], pd.DataFrame],
+        wyswietlaj_informacje: bool = False
+) -> Iterator[pd.DataFrame]:
+    """
+    Skaluje kolejne porcje danych wcześniej wyznaczonymi parametrami.
+
+    Parametry:
+    ---------
+    chunki : Iterable[pd.DataFrame]
+        Kolejne porcje danych.
+    skale : Union[Dict[str, tuple], pd.DataFrame]
+        Parametry z klucza 'skale' minmax_scaler/standard_scaler
+        lub z dopasuj_skale_strumieniowo.
+    wyswietlaj_informacje : bool
+        Czy wyświetlać informacje diagnostyczne.
+
+    Zwraca:
+    -------
+    Iterator[pd.DataFrame]
+        Przeskalowane porcje
+    """
+    if isinstance(skale, pd.DataFrame):
+        parametry = {kol: (wiersz['mean'], wiersz['std']) for kol, wiersz in skale.dropna().iterrows()}
+    else:
+        # MinMax: (x - min) / (max - min) to przesunięcie o min i podział przez zakres
+        parametry = {kol: (mn, mx - mn) for kol, (mn, mx) in skale.items()}
+
+    for numer, chunk in enumerate(chunki):
+        wynik = chunk.copy()
+        for kolumna, (przesuniecie, dzielnik) in parametry.items():
+            if kolumna in wynik.columns:
+                wartosci = _jako_liczby_obliczen(wynik[kolumna])
+                typ = wartosci.dtype.type
+                wynik[kolumna] = (wartosci - typ(przesuniecie)) / typ(dzielnik)
+        if wyswietlaj_informacje:
+            print(f"[INFO] Przeskalowano porcję {numer + 1}: {len(wynik)} wierszy")
+        yield wynik
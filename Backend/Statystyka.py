@@ -1,14 +1,40 @@
 import pandas as pd
 import numpy as np
-from typing import Optional, List, Dict, Union, Tuple, Any
+from typing import Optional, List, Dict, Union, Tuple, Any, Iterable, Callable
 import os
-from Dane.Dane import wczytaj_csv
+import copy
+import math
+from concurrent.futures import ProcessPoolExecutor
+from Dane.Dane import wczytaj_csv, wczytaj_csv_strumieniowo
+
+
+# Maksymalny rozmiar bloku float64 (wiersze x kolumny) w oblicz_statystyki_blokowo
+PAMIEC_BLOKU_STATYSTYK = 64 * 1024**2
+
+# Domyślny docelowy błąd rangi szkicu kwantyli (1% liczby wartości)
+DOMYSLNY_BLAD_KWANTYLI = 0.01
+
+# Domyślny względny błąd standardowy HyperLogLog (liczba unikalnych wartości)
+DOMYSLNY_BLAD_UNIKALNYCH = 0.01
+
+# Liczba liczników Space-Saving (najczęstsze wartości)
+LICZBA_LICZNIKOW_NAJCZESTSZYCH = 100
+
+# Liczba najczęstszych wartości zwracanych w statystykach nie-numerycznych
+LICZBA_NAJCZESTSZYCH = 10
 
 
 def oblicz_statystyki_nie_numeryczne(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
     """
     Oblicza statystyki dla kolumn nie-numerycznych.
 
+    Tryb dokładny opiera się na jednym value_counts() na kolumnę (liczba
+    unikalnych, najczęstsza wartość i jej częstość z tych samych zliczeń);
+    długości tekstu liczone są na unikalnych wartościach ważonych licznościami,
+    więc kolumna kategoryczna nie jest zamieniana na miliony napisów.
+    Dla danych porcjowanych lub większych niż pamięć przybliżone statystyki
+    (szkice HyperLogLog i Space-Saving) daje oblicz_statystyki_nie_numeryczne_strumieniowo.
+
     Parametry:
     ---------
     df : pd.DataFrame
@@ -17,7 +43,8 @@ def oblicz_statystyki_nie_numeryczne(df: pd.DataFrame) -> Dict[str, Dict[str, An
     Zwraca:
     ------
     Dict[str, Dict[str, Any]]
-        Słownik ze statystykami dla każdej kolumny nie-numerycznej
+        Słownik ze statystykami dla każdej kolumny nie-numerycznej; 'najczestsze'
+        to lista (wartość, liczba, błąd) dla LICZBA_NAJCZESTSZYCH wartości
     """
     if not isinstance(df, pd.DataFrame):
         raise ValueError("Parametr df musi być typu pandas.DataFrame")
@@ -26,26 +53,62 @@ def oblicz_statystyki_nie_numeryczne(df: pd.DataFrame) -> Dict[str, Dict[str, An
 
     for kolumna in df.columns:
         if not pd.api.types.is_numeric_dtype(df[kolumna]):
+            # Jedno haszowanie kolumny: zliczenia wartości (bez braków)
+            zliczenia = _zliczenia_wartosci(df[kolumna])
+
             # Pomiń puste kolumny
-            if df[kolumna].isna().all():
+            if zliczenia.empty:
                 continue
 
-            # Obliczanie statystyk
-            wartosci = df[kolumna].dropna()
+            liczba_wystapien = int(zliczenia.sum())
+            najczestsze = zliczenia.iloc[:LICZBA_NAJCZESTSZYCH]
+            dlugosc_min, dlugosc_max, suma_dlugosci = _dlugosci_tekstu(zliczenia)
             statystyki[kolumna] = {
-                'liczba_wystapien': len(wartosci),
-                'wartosci_unikalne': wartosci.nunique(),
-                'najczestsza_wartosc': wartosci.mode().iloc[0] if not wartosci.empty else None,
-                'czestotliwosc_najczestszej': wartosci.value_counts().max() / len(wartosci),
-                'procent_wypelnienia': (len(wartosci) / len(df)) * 100,
-                'dlugosc_min': wartosci.astype(str).str.len().min() if not wartosci.empty else 0,
-                'dlugosc_max': wartosci.astype(str).str.len().max() if not wartosci.empty else 0,
-                'dlugosc_srednia': wartosci.astype(str).str.len().mean() if not wartosci.empty else 0
+                'liczba_wystapien': liczba_wystapien,
+                'wartosci_unikalne': len(zliczenia),
+                'najczestsza_wartosc': _najczestsza(zliczenia),
+                'czestotliwosc_najczestszej': zliczenia.iloc[0] / liczba_wystapien,
+                'procent_wypelnienia': (liczba_wystapien / len(df)) * 100,
+                'dlugosc_min': dlugosc_min,
+                'dlugosc_max': dlugosc_max,
+                'dlugosc_srednia': suma_dlugosci / liczba_wystapien,
+                'najczestsze': [(wartosc, int(liczba), 0) for wartosc, liczba in najczestsze.items()]
             }
 
     return statystyki
 
 
+def _zliczenia_wartosci(kolumna: pd.Series) -> pd.Series:
+    """Zliczenia wartości bez braków, malejąco (kategorie nieobecne w danych pominięte)"""
+    zliczenia = kolumna.value_counts(dropna=True, sort=True)
+    if isinstance(kolumna.dtype, pd.CategoricalDtype):
+        zliczenia = zliczenia[zliczenia > 0]
+        zliczenia.index = zliczenia.index.astype(object)
+    return zliczenia
+
+
+def _najczestsza(zliczenia: pd.Series) -> Any:
+    """Najczęstsza wartość jak w Series.mode(): przy remisie najmniejsza"""
+    remis = zliczenia.index[zliczenia.to_numpy() == zliczenia.iloc[0]]
+    try:
+        return min(remis)
+    except TypeError:
+        # Wartości nieporównywalne (różne typy) - pierwsza z remisu
+        return remis[0]
+
+
+def _dlugosci_tekstu(zliczenia: pd.Series) -> Tuple[int, int, int]:
+    """
+    Minimalna, maksymalna i łączna długość tekstowej postaci wartości na podstawie
+    ich zliczeń (_zliczenia_wartosci): tekst powstaje raz dla każdej unikalnej
+    wartości - dla kategorii to słownik kategorii - a suma jest ważona licznościami
+    """
+    if zliczenia.empty:
+        return 0, 0, 0
+    dlugosci = zliczenia.index.astype(str).str.len().to_numpy(dtype=np.int64)
+    return int(dlugosci.min()), int(dlugosci.max()), int(dlugosci @ zliczenia.to_numpy(dtype=np.int64))
+
+
 def znajdz_kolumny_numeryczne(df: pd.DataFrame) -> List[str]:
     """
     Znajduje wszystkie kolumny numeryczne w DataFrame.
@@ -165,17 +228,24 @@ def analizuj_dane_numeryczne(
     return wartosci_numeryczne, statystyki
 def analizuj_dane_numeryczne(
         df: pd.DataFrame,
-        wybrane_kolumny: Optional[List[str]] = None
+        wybrane_kolumny: Optional[List[str]] = None,
+        zwroc_wartosci: bool = True
 ) -> Tuple[Dict[str, np.ndarray], Dict[str, Dict[str, float]]]:
     """
     Wyodrębnia wartości numeryczne z DataFrame i oblicza podstawowe statystyki.
 
+    Statystyki liczone są blokowo (oblicz_statystyki_blokowo), bez kopii
+    wartości każdej kolumny; słownik wartości powstaje tylko, gdy jest potrzebny.
+
     Parametry:
     ---------
     df : pd.DataFrame
         DataFrame zawierający dane do analizy
     wybrane_kolumny : Optional[List[str]], opcjonalnie
         Lista kolumn do analizy. Jeśli None, analizuje wszystkie kolumny numeryczne.
+    zwroc_wartosci : bool
+        Jeśli False, pierwszym elementem wyniku jest pusty słownik (bez kopiowania
+        wartości kolumn) - wystarcza, gdy potrzebne są tylko statystyki.
 
     Zwraca:
     ------
@@ -198,11 +268,11 @@ def analizuj_dane_numeryczne(
     kolumny_numeryczne = znajdz_kolumny_numeryczne(df)
     print(f"\n[INFO] Dostępne kolumny numeryczne: {kolumny_numeryczne}")
 
-    # Wydobycie wartości numerycznych
-    wartosci_numeryczne = wydobadz_wartosci_numeryczne(df, wybrane_kolumny)
+    # Obliczenie statystyk na blokach kolumn
+    statystyki = oblicz_statystyki_blokowo(df, wybrane_kolumny)
 
-    # Obliczenie statystyk
-    statystyki = oblicz_statystyki(wartosci_numeryczne)
+    # Wydobycie wartości numerycznych (tylko na życzenie)
+    wartosci_numeryczne = wydobadz_wartosci_numeryczne(df, list(statystyki)) if zwroc_wartosci else {}
 
     # Wyświetlenie wyników
     print("\n[WYNIKI] Statystyki dla kolumn numerycznych:")
@@ -232,7 +302,7 @@ def oblicz_statystyki(wartosci_numeryczne: Dict[str, np.ndarray]) -> Dict[str, D
     for kolumna, wartosci in wartosci_numeryczne.items():
         statystyki[kolumna] = {
             'średnia': float(np.mean(wartosci)),
-            'mediana': float(np.median(wartosci)),
+            'mediana': _mediana(np.array(wartosci, dtype=np.float64)),
             'min': float(np.min(wartosci)),
             'max': float(np.max(wartosci)),
             'odchylenie_std': float(np.std(wartosci)),
@@ -241,6 +311,860 @@ def oblicz_statystyki(wartosci_numeryczne: Dict[str, np.ndarray]) -> Dict[str, D
 
     return statystyki
 
+
+def oblicz_statystyki_blokowo(
+        df: pd.DataFrame,
+        wybrane_kolumny: Optional[List[str]] = None,
+        pamiec_bloku: int = PAMIEC_BLOKU_STATYSTYK
+) -> Dict[str, Dict[str, float]]:
+    """
+    Oblicza statystyki jak oblicz_statystyki bezpośrednio na DataFrame.
+
+    Kolumny numeryczne są przetwarzane blokami jako jedna tablica 2D float64
+    (braki jako NaN), a liczność, średnia, min, max i odchylenie wyznaczane są
+    redukcjami wzdłuż osi wierszy dla wszystkich kolumn bloku naraz - bez
+    słownika kopii dropna() dla każdej kolumny. Mediana to selekcja
+    (np.partition) zamiast sortowania. Szerokie ramki (np. po One-Hot) mieszczą
+    setki kolumn w jednym bloku.
+
+    Parametry:
+    ---------
+    df : pd.DataFrame
+        DataFrame z danymi
+    wybrane_kolumny : Optional[List[str]]
+        Lista kolumn do analizy. Jeśli None, analizuje wszystkie kolumny numeryczne.
+    pamiec_bloku : int
+        Maksymalny rozmiar bloku w bajtach (liczba kolumn bloku = pamiec_bloku / (8 * wiersze))
+
+    Zwraca:
+    ------
+    Dict[str, Dict[str, float]]
+        Słownik ze statystykami dla każdej kolumny (kolumny bez wartości są pomijane)
+    """
+    if wybrane_kolumny is None:
+        kolumny = znajdz_kolumny_numeryczne(df)
+    else:
+        kolumny = []
+        for kolumna in wybrane_kolumny:
+            if kolumna in df.columns:
+                if pd.api.types.is_numeric_dtype(df[kolumna]):
+                    kolumny.append(kolumna)
+                else:
+                    print(f"[UWAGA] Kolumna {kolumna} nie jest numeryczna - zostanie pominięta.")
+
+    statystyki = {}
+    if not kolumny or len(df) == 0:
+        return statystyki
+
+    szerokosc_bloku = max(1, pamiec_bloku // (8 * len(df)))
+    for start in range(0, len(kolumny), szerokosc_bloku):
+        nazwy = kolumny[start:start + szerokosc_bloku]
+        blok = df[nazwy].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        calkowite = [pd.api.types.is_integer_dtype(df[k]) or pd.api.types.is_bool_dtype(df[k]) for k in nazwy]
+        statystyki.update(_statystyki_bloku(blok, nazwy, calkowite))
+
+    return statystyki
+
+
+def _statystyki_bloku(blok: np.ndarray, nazwy: List[str],
+                      calkowite: List[bool]) -> Dict[str, Dict[str, float]]:
+    """
+    Statystyki wszystkich kolumn tablicy 2D (wiersze x kolumny, braki jako NaN); blok jest modyfikowany.
+    calkowite[j] oznacza kolumnę całkowitą/logiczną - jej medianę można wyznaczyć ze zliczeń.
+    """
+    n = blok.shape[0]
+    braki = np.isnan(blok)
+    licznosci = n - braki.sum(axis=0)
+
+    # fmin/fmax pomijają NaN bez kopii bloku
+    minima = np.fmin.reduce(blok, axis=0)
+    maksima = np.fmax.reduce(blok, axis=0)
+
+    # Mediany przed modyfikacją bloku; kolumna bez braków to widok (selekcja i tak kopiuje)
+    mediany = np.full(len(nazwy), np.nan)
+    for j in range(len(nazwy)):
+        if licznosci[j] == 0:
+            continue
+        wartosci = blok[:, j] if licznosci[j] == n else blok[~braki[:, j], j]
+        if calkowite[j]:
+            mediany[j] = _mediana(wartosci, minima[j], maksima[j])
+        else:
+            mediany[j] = _mediana(wartosci)
+
+    srednie, m2 = _momenty_bloku(blok, braki, licznosci)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.sqrt(m2 / licznosci)
+
+    statystyki = {}
+    for j, kolumna in enumerate(nazwy):
+        if licznosci[j] == 0:
+            continue
+        statystyki[kolumna] = {
+            'średnia': float(srednie[j]),
+            'mediana': float(mediany[j]),
+            'min': float(minima[j]),
+            'max': float(maksima[j]),
+            'odchylenie_std': float(std[j]),
+            'liczba_wartości': int(licznosci[j])
+        }
+    return statystyki
+
+
+def _momenty_bloku(blok: np.ndarray, braki: np.ndarray,
+                   licznosci: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Średnie i sumy kwadratów odchyleń (M2) kolumn bloku, liczone w miejscu (blok jest nadpisywany):
+    braki -> 0 dla sumy, potem odchylenia od średniej - dwa przebiegi, stabilnie jak np.std.
+    """
+    np.copyto(blok, 0.0, where=braki)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        srednie = blok.sum(axis=0) / licznosci
+    np.subtract(blok, srednie, out=blok)
+    np.copyto(blok, 0.0, where=braki)
+    m2 = np.einsum('ij,ij->j', blok, blok)
+    return srednie, m2
+
+
+def _mediana(wartosci: np.ndarray, minimum: Optional[float] = None,
+             maksimum: Optional[float] = None) -> float:
+    """
+    Mediana przez selekcję (np.partition, średnio O(n)) - ten sam wynik co np.median.
+
+    Dla wartości całkowitych o zakresie [minimum, maksimum] nie większym niż ich
+    liczba (np. kolumny 0/1 po One-Hot) mediana wynika ze zliczeń (np.bincount) -
+    selekcja jest wolna przy dużej liczbie powtórzeń.
+    """
+    n = len(wartosci)
+    if minimum is not None and maksimum - minimum < n:
+        zliczenia = np.cumsum(np.bincount((wartosci - minimum).astype(np.intp)))
+        dolny = np.searchsorted(zliczenia, (n - 1) // 2, side='right')
+        gorny = np.searchsorted(zliczenia, n // 2, side='right')
+        return float(minimum + (dolny + gorny) / 2)
+    srodek = n // 2
+    if n % 2:
+        return float(np.partition(wartosci, srodek)[srodek])
+    # Jedna selekcja; drugi środkowy element to maksimum lewej części (tańsze niż dwa kth przy powtórzeniach)
+    czesc = np.partition(wartosci, srodek)
+    return float((czesc[:srodek].max() + czesc[srodek]) / 2)
+
+
+class SzkicKwantyli:
+    """
+    Szkic kwantyli KLL (Karnin, Lang, Liberty) - mergeable, o stałym rozmiarze.
+
+    Wartości trafiają do poziomu 0; przepełniony poziom jest sortowany, a co
+    druga wartość (losowo parzyste lub nieparzyste pozycje) przechodzi na poziom
+    wyżej z podwójną wagą. Pojemność poziomów maleje geometrycznie (2/3) od
+    najwyższego, więc szkic zajmuje O(k) wartości niezależnie od ich liczby.
+    Szkice z różnych porcji, plików lub procesów łączy polacz().
+
+    Błąd rangi (ułamek liczby wartości) przy ufności 99% wynosi około
+    2.296 / k^0.9723 (empiryczna stała z biblioteki Apache DataSketches);
+    k dobierane jest z parametru blad. Dopóki nie było kompakcji, szkic jest dokładny.
+
+    Parametry:
+    ---------
+    blad : float
+        Docelowy błąd rangi, np. 0.01 - kwantyl 0.5 leży między prawdziwymi kwantylami 0.49 i 0.51
+    ziarno : int, opcjonalnie
+        Ziarno generatora losowego (powtarzalne wyniki)
+    """
+
+    def __init__(self, blad: float = DOMYSLNY_BLAD_KWANTYLI, ziarno: Optional[int] = None):
+        if not 0 < blad < 1:
+            raise ValueError("Parametr 'blad' musi być z przedziału (0, 1).")
+        self.k = max(8, math.ceil((2.296 / blad) ** (1 / 0.9723)))
+        self.poziomy = [np.empty(0)]  # poziom h - wartości o wadze 2^h
+        self.liczba = 0
+        self.minimum = np.inf
+        self.maksimum = -np.inf
+        self._losowe = np.random.default_rng(ziarno)
+
+    @property
+    def blad_rangi(self) -> float:
+        """Błąd rangi szkicu (0 dopóki przechowuje wszystkie wartości)"""
+        if len(self.poziomy) == 1:
+            return 0.0
+        return 2.296 / self.k ** 0.9723
+
+    def dodaj(self, wartosci) -> 'SzkicKwantyli':
+        """Dodaje wartości (tablica lub Series; NaN są pomijane)"""
+        wartosci = np.asarray(wartosci, dtype=np.float64).ravel()
+        wartosci = wartosci[~np.isnan(wartosci)]
+        if len(wartosci) == 0:
+            return self
+        self.liczba += len(wartosci)
+        self.minimum = min(self.minimum, float(wartosci.min()))
+        self.maksimum = max(self.maksimum, float(wartosci.max()))
+        self.poziomy[0] = np.concatenate([self.poziomy[0], wartosci])
+        self._kompaktuj()
+        return self
+
+    def polacz(self, inny: 'SzkicKwantyli') -> 'SzkicKwantyli':
+        """Dołącza szkic innej części danych (modyfikuje i zwraca self)"""
+        self.k = min(self.k, inny.k)
+        for h, poziom in enumerate(inny.poziomy):
+            if h == len(self.poziomy):
+                self.poziomy.append(np.empty(0))
+            self.poziomy[h] = np.concatenate([self.poziomy[h], poziom])
+        self.liczba += inny.liczba
+        self.minimum = min(self.minimum, inny.minimum)
+        self.maksimum = max(self.maksimum, inny.maksimum)
+        self._kompaktuj()
+        return self
+
+    def kopia(self) -> 'SzkicKwantyli':
+        """Niezależna kopia szkicu"""
+        return copy.deepcopy(self)
+
+    def _pojemnosc(self, h: int) -> int:
+        glebokosc = len(self.poziomy) - 1 - h
+        return max(2, math.ceil(self.k * (2 / 3) ** glebokosc))
+
+    def _kompaktuj(self) -> None:
+        h = 0
+        while h < len(self.poziomy):
+            if len(self.poziomy[h]) > self._pojemnosc(h):
+                if h + 1 == len(self.poziomy):
+                    self.poziomy.append(np.empty(0))
+                poziom = np.sort(self.poziomy[h])
+                # Przy nieparzystej liczbie jedna wartość zostaje na poziomie
+                zostaje, poziom = (poziom[:1], poziom[1:]) if len(poziom) % 2 else (poziom[:0], poziom)
+                przesuniecie = int(self._losowe.integers(2))
+                self.poziomy[h + 1] = np.concatenate([self.poziomy[h + 1], poziom[przesuniecie::2]])
+                self.poziomy[h] = zostaje
+                # Nowy poziom zmniejsza pojemność niższych - sprawdzamy od początku
+                h = 0
+                continue
+            h += 1
+
+    def kwantyle(self, q) -> np.ndarray:
+        """Wartości kwantyli q (liczba lub tablica z [0, 1])"""
+        q = np.clip(np.atleast_1d(np.asarray(q, dtype=np.float64)), 0.0, 1.0)
+        if self.liczba == 0:
+            return np.full(len(q), np.nan)
+        wartosci = np.concatenate(self.poziomy)
+        wagi = np.concatenate([np.full(len(p), 2.0 ** h) for h, p in enumerate(self.poziomy)])
+        kolejnosc = np.argsort(wartosci, kind='stable')
+        wartosci = wartosci[kolejnosc]
+        skumulowane = np.cumsum(wagi[kolejnosc])
+        indeksy = np.searchsorted(skumulowane, q * skumulowane[-1], side='left')
+        wynik = wartosci[np.minimum(indeksy, len(wartosci) - 1)]
+        wynik[q == 0.0] = self.minimum
+        wynik[q == 1.0] = self.maksimum
+        return wynik
+
+    def kwantyl(self, q: float) -> float:
+        """Wartość kwantyla q z [0, 1]"""
+        return float(self.kwantyle(q)[0])
+
+    def kwantyl_z_bledem(self, q: float) -> Tuple[float, float]:
+        """
+        Kwantyl q i ograniczenie jego błędu w jednostkach wartości: połowa szerokości
+        przedziału [kwantyl(q - błąd rangi), kwantyl(q + błąd rangi)]
+        """
+        eps = self.blad_rangi
+        dolny, wartosc, gorny = self.kwantyle([q - eps, q, q + eps])
+        return float(wartosc), float(max(wartosc - dolny, gorny - wartosc))
+
+
+def _hasze(wartosci) -> np.ndarray:
+    """64-bitowe hasze wartości, te same w każdej porcji i procesie (stały klucz pandas)"""
+    return pd.util.hash_pandas_object(pd.Series(wartosci, dtype=object), index=False).to_numpy()
+
+
+class SzkicUnikalnych:
+    """
+    HyperLogLog - przybliżona liczba unikalnych wartości w stałej pamięci.
+
+    Każda wartość jest haszowana do 64 bitów; pierwsze p bitów wybiera jeden
+    z 2^p rejestrów, a rejestr pamięta największą pozycję pierwszej jedynki w
+    pozostałych bitach. Szkice łączy maksimum rejestrów (polacz), więc porcje,
+    pliki i procesy dają ten sam wynik co jeden przebieg. Duplikaty nie zmieniają
+    szkicu - wystarczy dodawać unikalne wartości porcji.
+
+    Parametry:
+    ---------
+    blad : float
+        Docelowy względny błąd standardowy (1.04 / sqrt(2^p)); p z zakresu 11-18
+    """
+
+    def __init__(self, blad: float = DOMYSLNY_BLAD_UNIKALNYCH):
+        if not 0 < blad < 1:
+            raise ValueError("Parametr 'blad' musi być z przedziału (0, 1).")
+        # p >= 11: pozostałe bity (64 - p) mieszczą się dokładnie w float64 (frexp)
+        self.p = int(min(18, max(11, math.ceil(math.log2((1.04 / blad) ** 2)))))
+        self.rejestry = np.zeros(2 ** self.p, dtype=np.uint8)
+
+    @property
+    def blad(self) -> float:
+        """Względny błąd standardowy oszacowania"""
+        return 1.04 / math.sqrt(len(self.rejestry))
+
+    def dodaj(self, wartosci) -> 'SzkicUnikalnych':
+        """Dodaje wartości (bez braków; powtórzenia są dozwolone)"""
+        if len(wartosci) == 0:
+            return self
+        hasze = _hasze(wartosci)
+        bity = 64 - self.p
+        indeksy = (hasze >> np.uint64(bity)).astype(np.intp)
+        reszta = hasze & np.uint64((1 << bity) - 1)
+        # Pozycja pierwszej jedynki w 'bity' bitach: bity - floor(log2(reszta)); reszta == 0 -> bity + 1
+        _, wykladnik = np.frexp(reszta.astype(np.float64))
+        rangi = np.where(reszta == 0, bity + 1, bity - (wykladnik - 1)).astype(np.uint8)
+        np.maximum.at(self.rejestry, indeksy, rangi)
+        return self
+
+    def polacz(self, inny: 'SzkicUnikalnych') -> 'SzkicUnikalnych':
+        """Dołącza szkic innej części danych (modyfikuje i zwraca self)"""
+        if inny.p != self.p:
+            raise ValueError("Łączone szkice HyperLogLog muszą mieć ten sam błąd (p).")
+        np.maximum(self.rejestry, inny.rejestry, out=self.rejestry)
+        return self
+
+    def liczba(self) -> int:
+        """Oszacowanie liczby unikalnych wartości"""
+        m = len(self.rejestry)
+        alfa = 0.7213 / (1 + 1.079 / m)
+        oszacowanie = alfa * m * m / np.sum(np.ldexp(1.0, -self.rejestry.astype(np.int32)))
+        puste = int(np.count_nonzero(self.rejestry == 0))
+        if oszacowanie <= 2.5 * m and puste > 0:
+            # Mały zakres: zliczanie liniowe (dokładniejsze przy wielu pustych rejestrach)
+            oszacowanie = m * math.log(m / puste)
+        return int(round(oszacowanie))
+
+
+class SzkicNajczestszych:
+    """
+    Space-Saving w wersji łączonej (mergeable) - najczęstsze wartości i ich liczności.
+
+    Przechowuje k liczników; każdy licznik to górne ograniczenie liczności
+    wartości wraz z błędem (liczność - błąd to dolne ograniczenie). 'prog'
+    ogranicza z góry liczność każdej wartości spoza liczników, więc wartość
+    występująca częściej niż liczba_wartosci / k zawsze ma licznik. Porcję
+    najlepiej dodawać jako jej zliczenia (dodaj_zliczenia) - jedno haszowanie.
+
+    Parametry:
+    ---------
+    k : int
+        Liczba liczników
+    """
+
+    def __init__(self, k: int = LICZBA_LICZNIKOW_NAJCZESTSZYCH):
+        self.k = k
+        self.liczniki = pd.Series(dtype=np.int64)
+        self.bledy = pd.Series(dtype=np.int64)
+        self.prog = 0
+        self.liczba_wartosci = 0
+
+    def dodaj(self, wartosci: pd.Series) -> 'SzkicNajczestszych':
+        """Dodaje wartości (braki są pomijane)"""
+        return self.dodaj_zliczenia(_zliczenia_wartosci(pd.Series(wartosci)))
+
+    def dodaj_zliczenia(self, zliczenia: pd.Series) -> 'SzkicNajczestszych':
+        """Dodaje dokładne zliczenia porcji (malejąco, jak z value_counts)"""
+        prog = int(zliczenia.iloc[self.k]) if len(zliczenia) > self.k else 0
+        gora = zliczenia.iloc[:self.k].astype(np.int64)
+        return self._scal(gora, pd.Series(0, index=gora.index, dtype=np.int64), prog, int(zliczenia.sum()))
+
+    def polacz(self, inny: 'SzkicNajczestszych') -> 'SzkicNajczestszych':
+        """Dołącza szkic innej części danych (modyfikuje i zwraca self)"""
+        return self._scal(inny.liczniki, inny.bledy, inny.prog, inny.liczba_wartosci)
+
+    def _scal(self, liczniki: pd.Series, bledy: pd.Series, prog: int, liczba_wartosci: int) -> 'SzkicNajczestszych':
+        if self.liczniki.empty:
+            indeks = liczniki.index.unique()
+        else:
+            indeks = self.liczniki.index.append(liczniki.index).unique()
+        # Wartość nieobecna po jednej stronie mogła tam wystąpić najwyżej 'prog' razy
+        suma = (self.liczniki.reindex(indeks, fill_value=self.prog).to_numpy()
+                + liczniki.reindex(indeks, fill_value=prog).to_numpy())
+        suma_bledow = (self.bledy.reindex(indeks, fill_value=self.prog).to_numpy()
+                       + bledy.reindex(indeks, fill_value=prog).to_numpy())
+        kolejnosc = np.argsort(-suma, kind='stable')
+        nowy_prog = self.prog + prog
+        if len(kolejnosc) > self.k:
+            nowy_prog = int(suma[kolejnosc[self.k]])
+            kolejnosc = kolejnosc[:self.k]
+        self.liczniki = pd.Series(suma[kolejnosc], index=indeks[kolejnosc])
+        self.bledy = pd.Series(suma_bledow[kolejnosc], index=indeks[kolejnosc])
+        self.prog = nowy_prog
+        self.liczba_wartosci += liczba_wartosci
+        return self
+
+    def najczestsze(self, n: Optional[int] = None) -> List[Tuple[Any, int, int]]:
+        """Lista (wartość, liczność - górne ograniczenie, błąd) malejąco"""
+        n = self.k if n is None else n
+        return [(wartosc, int(liczba), int(blad)) for wartosc, liczba, blad
+                in zip(self.liczniki.index[:n], self.liczniki.to_numpy()[:n], self.bledy.to_numpy()[:n])]
+
+
+def oblicz_statystyki_nie_numeryczne_strumieniowo(
+        chunki: Iterable[pd.DataFrame],
+        blad_unikalnych: float = DOMYSLNY_BLAD_UNIKALNYCH
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Oblicza statystyki jak oblicz_statystyki_nie_numeryczne w jednym przebiegu po porcjach.
+
+    Liczba unikalnych wartości pochodzi z HyperLogLog (SzkicUnikalnych), a
+    najczęstsze wartości ze Space-Saving (SzkicNajczestszych); pamięć nie zależy
+    od liczby wierszy ani unikalnych wartości.
+
+    Parametry:
+    ---------
+    chunki : Iterable[pd.DataFrame]
+        Kolejne porcje danych (np. z wczytaj_csv_strumieniowo)
+    blad_unikalnych : float
+        Względny błąd standardowy HyperLogLog
+
+    Zwraca:
+    ------
+    Dict[str, Dict[str, Any]]
+        Słownik ze statystykami dla każdej kolumny nie-numerycznej
+    """
+    stan = {}
+    for chunk in chunki:
+        aktualizuj_stan_nie_numeryczny(stan, chunk, blad_unikalnych=blad_unikalnych)
+    return statystyki_nie_numeryczne_ze_stanu(stan)
+
+
+def oblicz_statystyki_nie_numeryczne_plikow(
+        sciezki_plikow: Union[str, List[str]],
+        separator: Optional[str] = None,
+        rozmiar_chunka: int = 16 * 1024**2,
+        liczba_procesow: Optional[int] = None,
+        blad_unikalnych: float = DOMYSLNY_BLAD_UNIKALNYCH
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Oblicza statystyki nie-numeryczne plików CSV większych niż pamięć.
+
+    Jak oblicz_statystyki_plikow: każdy plik porcjami do własnego stanu (pliki
+    równolegle w procesach), stany łączone przez polacz_stany_nie_numeryczne.
+
+    Parametry:
+    ---------
+    sciezki_plikow : Union[str, List[str]]
+        Ścieżka pliku lub lista ścieżek plików o tych samych kolumnach
+    separator : str, opcjonalnie
+        Separator kolumn. Jeśli None, wykrywany dla każdego pliku.
+    rozmiar_chunka : int
+        Przybliżony rozmiar porcji w bajtach pliku
+    liczba_procesow : int, opcjonalnie
+        Maksymalna liczba procesów (domyślnie liczba rdzeni, nie więcej niż plików)
+    blad_unikalnych : float
+        Względny błąd standardowy HyperLogLog
+
+    Zwraca:
+    ------
+    Dict[str, Dict[str, Any]]
+        Słownik ze statystykami dla każdej kolumny nie-numerycznej
+    """
+    stany = _stany_plikow(aktualizuj_stan_nie_numeryczny, sciezki_plikow, separator, rozmiar_chunka,
+                          liczba_procesow, {'blad_unikalnych': blad_unikalnych})
+    return statystyki_nie_numeryczne_ze_stanu(polacz_stany_nie_numeryczne(*stany))
+
+
+def aktualizuj_stan_nie_numeryczny(
+        stan: Dict[str, list],
+        chunk: pd.DataFrame,
+        blad_unikalnych: float = DOMYSLNY_BLAD_UNIKALNYCH
+) -> Dict[str, list]:
+    """
+    Dołącza porcję danych do stanu statystyk nie-numerycznych (modyfikuje i zwraca stan).
+
+    Każda kolumna jest haszowana raz (value_counts porcji); HyperLogLog dostaje
+    tylko unikalne wartości porcji, a Space-Saving ich zliczenia.
+
+    Parametry:
+    ---------
+    stan : Dict[str, list]
+        Stan {kolumna: [wiersze, wystąpienia, SzkicUnikalnych, SzkicNajczestszych,
+        długość min, długość max, suma długości]}; pusty słownik na start
+    chunk : pd.DataFrame
+        Nowa porcja danych
+    blad_unikalnych : float
+        Względny błąd standardowy HyperLogLog dla nowych kolumn
+
+    Zwraca:
+    ------
+    Dict[str, list]
+        Zaktualizowany stan
+    """
+    for kolumna in chunk.columns:
+        if pd.api.types.is_numeric_dtype(chunk[kolumna]):
+            continue
+        zliczenia = _zliczenia_wartosci(chunk[kolumna])
+        dlugosc_min, dlugosc_max, suma_dlugosci = _dlugosci_tekstu(zliczenia)
+        czesc = [len(chunk), int(zliczenia.sum()),
+                 SzkicUnikalnych(blad_unikalnych).dodaj(zliczenia.index),
+                 SzkicNajczestszych().dodaj_zliczenia(zliczenia),
+                 dlugosc_min if len(zliczenia) else None, dlugosc_max, suma_dlugosci]
+        stan[kolumna] = _polacz_stan_nie_numeryczny(stan[kolumna], czesc) if kolumna in stan else czesc
+    return stan
+
+
+def polacz_stany_nie_numeryczne(*stany: Dict[str, list]) -> Dict[str, list]:
+    """
+    Łączy stany z aktualizuj_stan_nie_numeryczny policzone niezależnie
+    (porcje, pliki, procesy); stany wejściowe nie są modyfikowane.
+    """
+    wynik = {}
+    for stan in stany:
+        for kolumna, czesc in stan.items():
+            if kolumna in wynik:
+                wynik[kolumna] = _polacz_stan_nie_numeryczny(wynik[kolumna], czesc)
+            else:
+                wynik[kolumna] = copy.deepcopy(czesc)
+    return wynik
+
+
+def _polacz_stan_nie_numeryczny(a: list, b: list) -> list:
+    """Łączy dwa stany jednej kolumny (szkice z a są uzupełniane o szkice z b)"""
+    minima = [d for d in (a[4], b[4]) if d is not None]
+    return [a[0] + b[0], a[1] + b[1], a[2].polacz(b[2]), a[3].polacz(b[3]),
+            min(minima) if minima else None, max(a[5], b[5]), a[6] + b[6]]
+
+
+def statystyki_nie_numeryczne_ze_stanu(stan: Dict[str, list]) -> Dict[str, Dict[str, Any]]:
+    """
+    Zamienia stan z aktualizuj_stan_nie_numeryczny na statystyki w formacie
+    oblicz_statystyki_nie_numeryczne (z kluczem 'blad_unikalnych')
+    """
+    statystyki = {}
+    for kolumna, (wiersze, wystapienia, unikalne, najczestsze, dlugosc_min, dlugosc_max, suma_dlugosci) in stan.items():
+        if wystapienia == 0:
+            continue
+        gora = najczestsze.najczestsze(LICZBA_NAJCZESTSZYCH)
+        statystyki[kolumna] = {
+            'liczba_wystapien': wystapienia,
+            # Licznik Space-Saving nie może przekroczyć liczby unikalnych, HLL - liczby wystąpień
+            'wartosci_unikalne': min(max(unikalne.liczba(), len(najczestsze.liczniki)), wystapienia),
+            'najczestsza_wartosc': gora[0][0],
+            'czestotliwosc_najczestszej': gora[0][1] / wystapienia,
+            'procent_wypelnienia': (wystapienia / wiersze) * 100,
+            'dlugosc_min': dlugosc_min,
+            'dlugosc_max': dlugosc_max,
+            'dlugosc_srednia': suma_dlugosci / wystapienia,
+            'najczestsze': gora,
+            'blad_unikalnych': unikalne.blad
+        }
+    return statystyki
+
+
+def oblicz_kwantyle(
+        df: pd.DataFrame,
+        kwantyle: Iterable[float] = (0.25, 0.5, 0.75),
+        wybrane_kolumny: Optional[List[str]] = None
+) -> Dict[str, Dict[float, Tuple[float, float]]]:
+    """
+    Oblicza dokładne kwantyle (percentyle / 100) kolumn numerycznych (np.quantile, selekcja).
+
+    Dane w pamięci nie potrzebują szkicu - selekcja jest szybsza niż jego budowa;
+    przybliżone kwantyle danych porcjowanych daje oblicz_kwantyle_strumieniowo.
+
+    Parametry:
+    ---------
+    df : pd.DataFrame
+        DataFrame z danymi
+    kwantyle : Iterable[float]
+        Kwantyle z przedziału [0, 1], np. (0.5, 0.9, 0.99)
+    wybrane_kolumny : Optional[List[str]]
+        Lista kolumn do analizy. Jeśli None, analizuje wszystkie kolumny numeryczne.
+
+    Zwraca:
+    ------
+    Dict[str, Dict[float, Tuple[float, float]]]
+        {kolumna: {kwantyl: (wartość, błąd)}}; błąd równy 0, jak w oblicz_kwantyle_strumieniowo
+    """
+    kwantyle = list(kwantyle)
+    if wybrane_kolumny is None:
+        kolumny = znajdz_kolumny_numeryczne(df)
+    else:
+        kolumny = [k for k in wybrane_kolumny if k in df.columns and pd.api.types.is_numeric_dtype(df[k])]
+
+    wyniki = {}
+    for kolumna in kolumny:
+        wartosci = df[kolumna].to_numpy(dtype=np.float64, na_value=np.nan)
+        wartosci = wartosci[~np.isnan(wartosci)]
+        if len(wartosci) == 0:
+            continue
+        wyniki[kolumna] = {q: (float(w), 0.0) for q, w in zip(kwantyle, np.quantile(wartosci, kwantyle))}
+    return wyniki
+
+
+def oblicz_kwantyle_strumieniowo(
+        chunki: Iterable[pd.DataFrame],
+        kwantyle: Iterable[float] = (0.25, 0.5, 0.75),
+        wybrane_kolumny: Optional[List[str]] = None,
+        blad_kwantyli: float = DOMYSLNY_BLAD_KWANTYLI
+) -> Dict[str, Dict[float, Tuple[float, float]]]:
+    """
+    Oblicza przybliżone kwantyle w jednym przebiegu po porcjach (np. z wczytaj_csv_strumieniowo).
+
+    Parametry:
+    ---------
+    chunki : Iterable[pd.DataFrame]
+        Kolejne porcje danych
+    kwantyle : Iterable[float]
+        Kwantyle z przedziału [0, 1]
+    wybrane_kolumny : Optional[List[str]]
+        Lista kolumn do analizy. Jeśli None, analizuje wszystkie kolumny numeryczne.
+    blad_kwantyli : float
+        Docelowy błąd rangi szkicu
+
+    Zwraca:
+    ------
+    Dict[str, Dict[float, Tuple[float, float]]]
+        {kolumna: {kwantyl: (wartość, błąd)}}, jak w oblicz_kwantyle
+    """
+    kwantyle = list(kwantyle)
+    stan = {}
+    for chunk in chunki:
+        aktualizuj_stan_statystyk(stan, chunk, wybrane_kolumny, blad_kwantyli=blad_kwantyli)
+    return {kolumna: {q: czesc[6].kwantyl_z_bledem(q) for q in kwantyle}
+            for kolumna, czesc in stan.items() if czesc[0] > 0}
+
+
+def oblicz_statystyki_strumieniowo(
+        chunki: Iterable[pd.DataFrame],
+        wybrane_kolumny: Optional[List[str]] = None,
+        blad_kwantyli: Optional[float] = None
+) -> Dict[str, Dict[str, float]]:
+    """
+    Oblicza statystyki jak oblicz_statystyki dla porcji z wczytaj_csv_strumieniowo
+    w jednym przebiegu i ograniczonej pamięci.
+
+    Dla każdej porcji liczone są liczność, średnia i suma kwadratów odchyleń (M2),
+    a następnie łączone wzorem Chana, co daje stabilne numerycznie odchylenie.
+    Dokładna mediana wymaga wszystkich wartości, więc bez blad_kwantyli 'mediana'
+    ma wartość None; z blad_kwantyli jest przybliżana szkicem kwantyli.
+
+    Parametry:
+    ---------
+    chunki : Iterable[pd.DataFrame]
+        Kolejne porcje danych
+    wybrane_kolumny : Optional[List[str]]
+        Lista kolumn do analizy. Jeśli None, analizuje wszystkie kolumny numeryczne.
+    blad_kwantyli : Optional[float]
+        Błąd rangi szkicu mediany (patrz aktualizuj_stan_statystyk)
+
+    Zwraca:
+    ------
+    Dict[str, Dict[str, float]]
+        Słownik ze statystykami dla każdej kolumny
+    """
+    stan = {}  # kolumna -> [liczność, średnia, M2, min, max, braki(, szkic)]
+    for chunk in chunki:
+        aktualizuj_stan_statystyk(stan, chunk, wybrane_kolumny, blad_kwantyli=blad_kwantyli)
+    return statystyki_ze_stanu(stan)
+
+
+def oblicz_statystyki_plikow(
+        sciezki_plikow: Union[str, List[str]],
+        wybrane_kolumny: Optional[List[str]] = None,
+        separator: Optional[str] = None,
+        rozmiar_chunka: int = 16 * 1024**2,
+        liczba_procesow: Optional[int] = None,
+        blad_kwantyli: Optional[float] = None,
+        wyswietlaj_informacje: bool = False
+) -> Dict[str, Dict[str, float]]:
+    """
+    Oblicza statystyki jak oblicz_statystyki dla plików CSV większych niż pamięć.
+
+    Każdy plik jest czytany porcjami (wczytaj_csv_strumieniowo) do stanu
+    statystyk; przy kilku plikach stany powstają równolegle w osobnych procesach
+    i są łączone przez polacz_stany_statystyk. W pamięci jest jedna porcja na
+    proces. Mediana - jak w oblicz_statystyki_strumieniowo (None albo szkic kwantyli).
+
+    Parametry:
+    ---------
+    sciezki_plikow : Union[str, List[str]]
+        Ścieżka pliku lub lista ścieżek plików o tych samych kolumnach
+    wybrane_kolumny : Optional[List[str]]
+        Lista kolumn do analizy. Jeśli None, analizuje wszystkie kolumny numeryczne.
+    separator : str, opcjonalnie
+        Separator kolumn. Jeśli None, wykrywany dla każdego pliku.
+    rozmiar_chunka : int
+        Przybliżony rozmiar porcji w bajtach pliku
+    liczba_procesow : int, opcjonalnie
+        Maksymalna liczba procesów (domyślnie liczba rdzeni, nie więcej niż plików)
+    blad_kwantyli : Optional[float]
+        Błąd rangi szkicu mediany; None - bez mediany
+    wyswietlaj_informacje : bool
+        Czy wyświetlać informacje diagnostyczne
+
+    Zwraca:
+    ------
+    Dict[str, Dict[str, float]]
+        Słownik ze statystykami dla każdej kolumny
+    """
+    stany = _stany_plikow(aktualizuj_stan_statystyk, sciezki_plikow, separator, rozmiar_chunka, liczba_procesow,
+                          {'wybrane_kolumny': wybrane_kolumny, 'blad_kwantyli': blad_kwantyli})
+    stan = polacz_stany_statystyk(*stany)
+    if wyswietlaj_informacje:
+        for kolumna, (n, _, _, _, _, braki, *_) in stan.items():
+            print(f"[INFO] {kolumna}: {n} wartości, {braki} braków")
+    return statystyki_ze_stanu(stan)
+
+
+def _stany_plikow(aktualizuj: Callable, sciezki_plikow: Union[str, List[str]], separator: Optional[str],
+                  rozmiar_chunka: int, liczba_procesow: Optional[int], opcje: dict) -> List[Dict[str, list]]:
+    """Stan (aktualizuj(stan, chunk, **opcje)) dla każdego pliku; kilka plików - w puli procesów"""
+    if isinstance(sciezki_plikow, str):
+        sciezki_plikow = [sciezki_plikow]
+    liczba_procesow = min(liczba_procesow or os.cpu_count() or 1, len(sciezki_plikow))
+    n = len(sciezki_plikow)
+
+    if liczba_procesow <= 1:
+        return [_stan_pliku(aktualizuj, sciezka, separator, rozmiar_chunka, opcje) for sciezka in sciezki_plikow]
+    with ProcessPoolExecutor(max_workers=liczba_procesow) as pula:
+        return list(pula.map(_stan_pliku, [aktualizuj] * n, sciezki_plikow, [separator] * n,
+                             [rozmiar_chunka] * n, [opcje] * n))
+
+
+def _stan_pliku(aktualizuj: Callable, sciezka_pliku: str, separator: Optional[str],
+                rozmiar_chunka: int, opcje: dict) -> Dict[str, list]:
+    """Stan jednego pliku czytanego porcjami (wykonywane w procesie roboczym)"""
+    stan = {}
+    for chunk in wczytaj_csv_strumieniowo(sciezka_pliku, separator=separator, rozmiar_chunka=rozmiar_chunka):
+        aktualizuj(stan, chunk, **opcje)
+    return stan
+
+
+def aktualizuj_stan_statystyk(
+        stan: Dict[str, list],
+        chunk: pd.DataFrame,
+        wybrane_kolumny: Optional[List[str]] = None,
+        blad_kwantyli: Optional[float] = None
+) -> Dict[str, list]:
+    """
+    Dołącza porcję danych do stanu statystyk (modyfikuje i zwraca stan).
+
+    Pozwala aktualizować statystyki przyrostowo, np. o wiersze zwrócone
+    przez PlikPrzyrostowy.dopisz(), bez ponownego liczenia od zera. Momenty
+    porcji liczone są dla wszystkich kolumn naraz na bloku 2D (jak w
+    oblicz_statystyki_blokowo) i dołączane wzorem Chana.
+
+    Parametry:
+    ---------
+    stan : Dict[str, list]
+        Stan {kolumna: [liczność, średnia, M2, min, max, braki]}; pusty słownik na start
+    chunk : pd.DataFrame
+        Nowa porcja danych
+    wybrane_kolumny : Optional[List[str]]
+        Lista kolumn do analizy. Jeśli None, analizuje wszystkie kolumny numeryczne.
+    blad_kwantyli : Optional[float]
+        Jeśli podany, stan kolumny ma siódmy element - SzkicKwantyli o tym błędzie
+        rangi, z którego statystyki_ze_stanu wyznacza medianę
+
+    Zwraca:
+    ------
+    Dict[str, list]
+        Zaktualizowany stan
+    """
+    if wybrane_kolumny is None:
+        kolumny = znajdz_kolumny_numeryczne(chunk)
+    else:
+        kolumny = [k for k in wybrane_kolumny
+                   if k in chunk.columns and pd.api.types.is_numeric_dtype(chunk[k])]
+    if not kolumny or len(chunk) == 0:
+        return stan
+
+    blok = chunk[kolumny].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+    braki = np.isnan(blok)
+    licznosci = len(chunk) - braki.sum(axis=0)
+    minima = np.fmin.reduce(blok, axis=0)
+    maksima = np.fmax.reduce(blok, axis=0)
+    if blad_kwantyli is not None:
+        # Szkice przed _momenty_bloku, które nadpisuje blok
+        szkice = [SzkicKwantyli(blad_kwantyli).dodaj(blok[:, j]) for j in range(len(kolumny))]
+    srednie, m2 = _momenty_bloku(blok, braki, licznosci)
+
+    for j, kolumna in enumerate(kolumny):
+        if licznosci[j] == 0:
+            czesc = [0, 0.0, 0.0, np.inf, -np.inf, len(chunk)]
+        else:
+            czesc = [int(licznosci[j]), float(srednie[j]), float(m2[j]),
+                     float(minima[j]), float(maksima[j]), len(chunk) - int(licznosci[j])]
+        if blad_kwantyli is not None:
+            czesc.append(szkice[j])
+        stan[kolumna] = _polacz_stan_kolumny(stan[kolumna], czesc) if kolumna in stan else czesc
+
+    return stan
+
+
+def polacz_stany_statystyk(*stany: Dict[str, list]) -> Dict[str, list]:
+    """
+    Łączy stany statystyk policzone niezależnie (inne porcje, pliki lub procesy).
+
+    Wynik jest taki, jak gdyby wszystkie dane przeszły przez jeden stan;
+    kolejność łączenia nie ma znaczenia (poza błędem zaokrągleń).
+
+    Parametry:
+    ---------
+    *stany : Dict[str, list]
+        Stany z aktualizuj_stan_statystyk (nie są modyfikowane)
+
+    Zwraca:
+    ------
+    Dict[str, list]
+        Nowy, połączony stan
+    """
+    wynik = {}
+    for stan in stany:
+        for kolumna, czesc in stan.items():
+            if kolumna in wynik:
+                wynik[kolumna] = _polacz_stan_kolumny(wynik[kolumna], czesc)
+            else:
+                # Szkic jest modyfikowany przy łączeniu - kopia, by nie zmieniać stanów wejściowych
+                wynik[kolumna] = czesc[:6] + [szkic.kopia() for szkic in czesc[6:]]
+    return wynik
+
+
+def _polacz_stan_kolumny(a: list, b: list) -> list:
+    """
+    Wzór Chana dla dwóch stanów [liczność, średnia, M2, min, max, braki(, szkic)] jednej kolumny
+    (szkic z a jest uzupełniany o szkic z b)
+    """
+    n_a, srednia_a, m2_a, min_a, max_a, braki_a = a[:6]
+    n_b, srednia_b, m2_b, min_b, max_b, braki_b = b[:6]
+    n = n_a + n_b
+    if n_a == 0 or n_b == 0:
+        srednia, m2 = (srednia_b, m2_b) if n_a == 0 else (srednia_a, m2_a)
+    else:
+        delta = srednia_b - srednia_a
+        srednia = srednia_a + delta * n_b / n
+        m2 = m2_a + m2_b + delta ** 2 * n_a * n_b / n
+    wynik = [n, srednia, m2, min(min_a, min_b), max(max_a, max_b), braki_a + braki_b]
+    if len(a) > 6 and len(b) > 6:
+        wynik.append(a[6].polacz(b[6]))
+    return wynik
+
+
+def statystyki_ze_stanu(stan: Dict[str, list]) -> Dict[str, Dict[str, float]]:
+    """
+    Zamienia stan z aktualizuj_stan_statystyk na statystyki w formacie oblicz_statystyki
+    (kolumny bez żadnej wartości są pomijane; liczba braków zostaje w stanie).
+    Ze szkicem kwantyli w stanie 'mediana' jest przybliżona, a 'błąd_mediany' podaje jej błąd.
+    """
+    statystyki = {}
+    for kolumna, (n, srednia, m2, minimum, maksimum, _, *szkic) in stan.items():
+        if n == 0:
+            continue
+        statystyki[kolumna] = {
+            'średnia': float(srednia),
+            'mediana': None,
+            'min': float(minimum),
+            'max': float(maksimum),
+            'odchylenie_std': float(np.sqrt(m2 / n)),
+            'liczba_wartości': int(n)
+        }
+        if szkic:
+            statystyki[kolumna]['mediana'], statystyki[kolumna]['błąd_mediany'] = szkic[0].kwantyl_z_bledem(0.5)
+
+    return statystyki
+
+
 def srednia_wszystkich_wartosci_numerycznych(wartosci_numeryczne: Dict[str, np.ndarray]) -> float:
     """
     Oblicza średnią wszystkich wartości numerycznych ze wszystkich kolumn.
@@ -3,7 +3,7 @@ from typing import Union, Dict
 import numpy as np
 import pandas as pd
 
-from Dane.Dane import wczytaj_csv
+from Dane.Dane import wczytaj_csv, _jako_liczby_obliczen
 
 
 def uzupelnij_braki(
@@ -48,10 +48,10 @@ def uzupelnij_braki(
 
                 if metoda == 'srednia':
                     srednia = df_kopia[kolumna].mean()
-                    df_kopia[kolumna] = df_kopia[kolumna].fillna(srednia)
+                    df_kopia[kolumna] = _wypelnij_liczbowo(df_kopia[kolumna], srednia)
                 elif metoda == 'mediana':
                     mediana = df_kopia[kolumna].median()
-                    df_kopia[kolumna] = df_kopia[kolumna].fillna(mediana)
+                    df_kopia[kolumna] = _wypelnij_liczbowo(df_kopia[kolumna], mediana)
                 elif metoda == 'moda':
                     moda = df_kopia[kolumna].mode()[0] if not df_kopia[kolumna].mode().empty else np.nan
                     df_kopia[kolumna] = df_kopia[kolumna].fillna(moda)
@@ -65,10 +65,10 @@ def uzupelnij_braki(
             if metoda not in metody_dozwolone:
                 raise ValueError(f"Nieznana metoda: {metoda}")
 
-            if metoda == 'srednia':
-                df_kopia = df_kopia.fillna(df_kopia.mean())
-            elif metoda == 'mediana':
-                df_kopia = df_kopia.fillna(df_kopia.median())
+            if metoda in ('srednia', 'mediana'):
+                wartosci = df_kopia.mean(numeric_only=True) if metoda == 'srednia' else df_kopia.median(numeric_only=True)
+                for kolumna, wartosc in wartosci.items():
+                    df_kopia[kolumna] = _wypelnij_liczbowo(df_kopia[kolumna], wartosc)
             elif metoda == 'moda':
                 df_kopia = df_kopia.fillna(df_kopia.mode().iloc[0])
             elif metoda == 'stała':
@@ -85,6 +85,22 @@ def uzupelnij_braki(
         print(traceback.format_exc())
         return df
 
+def _wypelnij_liczbowo(kolumna: pd.Series, wartosc) -> pd.Series:
+    """
+    Wypełnia braki średnią/medianą bez powiększania typu kolumny. Kolumna
+    nullable Int* (polityka typów) nie przyjmie ułamkowej wartości - wtedy
+    przechodzi na typ obliczeń z polityki (float32/float64).
+    """
+    if pd.isna(wartosc) or not kolumna.hasnans:
+        return kolumna
+    if pd.api.types.is_integer_dtype(kolumna) and float(wartosc) != int(wartosc):
+        kolumna = pd.Series(_jako_liczby_obliczen(kolumna), index=kolumna.index, name=kolumna.name)
+    if pd.api.types.is_float_dtype(kolumna):
+        # Skalar float64 podniósłby kolumnę float32 do float64
+        wartosc = kolumna.dtype.type(wartosc)
+    return kolumna.fillna(wartosc)
+
+
 def usun_braki(
     df: pd.DataFrame,
     os_wiersze_kolumny: str = 'wiersze',
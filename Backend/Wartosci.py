@@ -1,4 +1,4 @@
-from typing import Union, Dict, Optional, Any
+from typing import Union, Dict, Optional, Any, Iterable, Iterator
 
 import pandas as pd
 
@@ -131,4 +131,28 @@ def zamien_wartosci(df: pd.DataFrame, reguly: Dict[str, Dict[Any, Any]] = None,
     if wyswietlaj_informacje:
         print(f"Łącznie zamieniono {licznik_zmian} wartości.")
 
-    return df_wynik
\ No newline at end of file
+    return df_wynik
+
+
+def zamien_wartosci_strumieniowo(chunki: Iterable[pd.DataFrame], reguly: Dict[str, Dict[Any, Any]] = None,
+                                 wyswietlaj_informacje: bool = False) -> Iterator[pd.DataFrame]:
+    """
+    Strumieniowa wersja zamien_wartosci - stosuje te same reguły do każdej porcji
+    z wczytaj_csv_strumieniowo.
+
+    Parametry:
+    ---------
+    chunki : Iterable[pd.DataFrame]
+        Kolejne porcje danych
+    reguly : Dict[str, Dict[Any, Any]], opcjonalne
+        Słownik reguł zamiany jak w zamien_wartosci
+    wyswietlaj_informacje : bool, opcjonalne
+        Czy wyświetlać informacje o liczbie zamienionych wartości w każdej porcji
+
+    Zwraca:
+    -------
+    Iterator[pd.DataFrame]
+        Zmodyfikowane porcje
+    """
+    for chunk in chunki:
+        yield zamien_wartosci(chunk, reguly, wyswietlaj_informacje)
@@ -1,8 +1,82 @@
+import numpy as np
 import pandas as pd
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Tuple, Dict, Iterator, Callable
 import re
 import os
-from datetime import datetime
+import io
+import json
+import math
+import codecs
+import csv
+import glob
+import itertools
+import hashlib
+import gzip
+import sys
+import bz2
+import lzma
+import zlib
+import zipfile
+import threading
+import warnings
+from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+
+# Pliki większe niż ten próg są wczytywane porcjami (chunkami)
+PROG_DUZEGO_PLIKU = 100 * 1024**2
+# Docelowy rozmiar zakresu bajtów przetwarzanego przez jeden proces
+ROZMIAR_ZAKRESU = 64 * 1024**2
+# Rozmiar bloku przy liczeniu cudzysłowów podczas dzielenia pliku na zakresy
+ROZMIAR_BLOKU_ODCZYTU = 16 * 1024**2
+# Minimalna liczba bajtów pliku na proces - przy mniejszych zakresach narzut
+# uruchamiania procesów i przesyłania wyników przewyższa zysk (przy 8 MB
+# na cały plik tryb równoległy był ok. 2x wolniejszy od sekwencyjnego)
+MIN_ROZMIAR_ROWNOLEGLY = 32 * 1024**2
+# Liczba wierszy czytanych w celu wywnioskowania schematu
+ROZMIAR_PROBKI_SCHEMATU = 10_000
+# Liczba losowych wierszy, na których wnioskowane są typy wczytanego DataFrame'u
+ROZMIAR_PROBKI_TYPOW = 1000
+# Katalog i limit rozmiaru kolumnowego cache wczytanych plików
+KATALOG_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'HurtownieDanych')
+MAKS_ROZMIAR_CACHE = 2 * 1024**3
+# Rozmiar bloków pliku branych do skrótu zawartości (początek, środek, koniec)
+BLOK_SKROTU = 1024**2
+# Liczba niepustych wartości, na których testowane są formaty dat
+ROZMIAR_PROBKI_DATY = 100
+# Sygnatury (magic bytes) obsługiwanych formatów kompresji -> nazwa dla pandas
+SYGNATURY_KOMPRESJI = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+    (b'PK\x03\x04', 'zip'),
+    (b'\xfd7zXZ\x00', 'xz'),
+)
+# Ile skompresowanych bajtów dekompresujemy, by oszacować współczynnik kompresji
+PROBKA_KOMPRESJI = 4 * 1024**2
+# Rozmiar początku pliku (po dekompresji) czytanego jednorazowo przez profiler
+ROZMIAR_BUFORA_PROFILU = 1024**2
+# Początek pliku, z którego wykrywane są kodowanie i separator przy wczytywaniu
+ROZMIAR_BUFORA_DETEKCJI = 64 * 1024
+# Rozszerzenia skoroszytów Excela obsługiwanych przez wczytaj_excel
+ROZSZERZENIA_EXCEL = ('.xlsx', '.xlsm')
+# Liczba wierszy arkusza zamienianych naraz na DataFrame (ogranicza listy krotek w pamięci)
+ROZMIAR_PORCJI_EXCEL = 50_000
+# Kolumna tekstowa staje się kategorią, gdy kategoria zajmie najwyżej taki ułamek pamięci tekstu
+MAKS_UDZIAL_PAMIECI_KATEGORII = 0.5
+# Liczba najmniejszych skrótów w szkicu KMV (błąd względny liczby unikalnych ok. 1/sqrt(k))
+ROZMIAR_SZKICU_KMV = 1024
+# Popularne formaty dat w kolejności preferencji przy remisie
+FORMATY_DAT = (
+    "%Y-%m-%d", "%d-%m-%Y", "%m-%d-%Y",
+    "%Y/%m/%d", "%d/%m/%Y", "%m/%d/%Y",
+    "%Y.%m.%d", "%d.%m.%Y", "%m.%d.%Y",
+    "%Y-%m-%d %H:%M:%S", "%d-%m-%Y %H:%M:%S",
+    "%Y/%m/%d %H:%M:%S", "%d/%m/%Y %H:%M:%S",
+    "%d.%m.%Y %H:%M:%S", "%Y.%m.%d %H:%M:%S",
+    "%H:%M:%S %d-%m-%Y", "%H:%M:%S %Y-%m-%d"
+)
 
 
 def wczytaj_csv(
@@ -11,10 +85,109 @@ def wczytaj_csv(
         kolumny_daty: List[str] = None,
         format_daty: str = None,
         wymagane_kolumny: List[str] = None,
-        wyswietlaj_informacje: bool = False
+        wyswietlaj_informacje: bool = False,
+        rownolegle: bool = False,
+        liczba_procesow: Optional[int] = None,
+        schemat_z_probki: bool = False,
+        uzyj_cache: bool = False,
+        katalog_cache: Optional[str] = None,
+        silnik: str = 'c',
+        kolumny: Optional[List[str]] = None,
+        filtry: Optional[List[Tuple[str, str, object]]] = None,
+        rozmiar_probki: Optional[int] = None,
+        kolumna_warstw: Optional[str] = None,
+        ziarno: Optional[int] = None,
+        postep: Optional[Callable[[int, int, int], None]] = None,
+        plik_kwarantanny: Optional[str] = None
 ) -> Optional[pd.DataFrame]:
     """
     Ulepszona funkcja do automatycznego wczytywania CSV.
+
+    Parametry:
+    ---------
+    sciezka_pliku : str
+        Ścieżka do pliku CSV. Pliki skompresowane (.gz, .bz2, .zst, .xz, .zip)
+        są rozpoznawane po sygnaturze i dekompresowane strumieniowo, bez pliku
+        tymczasowego; kodowanie i separator wykrywane są z danych po dekompresji.
+    separator : Union[str, List[str]], opcjonalnie
+        Separator kolumn. Jeśli None, zostanie wykryty automatycznie.
+    kolumny_daty : List[str], opcjonalnie
+        Kolumny, które mają zostać skonwertowane na daty
+    format_daty : str, opcjonalnie
+        Format dat dla kolumn z kolumny_daty
+    wymagane_kolumny : List[str], opcjonalnie
+        Kolumny, które muszą wystąpić w pliku (wiersze z brakami są usuwane)
+    wyswietlaj_informacje : bool
+        Czy wyświetlać informacje diagnostyczne
+    rownolegle : bool
+        Jeśli True, plik jest dzielony na zakresy bajtów (na granicach rekordów,
+        z pominięciem znaków nowej linii w polach w cudzysłowach), które są
+        parsowane i typowane w puli procesów. Pliki skompresowane oraz pliki,
+        których zakresów nie udało się sparsować, są czytane sekwencyjnie. Każdy proces dostaje co
+        najmniej MIN_ROZMIAR_ROWNOLEGLY bajtów; jeśli plik wystarcza na mniej niż
+        dwa procesy, jest czytany sekwencyjnie.
+    liczba_procesow : int, opcjonalnie
+        Liczba procesów dla trybu równoległego (domyślnie liczba rdzeni)
+    schemat_z_probki : bool
+        Jeśli True, typy kolumn są wnioskowane raz z ograniczonej próbki,
+        a cały plik jest parsowany od razu z jawnymi dtype/parse_dates/decimal
+        (bez pośredniej kopii kolumn jako tekst). Fragmenty łamiące schemat
+        trafiają do wolniejszej ścieżki konwersji.
+    uzyj_cache : bool
+        Jeśli True, wynik (z typami po detekcji, w tym kategoriami i datami)
+        jest zapisywany w kolumnowym cache Feather, a ponowne otwarcie
+        niezmienionego pliku z tymi samymi parametrami czyta go przez mmap
+        bez parsowania. Wymaga pakietu pyarrow.
+    katalog_cache : str, opcjonalnie
+        Katalog cache (domyślnie KATALOG_CACHE)
+    silnik : str
+        'c' (domyślnie) lub 'pyarrow'. Silnik pyarrow parsuje wielowątkowo
+        cały plik (bez chunków) i zostawia kolumny tekstowe jako string[pyarrow]
+        zamiast obiektów Pythona; liczby i daty trafiają do typów NumPy.
+        Przy błędzie parsowania (także przy liniach z nadmiarowymi polami)
+        następuje powrót do kaskady c/python.
+    kolumny : List[str], opcjonalnie
+        Kolumny do wczytania (projekcja). Pozostałe kolumny są pomijane już
+        przez parser, więc nie zajmują pamięci ani czasu konwersji typów.
+    filtry : List[Tuple[str, str, object]], opcjonalnie
+        Warunki na wiersze w postaci (kolumna, operator, wartość), łączone
+        przez AND. Operatory: '==', '!=', '<', '<=', '>', '>=', 'in', 'not in'
+        oraz 'miedzy' (wartość to para (od, do), obustronnie domknięta).
+        Warunki są sprawdzane po wykryciu typów (daty porównywane jako daty)
+        osobno dla każdej porcji pliku, więc zużycie pamięci zależy od
+        wybranych wierszy, a nie od rozmiaru pliku. Kolumny użyte tylko
+        w filtrach nie trafiają do wyniku.
+    rozmiar_probki : int, opcjonalnie
+        Tryb podglądu: plik jest czytany strumieniowo jeden raz, a w pamięci
+        utrzymywany jest rezerwuar co najwyżej tylu losowych wierszy. Typy są
+        wykrywane na samej próbce, a filtry stosowane do próbki (każdy wiersz
+        spełniający filtry ma tę samą szansę trafienia do wyniku). Opis
+        próbkowania (m.in. 'czestosc') trafia do df.attrs['probkowanie'].
+        Tryby równoległy i schematu z próbki są wtedy pomijane.
+    kolumna_warstw : str, opcjonalnie
+        Kolumna dla próbkowania warstwowego - rozmiar próbki jest dzielony
+        między wartości kolumny proporcjonalnie do ich liczności (co najmniej
+        jeden wiersz na warstwę). Bez niej próbka jest jednostajna. Brak tej
+        kolumny w pliku zgłaszany jest wyjątkiem BrakKolumnyWarstw (ValueError).
+    ziarno : int, opcjonalnie
+        Ziarno generatora losowego (powtarzalna próbka)
+    postep : Callable[[int, int, int], None], opcjonalnie
+        Funkcja wywoływana z (przeczytane bajty, rozmiar pliku w bajtach,
+        wczytane wiersze) po każdej porcji (chunki, zakresy równoległe, próbka)
+        oraz raz na koniec. Przy pliku skompresowanym bajty dotyczą pliku
+        skompresowanego. Może być wywoływana z wątku roboczego.
+    plik_kwarantanny : str, opcjonalnie
+        Ścieżka pliku CSV (linia, powod, tresc), do którego trafiają linie
+        pominięte przez parser (np. z nadmiarowymi polami). Parser C pomija je
+        w tym samym przejściu, bez ponownego parsowania całego pliku silnikiem
+        python; treść linii jest doczytywana tylko, gdy takie linie wystąpiły.
+        Niezależnie od tego parametru liczba pominiętych linii trafia do
+        df.attrs['kwarantanna'] ({'liczba_linii', 'plik'}).
+
+    Zwraca:
+    ------
+    Optional[pd.DataFrame]
+        Wczytany DataFrame z wykrytymi typami
     """
     if wyswietlaj_informacje:
         print(f"[INFO] Wczytywanie {os.path.basename(sciezka_pliku)}...")
@@ -22,136 +195,1805 @@ def wczytaj_csv(
     if not os.path.exists(sciezka_pliku):
         raise FileNotFoundError(f"Plik nie istnieje: {sciezka_pliku}")
 
-    # 1) detekcja kodowania i separatora (pomijam tu implementację _wykryj_kodowanie/_wykryj_separator)
-    kodowanie = _wykryj_kodowanie(sciezka_pliku)
+    klucz_cache = None
+    if uzyj_cache:
+        klucz_cache = _klucz_cache(sciezka_pliku, separator=separator, kolumny_daty=kolumny_daty,
+                                   format_daty=format_daty, wymagane_kolumny=wymagane_kolumny,
+                                   schemat_z_probki=schemat_z_probki, kolumny=kolumny, filtry=filtry,
+                                   rozmiar_probki=rozmiar_probki, kolumna_warstw=kolumna_warstw,
+                                   ziarno=ziarno, polityka_typow=vars(_POLITYKA_TYPOW))
+        df = _odczytaj_z_cache(klucz_cache, katalog_cache)
+        if df is not None:
+            if wyswietlaj_informacje:
+                print(f"[SUKCES] Wczytano z cache {len(df)} wierszy x {df.shape[1]} kolumn")
+            if postep:
+                rozmiar = os.path.getsize(sciezka_pliku)
+                postep(rozmiar, rozmiar, len(df))
+            return df
+
+    # 1) detekcja kompresji, kodowania i separatora - z jednego odczytu początku pliku
+    kompresja = _wykryj_kompresje(sciezka_pliku)
+    poczatek = _czytaj_poczatek(sciezka_pliku, kompresja, ROZMIAR_BUFORA_DETEKCJI)
+    kodowanie = _kodowanie_z_bajtow(poczatek)
     if separator is None:
-        separator = _wykryj_separator(sciezka_pliku, kodowanie)
+        separator = _separator_z_linii(_linie_z_bajtow(poczatek, kodowanie, 5))
 
     if wyswietlaj_informacje:
         print(f"Kodowanie: {kodowanie}, Separator: '{separator}'")
 
-    filesize = os.path.getsize(sciezka_pliku)
+    # Próg chunkowania dotyczy rozmiaru danych, a nie skompresowanego pliku
+    filesize = _szacuj_rozmiar_danych(sciezka_pliku, kompresja)
+    if wyswietlaj_informacje and kompresja:
+        print(f"[INFO] Kompresja {kompresja}, szacowany rozmiar po dekompresji: "
+              f"{filesize / 1024**2:.1f} MB")
+
+    if silnik not in ('c', 'pyarrow'):
+        raise ValueError("Parametr 'silnik' musi być 'c' lub 'pyarrow'.")
+
+    projekcja = None
+    if kolumny is not None or filtry:
+        projekcja = _przygotuj_projekcje(sciezka_pliku, separator, kodowanie, kolumny,
+                                         filtry, wymagane_kolumny, kompresja)
+    usecols = projekcja['pozycje'] if projekcja else None
+
+    if rozmiar_probki is not None:
+        if rozmiar_probki < 1:
+            raise ValueError("Parametr 'rozmiar_probki' musi być dodatni.")
+        # Próbka powstaje w jednym przejściu strumieniowym - bez zakresów i schematu
+        rownolegle = schemat_z_probki = False
 
     # 2) czytanie pliku
     def _read(engine, on_bad):
+        if engine == 'pyarrow':
+            return _normalizuj_typy_arrow(pd.read_csv(
+                sciezka_pliku,
+                sep=separator,
+                encoding=kodowanie,
+                engine=engine,
+                on_bad_lines=on_bad,
+                compression=kompresja,
+                dtype_backend='pyarrow',
+                # pyarrow przyjmuje tylko nazwy kolumn, nie pozycje
+                usecols=projekcja['surowe'] if projekcja else None
+            ))
         return pd.read_csv(
             sciezka_pliku,
             sep=separator,
             encoding=kodowanie,
             engine=engine,
-            on_bad_lines=on_bad
+            on_bad_lines=on_bad,
+            compression=kompresja,
+            usecols=usecols
         )
 
-    if filesize > 100 * 1024**2:
-        # chunking
-        chunks = []
-        for eng, bad in [('c', 'warn'), ('python', 'skip')]:
+    silniki = [('c', 'warn'), ('python', 'warn')]
+    if silnik == 'pyarrow':
+        # pyarrow nie podaje numerów błędnych linii - takie pliki czyta parser C (kwarantanna)
+        silniki.insert(0, ('pyarrow', 'error'))
+
+    schemat = None
+    if schemat_z_probki:
+        schemat = _wywnioskuj_schemat(sciezka_pliku, separator, kodowanie,
+                                      kolumny_daty, format_daty, wyswietlaj_informacje,
+                                      pozycje=usecols, kompresja=kompresja)
+
+    # Linie pominięte przez parser: {numer linii w pliku: powód}
+    zle_linie: Dict[int, str] = {}
+    df = None
+    if rownolegle and kompresja:
+        if wyswietlaj_informacje:
+            print("[UWAGA] Plik skompresowany - tryb równoległy niedostępny, czytam sekwencyjnie")
+    elif rownolegle:
+        df = _wczytaj_rownolegle(sciezka_pliku, separator, kodowanie, kolumny_daty,
+                                 format_daty, liczba_procesow, wyswietlaj_informacje,
+                                 schemat=schemat, projekcja=projekcja, postep=postep)
+    if df is None and schemat is not None:
+        with _zbieraj_zle_linie(zle_linie):
+            df = _wczytaj_ze_schematem(sciezka_pliku, schemat, separator, kodowanie, projekcja)
+
+    if df is not None:
+        if wymagane_kolumny:
+            df = _sprawdz_wymagane_kolumny(df, wymagane_kolumny)
+        if wyswietlaj_informacje and df.attrs.get('niezgodne_ze_schematem'):
+            print(f"[UWAGA] Wartości niezgodne ze schematem: {df.attrs['niezgodne_ze_schematem']}")
+    elif ((filesize > PROG_DUZEGO_PLIKU or (projekcja and projekcja['filtry']))
+          and silnik != 'pyarrow' and rozmiar_probki is None):
+        # chunking - słowniki kategorii są ujednolicane na bieżąco między chunkami,
+        # a filtry wierszy stosowane są do każdego chunka przed jego zachowaniem
+        for eng, bad in [('c', 'warn'), ('python', 'warn')]:
+            # Każda próba zaczyna od zera - bez porcji i błędnych linii z nieudanego silnika
+            chunks = []
+            zle_linie.clear()
+            unifikator = UnifikatorKategorii()
             try:
-                reader = pd.read_csv(
-                    sciezka_pliku, sep=separator, encoding=kodowanie,
-                    engine=eng, on_bad_lines=bad, chunksize=100_000
-                )
-                for c in reader:
-                    c = _automatyczna_detekcja_typow(c, kolumny_daty, format_daty, wyswietlaj_informacje)
-                    c = _optymalizuj_pamiec(c)
-                    chunks.append(c)
+                # Własny uchwyt pliku - jego pozycja to postęp w bajtach
+                with _zbieraj_zle_linie(zle_linie), open(sciezka_pliku, 'rb') as uchwyt:
+                    reader = pd.read_csv(
+                        uchwyt, sep=separator, encoding=kodowanie,
+                        engine=eng, on_bad_lines=bad, chunksize=100_000, usecols=usecols,
+                        compression=kompresja
+                    )
+                    wiersze = 0
+                    for c in reader:
+                        wiersze += len(c)
+                        c.columns = [col.strip().replace('\ufeff', '') for col in c.columns]
+                        c = _automatyczna_detekcja_typow(c, kolumny_daty, format_daty, wyswietlaj_informacje)
+                        c = _filtruj_wiersze(c, projekcja)
+                        c = _optymalizuj_pamiec(c)
+                        chunks.append(unifikator.dodaj(c))
+                        if postep:
+                            postep(uchwyt.tell(), os.fstat(uchwyt.fileno()).st_size, wiersze)
                 break
-            except Exception:
+            except Exception as e:
+                blad = e
                 continue
-        df = pd.concat(chunks, ignore_index=True)
+        else:
+            # Żaden silnik nie przeczytał całego pliku - nie zwracamy niepełnych danych
+            print(f"[BŁĄD] Nie udało się wczytać pliku {sciezka_pliku}: {blad}")
+            raise blad
+        df = unifikator.polacz(chunks)
     else:
-        # całość na raz
-        for eng, bad in [('c', 'warn'), ('python', 'skip')]:
-            try:
-                df = _read(eng, bad)
-                break
-            except Exception:
-                continue
+        # całość na raz albo rezerwuar losowych wierszy z jednego przejścia
+        if rozmiar_probki is not None:
+            with _zbieraj_zle_linie(zle_linie):
+                df = _wczytaj_probke(sciezka_pliku, separator, kodowanie, rozmiar_probki, kolumna_warstw,
+                                     ziarno, kompresja, usecols, wyswietlaj_informacje, postep)
+        else:
+            for eng, bad in silniki:
+                try:
+                    with _zbieraj_zle_linie(zle_linie):
+                        df = _read(eng, bad)
+                    break
+                except Exception as e:
+                    if wyswietlaj_informacje and eng == 'pyarrow':
+                        print(f"[UWAGA] Silnik pyarrow nie wczytał pliku ({e}), używam silnika c")
+                    continue
 
         # nagłówki, wymagane kolumny, typy i pamięć
         df.columns = [col.strip().replace('\ufeff', '') for col in df.columns]
         if wymagane_kolumny:
-            brak = set(wymagane_kolumny) - set(df.columns)
-            if brak:
-                raise ValueError(f"Brak wymaganych kolumn: {brak}")
-            df = df.dropna(subset=wymagane_kolumny)
+            df = _sprawdz_wymagane_kolumny(df, wymagane_kolumny)
 
         df = _automatyczna_detekcja_typow(df, kolumny_daty, format_daty, wyswietlaj_informacje)
-        df = _optymalizuj_pamiec(df)
+        df = _filtruj_wiersze(df, projekcja)
+        df = _optymalizuj_pamiec(df, raport=wyswietlaj_informacje)
+        if wyswietlaj_informacje:
+            _wyswietl_raport_pamieci(df.attrs.pop('raport_pamieci'))
+
+    # Linie pominięte przez parser (z procesów trybu równoległego - w atrybutach części)
+    zle_linie.update(df.attrs.pop('zle_linie', {}))
+    if zle_linie:
+        if plik_kwarantanny:
+            try:
+                _zapisz_kwarantanne(sciezka_pliku, kompresja, kodowanie, zle_linie, plik_kwarantanny)
+            except OSError as e:
+                print(f"[UWAGA] Nie udało się zapisać pliku kwarantanny: {e}")
+                plik_kwarantanny = None
+        df.attrs['kwarantanna'] = {'liczba_linii': len(zle_linie), 'plik': plik_kwarantanny}
+        if wyswietlaj_informacje:
+            print(f"[UWAGA] Pominięto {len(zle_linie)} błędnych linii"
+                  + (f" (kwarantanna: {plik_kwarantanny})" if plik_kwarantanny else ""))
 
     if wyswietlaj_informacje:
         print(f"[SUKCES] Wczytano {len(df)} wierszy x {df.shape[1]} kolumn")
+    if postep:
+        rozmiar = os.path.getsize(sciezka_pliku)
+        postep(rozmiar, rozmiar, len(df))
+
+    if klucz_cache is not None:
+        _zapisz_do_cache(df, klucz_cache, katalog_cache, wyswietlaj_informacje)
 
     return df
 
-def _automatyczna_detekcja_typow(df: pd.DataFrame,
-                                 kolumny_daty: List[str] = None,
-                                 format_daty: str = None,
-                                 wyswietlaj: bool = False) -> pd.DataFrame:
+
+def wczytaj_poczatek_csv(sciezka_pliku: str, liczba_wierszy: int = 5000,
+                         separator: str = None) -> pd.DataFrame:
     """
-    Ulepszona automatyczna detekcja typów z próbkowaniem.
+    Szybko wczytuje tylko początkowe wiersze pliku (podgląd pierwszej strony),
+    z tą samą detekcją kompresji, kodowania, separatora i typów co wczytaj_csv.
+
+    Parametry:
+    ---------
+    sciezka_pliku : str
+        Ścieżka do pliku CSV
+    liczba_wierszy : int
+        Liczba początkowych wierszy do wczytania
+    separator : str, opcjonalnie
+        Separator kolumn. Jeśli None, zostanie wykryty automatycznie.
+
+    Zwraca:
+    ------
+    pd.DataFrame
+        Początkowe wiersze pliku
     """
-    df_copy = df.copy()
-    sample = df_copy.sample(n=min(len(df_copy), 1000), random_state=42) if len(df_copy) > 0 else df_copy
+    if not os.path.exists(sciezka_pliku):
+        raise FileNotFoundError(f"Plik nie istnieje: {sciezka_pliku}")
 
-    # Najpierw konwertuj podane kolumny dat
-    if kolumny_daty:
-        for col in kolumny_daty:
-            if col in df_copy.columns:
-                try:
-                    fmt = format_daty or _wykryj_format_daty(sample[col])
-                    df_copy[col] = pd.to_datetime(df_copy[col], format=fmt, errors='coerce')
-                    if wyswietlaj:
-                        print(f"Data [{col}] użyty format: {fmt}")
-                except Exception as e:
-                    if wyswietlaj:
-                        print(f"Błąd daty {col}: {e}")
+    kompresja = _wykryj_kompresje(sciezka_pliku)
+    poczatek = _czytaj_poczatek(sciezka_pliku, kompresja, ROZMIAR_BUFORA_DETEKCJI)
+    kodowanie = _kodowanie_z_bajtow(poczatek)
+    if separator is None:
+        separator = _separator_z_linii(_linie_z_bajtow(poczatek, kodowanie, 5))
+
+    df = pd.read_csv(sciezka_pliku, sep=separator, encoding=kodowanie, nrows=liczba_wierszy,
+                     on_bad_lines='skip', compression=kompresja)
+    df.columns = [str(col).strip().replace('\ufeff', '') for col in df.columns]
+    return _automatyczna_detekcja_typow(df, wyswietlaj=False)
+
+
+def wczytaj_wiele_csv(
+        sciezki: Union[str, List[str]],
+        kolumna_zrodla: Optional[str] = None,
+        dopuszczaj_brakujace: bool = False,
+        liczba_watkow: Optional[int] = None,
+        wyswietlaj_informacje: bool = False,
+        **opcje
+) -> pd.DataFrame:
+    """
+    Wczytuje zbiór plików CSV (lista ścieżek i/lub wzorców glob) do jednego DataFrame'u.
+
+    Pliki są wczytywane współbieżnie w puli wątków (parser C zwalnia GIL),
+    każdy przez wczytaj_csv z włączonym cache - niezmieniony plik jest czytany
+    z kolumnowego cache bez parsowania. Przed połączeniem sprawdzana jest
+    zgodność schematów, a kolumny kategoryczne dostają wspólne słowniki.
+
+    Parametry:
+    ---------
+    sciezki : Union[str, List[str]]
+        Ścieżka, wzorzec glob (np. 'dane/online_retail_*.csv') lub ich lista
+    kolumna_zrodla : str, opcjonalnie
+        Nazwa dodawanej kolumny kategorycznej z nazwą pliku źródłowego wiersza
+    dopuszczaj_brakujace : bool
+        Jeśli True, kolumny występujące tylko w części plików są dopuszczalne
+        (w pozostałych plikach mają braki); domyślnie zestawy kolumn muszą być równe
+    liczba_watkow : int, opcjonalnie
+        Liczba plików wczytywanych jednocześnie (domyślnie liczba rdzeni)
+    wyswietlaj_informacje : bool
+        Czy wyświetlać informacje diagnostyczne
+    **opcje
+        Pozostałe parametry przekazywane do wczytaj_csv (np. kolumny, filtry)
+
+    Zwraca:
+    ------
+    pd.DataFrame
+        Połączone dane wszystkich plików w kolejności ścieżek
+    """
+    wzorce = [sciezki] if isinstance(sciezki, str) else list(sciezki)
+    pliki = []
+    for wzorzec in wzorce:
+        dopasowane = sorted(glob.glob(wzorzec)) if glob.has_magic(wzorzec) else [wzorzec]
+        pliki.extend(p for p in dopasowane if p not in pliki)
+    if not pliki:
+        raise FileNotFoundError(f"Brak plików pasujących do: {sciezki}")
+
+    opcje.setdefault('uzyj_cache', True)
+    if wyswietlaj_informacje:
+        print(f"[INFO] Wczytywanie {len(pliki)} plików...")
+
+    def wczytaj(sciezka):
+        try:
+            return wczytaj_csv(sciezka, **opcje)
+        except Exception as e:
+            raise ValueError(f"Nie udało się wczytać pliku {sciezka}: {e}") from e
+
+    liczba_watkow = min(len(pliki), liczba_watkow or os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=liczba_watkow) as pula:
+        ramki = list(pula.map(wczytaj, pliki))
+
+    kolumny = _sprawdz_zgodnosc_schematow(pliki, ramki, dopuszczaj_brakujace)
+
+    # Wspólna kolejność kolumn, wspólne słowniki kategorii
+    unifikator = UnifikatorKategorii()
+    ramki = [unifikator.dodaj(_uzupelnij_kolumny(ramka, kolumny, ramki)) for ramka in ramki]
+    dlugosci = [len(ramka) for ramka in ramki]
+    df = unifikator.polacz(ramki)
+
+    if kolumna_zrodla is not None:
+        if kolumna_zrodla in df.columns:
+            raise ValueError(f"Kolumna '{kolumna_zrodla}' już istnieje w danych")
+        # Kategoria z kodami powtarzanymi blokami - bez napisów dla każdego wiersza
+        nazwy = pd.Index([os.path.basename(p) for p in pliki])
+        kody = np.repeat(np.arange(len(pliki), dtype=np.int32), dlugosci)
+        df[kolumna_zrodla] = pd.Categorical.from_codes(kody, dtype=pd.CategoricalDtype(nazwy.unique())
+                                                       if nazwy.is_unique else pd.CategoricalDtype(pliki))
+
+    if wyswietlaj_informacje:
+        print(f"[SUKCES] Połączono {len(pliki)} plików: {len(df)} wierszy x {df.shape[1]} kolumn")
+    return df
+
+
+def wczytaj_excel(
+        sciezka_pliku: str,
+        arkusze: Optional[Union[str, List[str]]] = None,
+        kolumna_arkusza: Optional[str] = None,
+        kolumny_daty: Optional[List[str]] = None,
+        format_daty: Optional[str] = None,
+        liczba_procesow: Optional[int] = None,
+        uzyj_cache: bool = True,
+        katalog_cache: Optional[str] = None,
+        wyswietlaj_informacje: bool = False,
+        postep: Optional[Callable[[int, int, int], None]] = None
+) -> pd.DataFrame:
+    """
+    Wczytuje skoroszyt Excela (.xlsx/.xlsm, np. Online Retail II) do jednego DataFrame'u.
 
-    for col in df_copy.columns:
-        if kolumny_daty and col in kolumny_daty:
+    Każdy arkusz jest czytany strumieniowo (openpyxl w trybie read_only, porcjami
+    po ROZMIAR_PORCJI_EXCEL wierszy) w osobnym procesie, z tą samą detekcją typów
+    i optymalizacją pamięci co w wczytaj_csv. Arkusze muszą mieć zgodne schematy;
+    kolumny kategoryczne dostają wspólne słowniki. Wynik trafia do kolumnowego
+    cache, więc kolejne otwarcie niezmienionego pliku nie parsuje XML.
+
+    Parametry:
+    ---------
+    sciezka_pliku : str
+        Ścieżka do pliku .xlsx/.xlsm
+    arkusze : Union[str, List[str]], opcjonalnie
+        Nazwa arkusza lub lista nazw; domyślnie wszystkie arkusze
+    kolumna_arkusza : str, opcjonalnie
+        Nazwa dodawanej kolumny kategorycznej z nazwą arkusza źródłowego wiersza
+    kolumny_daty : List[str], opcjonalnie
+        Lista kolumn do konwersji na daty (komórki z datą Excela są datami od razu)
+    format_daty : str, opcjonalnie
+        Format daty dla kolumn tekstowych
+    liczba_procesow : int, opcjonalnie
+        Liczba arkuszy wczytywanych jednocześnie (domyślnie liczba rdzeni)
+    uzyj_cache : bool
+        Czy użyć kolumnowego cache (jak w wczytaj_csv)
+    katalog_cache : str, opcjonalnie
+        Katalog cache (domyślnie KATALOG_CACHE)
+    wyswietlaj_informacje : bool
+        Czy wyświetlać informacje diagnostyczne
+    postep : Callable[[int, int, int], None], opcjonalnie
+        Funkcja wywoływana z (wczytane arkusze, wszystkie arkusze, wczytane wiersze)
+
+    Zwraca:
+    ------
+    pd.DataFrame
+        Połączone dane arkuszy w kolejności arkuszy
+    """
+    if not os.path.exists(sciezka_pliku):
+        raise FileNotFoundError(f"Plik nie istnieje: {sciezka_pliku}")
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError("Wczytywanie plików Excel wymaga pakietu openpyxl (pip install openpyxl)")
+
+    # Nazwy arkuszy - w trybie read_only bez wczytywania zawartości
+    skoroszyt = load_workbook(sciezka_pliku, read_only=True)
+    try:
+        wszystkie = list(skoroszyt.sheetnames)
+    finally:
+        skoroszyt.close()
+    if arkusze is None:
+        arkusze = wszystkie
+    elif isinstance(arkusze, str):
+        arkusze = [arkusze]
+    brakujace = [a for a in arkusze if a not in wszystkie]
+    if brakujace:
+        raise ValueError(f"Brak arkuszy {brakujace} w pliku (dostępne: {wszystkie})")
+
+    klucz_cache = None
+    if uzyj_cache:
+        klucz_cache = _klucz_cache(sciezka_pliku, arkusze=arkusze, kolumna_arkusza=kolumna_arkusza,
+                                   kolumny_daty=kolumny_daty, format_daty=format_daty,
+                                   polityka_typow=vars(_POLITYKA_TYPOW))
+        df = _odczytaj_z_cache(klucz_cache, katalog_cache)
+        if df is not None:
+            if wyswietlaj_informacje:
+                print(f"[SUKCES] Wczytano z cache {len(df)} wierszy x {df.shape[1]} kolumn")
+            if postep:
+                postep(len(arkusze), len(arkusze), len(df))
+            return df
+
+    if wyswietlaj_informacje:
+        print(f"[INFO] Wczytywanie {len(arkusze)} arkuszy z {os.path.basename(sciezka_pliku)}...")
+
+    liczba_procesow = min(len(arkusze), liczba_procesow or os.cpu_count() or 1)
+    ramki = [None] * len(arkusze)
+    wiersze = 0
+    if liczba_procesow > 1:
+        with ProcessPoolExecutor(max_workers=liczba_procesow) as pula:
+            zadania = {pula.submit(_wczytaj_arkusz, sciezka_pliku, arkusz, kolumny_daty, format_daty): i
+                       for i, arkusz in enumerate(arkusze)}
+            for gotowe, zadanie in enumerate(as_completed(zadania), start=1):
+                ramki[zadania[zadanie]] = zadanie.result()
+                wiersze += len(ramki[zadania[zadanie]])
+                if postep:
+                    postep(gotowe, len(arkusze), wiersze)
+    else:
+        for i, arkusz in enumerate(arkusze):
+            ramki[i] = _wczytaj_arkusz(sciezka_pliku, arkusz, kolumny_daty, format_daty)
+            wiersze += len(ramki[i])
+            if postep:
+                postep(i + 1, len(arkusze), wiersze)
+
+    # Puste arkusze (bez nagłówka) są pomijane
+    niepuste = [(a, r) for a, r in zip(arkusze, ramki) if len(r.columns)]
+    if not niepuste:
+        raise ValueError("Wybrane arkusze nie zawierają danych")
+    arkusze, ramki = [a for a, _ in niepuste], [r for _, r in niepuste]
+
+    kolumny = _sprawdz_zgodnosc_schematow(arkusze, ramki)
+    unifikator = UnifikatorKategorii()
+    ramki = [unifikator.dodaj(ramka[kolumny]) for ramka in ramki]
+    dlugosci = [len(ramka) for ramka in ramki]
+    df = unifikator.polacz(ramki)
+
+    if kolumna_arkusza is not None:
+        if kolumna_arkusza in df.columns:
+            raise ValueError(f"Kolumna '{kolumna_arkusza}' już istnieje w danych")
+        kody = np.repeat(np.arange(len(arkusze), dtype=np.int32), dlugosci)
+        df[kolumna_arkusza] = pd.Categorical.from_codes(kody, dtype=pd.CategoricalDtype(arkusze))
+
+    if wyswietlaj_informacje:
+        print(f"[SUKCES] Wczytano {len(df)} wierszy x {df.shape[1]} kolumn z {len(arkusze)} arkuszy")
+    if klucz_cache is not None:
+        _zapisz_do_cache(df, klucz_cache, katalog_cache, wyswietlaj_informacje)
+    return df
+
+
+def _wczytaj_arkusz(sciezka_pliku: str, arkusz: str, kolumny_daty: Optional[List[str]] = None,
+                    format_daty: Optional[str] = None) -> pd.DataFrame:
+    """
+    Czyta jeden arkusz strumieniowo (read_only, values_only) porcjami wierszy;
+    każda porcja przechodzi detekcję typów i optymalizację pamięci, a kategorie
+    porcji są ujednolicane jak w trybie chunkingu wczytaj_csv.
+    """
+    from openpyxl import load_workbook
+
+    skoroszyt = load_workbook(sciezka_pliku, read_only=True, data_only=True)
+    try:
+        wiersze = skoroszyt[arkusz].iter_rows(values_only=True)
+        naglowek = next(wiersze, None)
+        if naglowek is None:
+            return pd.DataFrame()
+        # Puste komórki na końcu nagłówka (zakres arkusza szerszy niż dane) są pomijane
+        while naglowek and naglowek[-1] is None:
+            naglowek = naglowek[:-1]
+        nazwy = [str(n).strip() if n is not None else f"Kolumna_{i + 1}"
+                 for i, n in enumerate(naglowek)]
+        szerokosc = len(nazwy)
+
+        czesci = []
+        unifikator = UnifikatorKategorii()
+        while True:
+            porcja = list(itertools.islice(wiersze, ROZMIAR_PORCJI_EXCEL))
+            if not porcja:
+                break
+            # Wiersze o innej długości niż nagłówek są przycinane/uzupełniane brakami
+            porcja = [w[:szerokosc] if len(w) >= szerokosc else w + (None,) * (szerokosc - len(w))
+                      for w in porcja]
+            c = pd.DataFrame.from_records(porcja, columns=nazwy)
+            # Całkowicie puste wiersze (formatowanie poniżej danych)
+            c = c.dropna(how='all')
+            c = _automatyczna_detekcja_typow(c, kolumny_daty, format_daty)
+            c = _optymalizuj_pamiec(c)
+            czesci.append(unifikator.dodaj(c))
+        if not czesci:
+            return pd.DataFrame(columns=nazwy)
+        return unifikator.polacz(czesci)
+    finally:
+        skoroszyt.close()
+
+
+def _uzupelnij_kolumny(ramka: pd.DataFrame, kolumny: List[str], ramki: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Ustawia kolumny ramki we wspólnej kolejności; brakujące kolumny wypełnia brakami
+    w typie, jaki kolumna ma w innych plikach (NaT dla dat, pusta kategoria itd.)
+    """
+    brakujace = [k for k in kolumny if k not in ramka.columns]
+    if not brakujace:
+        return ramka[kolumny]
+    ramka = ramka.copy()
+    for kolumna in brakujace:
+        typ = next(r[kolumna].dtype for r in ramki if kolumna in r.columns)
+        if isinstance(typ, pd.CategoricalDtype):
+            ramka[kolumna] = pd.Categorical.from_codes(np.full(len(ramka), -1),
+                                                       dtype=pd.CategoricalDtype(typ.categories[:0]))
+        elif pd.api.types.is_integer_dtype(typ) or pd.api.types.is_bool_dtype(typ):
+            # Typy NumPy int/bool nie mają braków
+            ramka[kolumna] = np.nan if pd.api.types.is_integer_dtype(typ) else None
+        else:
+            ramka[kolumna] = pd.Series(index=ramka.index, dtype=typ)
+    return ramka[kolumny]
+
+
+def _rodzina_typu(seria: pd.Series) -> str:
+    """Rodzina typu kolumny na potrzeby porównania schematów plików"""
+    if pd.api.types.is_bool_dtype(seria):
+        return 'logiczna'
+    if pd.api.types.is_numeric_dtype(seria) and not isinstance(seria.dtype, pd.CategoricalDtype):
+        return 'liczba'
+    if pd.api.types.is_datetime64_any_dtype(seria):
+        return 'data'
+    return 'tekst'
+
+
+def _sprawdz_zgodnosc_schematow(pliki: List[str], ramki: List[pd.DataFrame],
+                                dopuszczaj_brakujace: bool = False) -> List[str]:
+    """
+    Sprawdza, czy pliki mają zgodne schematy (kolumny i rodziny typów).
+    Zwraca wspólną listę kolumn (kolejność pierwszego pliku, potem nowe kolumny).
+    """
+    kolumny = []
+    for ramka in ramki:
+        kolumny.extend(k for k in ramka.columns if k not in kolumny)
+
+    if not dopuszczaj_brakujace:
+        roznice = {os.path.basename(p): sorted(set(kolumny) - set(r.columns))
+                   for p, r in zip(pliki, ramki) if set(kolumny) - set(r.columns)}
+        if roznice:
+            raise ValueError(f"Niezgodne schematy - brakujące kolumny: {roznice}")
+
+    konflikty = {}
+    for kolumna in kolumny:
+        rodziny = {os.path.basename(p): _rodzina_typu(r[kolumna])
+                   for p, r in zip(pliki, ramki) if kolumna in r.columns and r[kolumna].notna().any()}
+        if len(set(rodziny.values())) > 1:
+            konflikty[kolumna] = rodziny
+    if konflikty:
+        raise ValueError(f"Niezgodne typy kolumn między plikami: {konflikty}")
+    return kolumny
+
+
+class BrakKolumnyWarstw(ValueError):
+    """Kolumna warstw próbkowania warstwowego nie występuje w pliku"""
+
+
+def _wczytaj_probke(sciezka_pliku: str, separator: str, kodowanie: str, rozmiar_probki: int,
+                    kolumna_warstw: Optional[str] = None, ziarno: Optional[int] = None,
+                    kompresja: Optional[str] = None, usecols: Optional[List[int]] = None,
+                    wyswietlaj: bool = False,
+                    postep: Optional[Callable[[int, int, int], None]] = None) -> pd.DataFrame:
+    """
+    Jednym przejściem strumieniowym wybiera losową próbkę wierszy (jako tekst).
+
+    Każdy wiersz dostaje losowy klucz, a rezerwuar przechowuje wiersze
+    o najmniejszych kluczach - to odpowiednik próbkowania rezerwuarowego,
+    liczony wektorowo dla całych chunków. W trybie warstwowym rezerwuar
+    jest prowadzony osobno dla każdej warstwy, a na końcu rozmiar próbki
+    dzielony jest proporcjonalnie do liczności warstw (pamięć: do rozmiar_probki
+    wierszy na warstwę, więc kolumna warstw powinna mieć niewiele wartości).
+    """
+    rng = np.random.default_rng(ziarno)
+
+    for eng, bad in [('c', 'warn'), ('python', 'skip')]:
+        rezerwuar, klucze, numery = None, np.empty(0), np.empty(0, dtype=np.int64)
+        licznosci = {}
+        wiersze = 0
+        try:
+            with open(sciezka_pliku, 'rb') as uchwyt:
+                rozmiar = os.fstat(uchwyt.fileno()).st_size
+                reader = pd.read_csv(uchwyt, sep=separator, encoding=kodowanie, engine=eng,
+                                     on_bad_lines=bad, dtype=str, chunksize=100_000, usecols=usecols,
+                                     compression=kompresja)
+                for chunk in reader:
+                    chunk.columns = [col.strip().replace('\ufeff', '') for col in chunk.columns]
+                    if kolumna_warstw is not None and kolumna_warstw not in chunk.columns:
+                        raise BrakKolumnyWarstw(f"Brak kolumny warstw: {kolumna_warstw}")
+
+                    rezerwuar = chunk if rezerwuar is None else pd.concat([rezerwuar, chunk], ignore_index=True)
+                    klucze = np.concatenate([klucze, rng.random(len(chunk))])
+                    numery = np.concatenate([numery, np.arange(wiersze, wiersze + len(chunk))])
+                    wiersze += len(chunk)
+
+                    if kolumna_warstw is None:
+                        wybrane = np.argpartition(klucze, rozmiar_probki - 1)[:rozmiar_probki] \
+                            if len(klucze) > rozmiar_probki else None
+                    else:
+                        for warstwa, liczba in chunk[kolumna_warstw].value_counts(dropna=False).items():
+                            licznosci[warstwa] = licznosci.get(warstwa, 0) + int(liczba)
+                        warstwy = pd.factorize(rezerwuar[kolumna_warstw], use_na_sentinel=False)[0]
+                        wybrane = _najmniejsze_w_warstwach(klucze, warstwy, np.full(warstwy.max() + 1,
+                                                                                    rozmiar_probki))
+                    if wybrane is not None:
+                        rezerwuar = rezerwuar.iloc[wybrane].reset_index(drop=True)
+                        klucze, numery = klucze[wybrane], numery[wybrane]
+                    if postep:
+                        postep(uchwyt.tell(), rozmiar, wiersze)
+            break
+        except BrakKolumnyWarstw:
+            raise
+        except Exception as e:
+            # ParserError i UnicodeDecodeError (podklasy ValueError) - próbujemy kolejnego silnika
+            blad = e
             continue
-        s = sample[col].dropna().astype(str)
-        # Numeryczne
-        if _czy_kolumna_numeryczna(s):
-            sep = _wykryj_separator_dziesietny(s)
-            df_copy[col] = _konwertuj_na_liczbe(df_copy[col], sep)
-            if wyswietlaj:
-                print(f"Numeryczna: {col}")
+    else:
+        print(f"[BŁĄD] Nie udało się wczytać próbki z pliku {sciezka_pliku}: {blad}")
+        raise blad
+
+    if rezerwuar is None:
+        return pd.DataFrame()
+
+    opis = {'metoda': 'jednostajna', 'liczba_wierszy_pliku': wiersze}
+    if kolumna_warstw is not None:
+        # Przydział proporcjonalny do liczności warstw, co najmniej jeden wiersz na warstwę
+        warstwy, wartosci = pd.factorize(rezerwuar[kolumna_warstw], use_na_sentinel=False)
+        liczebnosc = np.array([licznosci[w] for w in wartosci])
+        dostepne = np.bincount(warstwy, minlength=len(wartosci))
+        przydzial = np.minimum(dostepne, np.maximum(1, np.round(rozmiar_probki * liczebnosc / wiersze)))
+        wybrane = _najmniejsze_w_warstwach(klucze, warstwy, przydzial.astype(np.int64))
+        rezerwuar, numery = rezerwuar.iloc[wybrane], numery[wybrane]
+        opis.update({'metoda': 'warstwowa', 'kolumna_warstw': kolumna_warstw,
+                     'czestosci_warstw': {str(w): float(n / c) for w, n, c
+                                          in zip(wartosci, przydzial, liczebnosc)}})
+
+    # Próbka w kolejności wierszy pliku
+    df = rezerwuar.iloc[np.argsort(numery, kind='stable')].reset_index(drop=True)
+    opis['rozmiar_probki'] = len(df)
+    opis['czestosc'] = len(df) / wiersze if wiersze else 1.0
+    df.attrs['probkowanie'] = opis
+
+    if wyswietlaj:
+        print(f"[INFO] Próbka {opis['metoda']}: {len(df)} z {wiersze} wierszy "
+              f"(częstość {opis['czestosc']:.4f})")
+    return df
+
+
+def _najmniejsze_w_warstwach(klucze: np.ndarray, warstwy: np.ndarray, limity: np.ndarray) -> np.ndarray:
+    """Indeksy wierszy o najmniejszych kluczach w każdej warstwie (limity[warstwa] na warstwę)"""
+    kolejnosc = np.lexsort((klucze, warstwy))
+    posortowane = warstwy[kolejnosc]
+    # Pozycja wiersza w obrębie swojej warstwy (warstwy są po sortowaniu ciągłe)
+    poczatki = np.r_[0, np.flatnonzero(np.diff(posortowane)) + 1]
+    pozycja = np.arange(len(kolejnosc)) - np.repeat(poczatki, np.diff(np.r_[poczatki, len(kolejnosc)]))
+    return kolejnosc[pozycja < limity[posortowane]]
+
+
+def _sprawdz_wymagane_kolumny(df: pd.DataFrame, wymagane_kolumny: List[str]) -> pd.DataFrame:
+    """Sprawdza obecność wymaganych kolumn i usuwa wiersze z brakami w tych kolumnach"""
+    brak = set(wymagane_kolumny) - set(df.columns)
+    if brak:
+        raise ValueError(f"Brak wymaganych kolumn: {brak}")
+    return df.dropna(subset=wymagane_kolumny)
+
+
+OPERATORY_FILTROW = ('==', '!=', '<', '<=', '>', '>=', 'in', 'not in', 'miedzy')
+
+
+def _przygotuj_projekcje(sciezka_pliku: str, separator: str, kodowanie: str,
+                         kolumny: Optional[List[str]] = None,
+                         filtry: Optional[List[Tuple[str, str, object]]] = None,
+                         wymagane_kolumny: Optional[List[str]] = None,
+                         kompresja: Optional[str] = None) -> dict:
+    """
+    Ustala, które kolumny pliku trzeba sparsować, na podstawie samego nagłówka.
+
+    Zwraca:
+    ------
+    dict
+        Słownik z kluczami:
+        - 'pozycje': pozycje parsowanych kolumn w pliku (usecols dla parsera)
+        - 'surowe': nazwy tych kolumn w pliku, przed oczyszczeniem
+        - 'kolumny': oczyszczone nazwy kolumn wyniku (w kolejności z parametru)
+        - 'filtry': lista filtrów (kolumna, operator, wartość)
+    """
+    filtry = list(filtry or [])
+    for filtr in filtry:
+        if len(filtr) != 3 or filtr[1] not in OPERATORY_FILTROW:
+            raise ValueError(f"Nieprawidłowy filtr {filtr}; dozwolone operatory: {OPERATORY_FILTROW}")
+
+    surowe = list(pd.read_csv(sciezka_pliku, sep=separator, encoding=kodowanie, nrows=0,
+                              compression=kompresja).columns)
+    nazwy = [str(col).strip().replace('\ufeff', '') for col in surowe]
+
+    wynikowe = list(kolumny) if kolumny is not None else list(nazwy)
+    wynikowe += [kol for kol in (wymagane_kolumny or []) if kol not in wynikowe]
+    potrzebne = set(wynikowe) | {filtr[0] for filtr in filtry}
+    brak = potrzebne - set(nazwy)
+    if brak:
+        raise ValueError(f"Brak kolumn w pliku: {brak}")
+
+    pozycje = [i for i, nazwa in enumerate(nazwy) if nazwa in potrzebne]
+    return {
+        'pozycje': pozycje,
+        'surowe': [surowe[i] for i in pozycje],
+        'kolumny': wynikowe,
+        'filtry': filtry
+    }
+
+
+def _maska_filtra(seria: pd.Series, operator: str, wartosc) -> np.ndarray:
+    """Maska wierszy spełniających jeden warunek; wartość jest dopasowywana do typu kolumny"""
+    def _dopasuj(w):
+        if pd.api.types.is_datetime64_any_dtype(seria):
+            return pd.Timestamp(w)
+        return w
+
+    if isinstance(seria.dtype, pd.CategoricalDtype) and operator not in ('==', '!=', 'in', 'not in'):
+        # Porównania zakresowe na nieuporządkowanych kategoriach - na wartościach
+        seria = seria.astype(seria.cat.categories.dtype)
+
+    if operator == 'in':
+        maska = seria.isin([_dopasuj(w) for w in wartosc])
+    elif operator == 'not in':
+        maska = ~seria.isin([_dopasuj(w) for w in wartosc])
+    elif operator == 'miedzy':
+        od, do = wartosc
+        maska = seria.between(_dopasuj(od), _dopasuj(do))
+    else:
+        w = _dopasuj(wartosc)
+        maska = {
+            '==': lambda: seria == w,
+            '!=': lambda: seria != w,
+            '<': lambda: seria < w,
+            '<=': lambda: seria <= w,
+            '>': lambda: seria > w,
+            '>=': lambda: seria >= w,
+        }[operator]()
+    return maska.fillna(False).to_numpy(dtype=bool)
+
+
+def _filtruj_wiersze(df: pd.DataFrame, projekcja: Optional[dict]) -> pd.DataFrame:
+    """Stosuje filtry projekcji do (typowanej) części pliku i zostawia tylko kolumny wyniku"""
+    if projekcja is None:
+        return df
+    if projekcja['filtry']:
+        maska = np.ones(len(df), dtype=bool)
+        for kolumna, operator, wartosc in projekcja['filtry']:
+            maska &= _maska_filtra(df[kolumna], operator, wartosc)
+        if not maska.all():
+            df = df[maska].reset_index(drop=True)
+    return df[projekcja['kolumny']]
+
+
+# Ostrzeżenia parsera o pominiętych liniach trafiają do słownika bieżącego wątku
+_ZBIERANE_ZLE_LINIE = threading.local()
+_BLOKADA_PRZECHWYTYWANIA = threading.Lock()
+_przechwytywanie_zainstalowane = False
+_WZORZEC_ZLEJ_LINII = re.compile(r"Skipping line (\d+): ([^\n]*)")
+
+
+def _przechwytuj_ostrzezenie_parsera(poprzednia_funkcja):
+    """Opakowanie warnings.showwarning kierujące ParserWarning do zbierającego wątku"""
+    def przechwyc(message, category, filename, lineno, file=None, line=None):
+        zle_linie = getattr(_ZBIERANE_ZLE_LINIE, 'slownik', None)
+        if zle_linie is not None and issubclass(category, pd.errors.ParserWarning):
+            for numer, powod in _WZORZEC_ZLEJ_LINII.findall(str(message)):
+                zle_linie[int(numer)] = powod
+            return
+        poprzednia_funkcja(message, category, filename, lineno, file, line)
+    return przechwyc
+
+
+@contextmanager
+def _zbieraj_zle_linie(zle_linie: Dict[int, str]):
+    """
+    Zbiera linie pominięte przez parser (on_bad_lines='warn') do słownika
+    {numer linii: powód} zamiast wypisywać ostrzeżenia.
+
+    Działa per wątek (wczytaj_wiele_csv i GUI czytają w wątkach), więc zamiast
+    warnings.catch_warnings - które podmienia stan globalny - jednorazowo
+    instalowane jest opakowanie warnings.showwarning. Filtr 'always' dla
+    ParserWarning z tego modułu wyłącza deduplikację: ponowne wczytanie tego
+    samego pliku zgłasza te same linie jeszcze raz.
+    """
+    global _przechwytywanie_zainstalowane
+    with _BLOKADA_PRZECHWYTYWANIA:
+        if not _przechwytywanie_zainstalowane:
+            warnings.filterwarnings('always', category=pd.errors.ParserWarning, module=re.escape(__name__))
+            warnings.showwarning = _przechwytuj_ostrzezenie_parsera(warnings.showwarning)
+            _przechwytywanie_zainstalowane = True
+
+    poprzedni = getattr(_ZBIERANE_ZLE_LINIE, 'slownik', None)
+    _ZBIERANE_ZLE_LINIE.slownik = zle_linie
+    try:
+        yield zle_linie
+    finally:
+        _ZBIERANE_ZLE_LINIE.slownik = poprzedni
+
+
+def _zapisz_kwarantanne(sciezka_pliku: str, kompresja: Optional[str], kodowanie: str,
+                        zle_linie: Dict[int, str], plik_kwarantanny: str) -> None:
+    """
+    Zapisuje pominięte linie do pliku CSV (linia, powod, tresc). Treść jest
+    doczytywana jednym przejściem po bajtach pliku - bez parsowania CSV -
+    i tylko do ostatniej pominiętej linii.
+    """
+    ostatnia = max(zle_linie)
+    tresci = {}
+    with _otworz_dane(sciezka_pliku, kompresja) as strumien:
+        numer = 0
+        reszta = b''
+        while numer < ostatnia:
+            blok = strumien.read(ROZMIAR_BUFORA_PROFILU)
+            if not blok:
+                if reszta:
+                    numer += 1
+                    if numer in zle_linie:
+                        tresci[numer] = reszta
+                break
+            linie = (reszta + blok).split(b'\n')
+            reszta = linie.pop()
+            for linia in linie:
+                numer += 1
+                if numer in zle_linie:
+                    tresci[numer] = linia
+                if numer >= ostatnia:
+                    break
+
+    os.makedirs(os.path.dirname(os.path.abspath(plik_kwarantanny)), exist_ok=True)
+    with open(plik_kwarantanny, 'w', newline='', encoding='utf-8') as plik:
+        zapis = csv.writer(plik)
+        zapis.writerow(['linia', 'powod', 'tresc'])
+        for numer in sorted(zle_linie):
+            tresc = tresci.get(numer, b'').rstrip(b'\r').decode(kodowanie, errors='replace')
+            zapis.writerow([numer, zle_linie[numer], tresc])
+
+
+def _czy_kodowanie_zgodne_z_ascii(kodowanie: str) -> bool:
+    """Czy znak nowej linii w danym kodowaniu to pojedynczy bajt b'\\n'"""
+    try:
+        nazwa = codecs.lookup(kodowanie).name
+    except LookupError:
+        return False
+    return not (nazwa.startswith('utf-16') or nazwa.startswith('utf-32'))
+
+
+def _podziel_na_zakresy(sciezka_pliku: str, liczba_czesci: int) -> Tuple[bytes, List[Tuple[int, int]]]:
+    """
+    Dzieli plik na zakresy bajtów wyrównane do granic rekordów.
+
+    Pola w cudzysłowach mogą zawierać znaki nowej linii, więc granica trafia
+    tylko za znak nowej linii poprzedzony parzystą liczbą cudzysłowów (liczoną
+    od początku danych - podwojony cudzysłów w polu nie zmienia parzystości).
+    Cudzysłów w środku pola bez cudzysłowów (np. 12" pizza) może przesunąć
+    granicę do wnętrza pola - wywołujący obsługują wtedy ParserError.
+
+    Zwraca:
+    ------
+    Tuple[bytes, List[Tuple[int, int]]]
+        Surowy wiersz nagłówka oraz listę zakresów (początek, koniec) części danych
+    """
+    rozmiar = os.path.getsize(sciezka_pliku)
+    with open(sciezka_pliku, 'rb') as f:
+        naglowek = f.readline()
+        poczatek_danych = f.tell()
+        krok = max(1, (rozmiar - poczatek_danych) // max(1, liczba_czesci))
+
+        granice = [poczatek_danych]
+        # Parzystość liczby cudzysłowów od początku danych do pozycji policzone
+        nieparzyste = False
+        policzone = poczatek_danych
+        for i in range(1, liczba_czesci):
+            pozycja = poczatek_danych + i * krok
+            if pozycja <= granice[-1]:
+                continue
+            f.seek(policzone)
+            while policzone < pozycja:
+                blok = f.read(min(ROZMIAR_BLOKU_ODCZYTU, pozycja - policzone))
+                nieparzyste ^= blok.count(b'"') % 2 == 1
+                policzone += len(blok)
+            # Przesuwamy granicę na początek następnej linii spoza pola w cudzysłowie
+            while True:
+                linia = f.readline()
+                nieparzyste ^= linia.count(b'"') % 2 == 1
+                if not linia or not nieparzyste:
+                    break
+            pozycja = policzone = f.tell()
+            if pozycja >= rozmiar:
+                break
+            if pozycja > granice[-1]:
+                granice.append(pozycja)
+        granice.append(rozmiar)
+
+    zakresy = [(p, k) for p, k in zip(granice[:-1], granice[1:]) if k > p]
+    return naglowek, zakresy
+
+
+def _czytaj_bajty(sciezka_pliku: str, poczatek: int, koniec: int) -> bytes:
+    with open(sciezka_pliku, 'rb') as f:
+        f.seek(poczatek)
+        return f.read(koniec - poczatek)
+
+
+def _parsuj_zakres(sciezka_pliku: str, naglowek: bytes, poczatek: int, koniec: int,
+                   separator: str, kodowanie: str, kolumny_daty: List[str] = None,
+                   format_daty: str = None, schemat: Optional[dict] = None,
+                   projekcja: Optional[dict] = None) -> pd.DataFrame:
+    """Parsuje jeden zakres bajtów pliku (wykonywane w procesie roboczym)"""
+    dane = _czytaj_bajty(sciezka_pliku, poczatek, koniec)
+
+    if schemat is not None:
+        zle_linie = {}
+        with _zbieraj_zle_linie(zle_linie):
+            czesc = _parsuj_ze_schematem(naglowek + dane, schemat, separator, kodowanie)
+        czesc = _optymalizuj_pamiec(_filtruj_wiersze(czesc, projekcja))
+        czesc.attrs['zle_linie'] = zle_linie
+        czesc.attrs['linie_zakresu'] = dane.count(b'\n')
+        return czesc
+
+    zle_linie = {}
+    with _zbieraj_zle_linie(zle_linie):
+        czesc = pd.read_csv(io.BytesIO(naglowek + dane), sep=separator, encoding=kodowanie,
+                            engine='c', on_bad_lines='warn',
+                            usecols=projekcja['pozycje'] if projekcja else None)
+    czesc.columns = [col.strip().replace('\ufeff', '') for col in czesc.columns]
+    czesc = _automatyczna_detekcja_typow(czesc, kolumny_daty, format_daty, False)
+    czesc = _optymalizuj_pamiec(_filtruj_wiersze(czesc, projekcja))
+    # Numery linii liczone od nagłówka zakresu - przeliczane na numery w pliku przez wywołującego
+    czesc.attrs['zle_linie'] = zle_linie
+    czesc.attrs['linie_zakresu'] = dane.count(b'\n')
+    return czesc
+
+
+def _wczytaj_rownolegle(sciezka_pliku: str, separator: str, kodowanie: str,
+                        kolumny_daty: List[str] = None, format_daty: str = None,
+                        liczba_procesow: Optional[int] = None,
+                        wyswietlaj: bool = False,
+                        schemat: Optional[dict] = None,
+                        projekcja: Optional[dict] = None,
+                        postep: Optional[Callable[[int, int, int], None]] = None) -> Optional[pd.DataFrame]:
+    """
+    Wczytuje plik równolegle: każdy zakres bajtów jest parsowany, typowany
+    i optymalizowany w osobnym procesie, a wyniki są łączone w kolejności pliku.
+
+    Zwraca None, jeśli tryb równoległy nie ma zastosowania lub się nie powiódł -
+    wtedy wywołujący przechodzi na ścieżkę sekwencyjną.
+    """
+    if not isinstance(separator, str) or not _czy_kodowanie_zgodne_z_ascii(kodowanie):
+        return None
+
+    rozmiar = os.path.getsize(sciezka_pliku)
+    liczba_procesow = min(liczba_procesow or os.cpu_count() or 1, rozmiar // MIN_ROZMIAR_ROWNOLEGLY)
+    if liczba_procesow < 2:
+        return None
+
+    # Więcej zakresów niż procesów wyrównuje obciążenie i ogranicza pamięć na proces
+    liczba_czesci = max(liczba_procesow, math.ceil(rozmiar / ROZMIAR_ZAKRESU))
+    naglowek, zakresy = _podziel_na_zakresy(sciezka_pliku, liczba_czesci)
+    if len(zakresy) < 2:
+        return None
+
+    if wyswietlaj:
+        print(f"[INFO] Tryb równoległy: {len(zakresy)} zakresów, {liczba_procesow} procesów")
+
+    try:
+        with ProcessPoolExecutor(max_workers=min(liczba_procesow, len(zakresy))) as pula:
+            zadania = [
+                pula.submit(_parsuj_zakres, sciezka_pliku, naglowek, poczatek, koniec,
+                            separator, kodowanie, kolumny_daty, format_daty, schemat, projekcja)
+                for poczatek, koniec in zakresy
+            ]
+            czesci = []
+            przeczytane = 0
+            for (poczatek, koniec), zadanie in zip(zakresy, zadania):
+                czesci.append(zadanie.result())
+                przeczytane += koniec - poczatek
+                if postep:
+                    postep(przeczytane, rozmiar, sum(len(c) for c in czesci))
+        return _polacz_czesci(czesci)
+    except Exception as e:
+        if wyswietlaj:
+            print(f"[UWAGA] Wczytywanie równoległe nie powiodło się ({e}), przechodzę na sekwencyjne")
+        return None
+
+
+def _polacz_czesci(czesci: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Łączy części pliku w jeden DataFrame ze wspólnymi słownikami kategorii,
+    sumując liczniki niezgodności ze schematem
+    """
+    niezgodne = {}
+    zle_linie = {}
+    # Linia 1 to nagłówek, więc linia N zakresu to linia (linie poprzednich zakresów + N) pliku
+    linie_przed = 0
+    unifikator = UnifikatorKategorii()
+    for czesc in czesci:
+        for kolumna, liczba in czesc.attrs.get('niezgodne_ze_schematem', {}).items():
+            niezgodne[kolumna] = niezgodne.get(kolumna, 0) + liczba
+        for linia, powod in czesc.attrs.get('zle_linie', {}).items():
+            zle_linie[linie_przed + linia] = powod
+        linie_przed += czesc.attrs.get('linie_zakresu', 0)
+        unifikator.dodaj(czesc)
+
+    df = unifikator.polacz(czesci)
+    df.attrs = {'niezgodne_ze_schematem': niezgodne} if niezgodne else {}
+    if zle_linie:
+        df.attrs['zle_linie'] = zle_linie
+    return df
+
+
+class UnifikatorKategorii:
+    """
+    Strumieniowo buduje globalne słowniki kategorii dla kolejnych części pliku.
+
+    Bez tego pd.concat części z różnymi zbiorami kategorii (albo z kolumną,
+    która w jednej części jest kategorią, a w innej tekstem lub liczbą) po cichu
+    wraca do typu object. Słownik globalny tylko rośnie, więc kody nadane wcześniejszym
+    częściom pozostają ważne; przekodowanie odbywa się na poziomie słownika
+    (tablica lokalny kod -> globalny kod), bez tworzenia napisów dla wierszy.
+    """
+
+    def __init__(self) -> None:
+        self.slowniki: Dict[str, pd.Index] = {}
+
+    def dodaj(self, czesc: pd.DataFrame) -> pd.DataFrame:
+        """Przekodowuje kolumny kategoryczne części na wspólny słownik (modyfikuje część)"""
+        for kolumna in czesc.columns:
+            seria = czesc[kolumna]
+            kategoryczna = isinstance(seria.dtype, pd.CategoricalDtype)
+            if not kategoryczna:
+                # Kolumna staje się kategorią, jeśli w innej części nią była
+                if kolumna not in self.slowniki:
+                    continue
+                if not (pd.api.types.is_object_dtype(seria) or isinstance(seria.dtype, pd.StringDtype)):
+                    # Np. kod towaru liczbowy w tej części, a z literą w innej - wartości
+                    # jako tekst (braki zostają brakami), żeby pasowały do słownika
+                    seria = seria.astype('string').astype(object)
+                seria = seria.astype('category')
+            czesc[kolumna] = self._przekoduj(kolumna, seria)
+        return czesc
+
+    def _przekoduj(self, kolumna: str, seria: pd.Series) -> pd.Categorical:
+        lokalne = seria.cat.categories
+        globalne = self.slowniki.get(kolumna)
+        if globalne is None:
+            self.slowniki[kolumna] = lokalne
+            return seria.array
+        if len(lokalne) <= len(globalne) and globalne[:len(lokalne)].equals(lokalne):
+            # Słownik części jest prefiksem globalnego - kody są już poprawne
+            return seria.array
+
+        nowe = lokalne.difference(globalne, sort=False)
+        if len(nowe):
+            globalne = globalne.append(nowe)
+            self.slowniki[kolumna] = globalne
+
+        # Ostatni element mapowania obsługuje kod -1 (brak wartości)
+        mapowanie = np.append(globalne.get_indexer(lokalne), -1)
+        kody = mapowanie[seria.cat.codes.to_numpy()]
+        return pd.Categorical.from_codes(kody, dtype=pd.CategoricalDtype(globalne))
+
+    def polacz(self, czesci: List[pd.DataFrame]) -> pd.DataFrame:
+        """Nadaje wszystkim częściom końcowe słowniki i łączy je bez utraty typu category"""
+        if not czesci:
+            return pd.DataFrame()
+
+        # Kolumny, które stały się kategoriami dopiero w późniejszych częściach
+        for czesc in czesci:
+            self.dodaj(czesc)
+
+        for czesc in czesci:
+            for kolumna, slownik in self.slowniki.items():
+                if kolumna not in czesc.columns or not isinstance(czesc[kolumna].dtype, pd.CategoricalDtype):
+                    continue
+                if len(czesc[kolumna].cat.categories) != len(slownik):
+                    czesc[kolumna] = pd.Categorical.from_codes(czesc[kolumna].cat.codes.to_numpy(),
+                                                               dtype=pd.CategoricalDtype(slownik))
+        return pd.concat(czesci, ignore_index=True)
+
+
+def _normalizuj_typy_arrow(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Dostosowuje wynik read_csv(dtype_backend='pyarrow') do reszty aplikacji:
+    tekst zostaje w Arrow jako string[pyarrow], a liczby, daty i wartości logiczne
+    przechodzą na typy NumPy, żeby select_dtypes(np.number) w Backendzie je widział.
+    """
+    import pyarrow as pa
+
+    for kolumna in df.columns:
+        seria = df[kolumna]
+        if not isinstance(seria.dtype, pd.ArrowDtype):
             continue
-        # Daty
-        if _czy_kolumna_zawiera_daty(s):
-            fmt = _wykryj_format_daty(s)
-            df_copy[col] = pd.to_datetime(df_copy[col], format=fmt, errors='coerce')
+        typ = seria.dtype.pyarrow_dtype
+        if pa.types.is_string(typ) or pa.types.is_large_string(typ):
+            df[kolumna] = seria.astype('string[pyarrow]')
+        elif pa.types.is_integer(typ) or pa.types.is_boolean(typ):
+            # Braki w kolumnie całkowitej/logicznej - jak w silniku c (float64/object)
+            if seria.hasnans:
+                df[kolumna] = seria.astype('float64' if pa.types.is_integer(typ) else object)
+            else:
+                df[kolumna] = seria.astype(typ.to_pandas_dtype())
+        elif pa.types.is_floating(typ):
+            df[kolumna] = seria.astype('float64')
+        elif pa.types.is_timestamp(typ) or pa.types.is_date(typ):
+            df[kolumna] = seria.astype('datetime64[ns]')
+    return df
+
+
+def _czy_typ_tekstowy(kolumna: pd.Series) -> bool:
+    """Tekst jako object albo jako typ string (w tym string[pyarrow])"""
+    return pd.api.types.is_object_dtype(kolumna) or isinstance(kolumna.dtype, pd.StringDtype) or (
+        isinstance(kolumna.dtype, pd.ArrowDtype) and pd.api.types.is_string_dtype(kolumna))
+
+
+def _wywnioskuj_schemat(sciezka_pliku: str, separator: str, kodowanie: str,
+                        kolumny_daty: List[str] = None, format_daty: str = None,
+                        wyswietlaj: bool = False,
+                        rozmiar_probki: int = ROZMIAR_PROBKI_SCHEMATU,
+                        pozycje: Optional[List[int]] = None,
+                        kompresja: Optional[str] = None) -> dict:
+    """
+    Wnioskuje schemat pliku na podstawie ograniczonej próbki początkowych wierszy.
+
+    Zwraca:
+    ------
+    dict
+        Słownik z kluczami:
+        - 'nazwy': oczyszczone nazwy kolumn w kolejności pliku
+        - 'pozycje': pozycje wczytywanych kolumn w pliku (None - wszystkie)
+        - 'kompresja': kompresja pliku (None - plik nieskompresowany)
+        - 'dtype': {kolumna: dtype} przekazywany bezpośrednio do read_csv
+        - 'daty': {kolumna: format lub None} dla kolumn dat
+        - 'dziesietny': separator dziesiętny wspólny dla kolumn liczbowych
+        - 'konwersje': {kolumna: separator dziesiętny} dla kolumn liczbowych,
+          które trzeba skonwertować ręcznie (inny separator, pojedyncze śmieci)
+    """
+    probka = pd.read_csv(sciezka_pliku, sep=separator, encoding=kodowanie, nrows=rozmiar_probki,
+                         dtype=str, engine='c', on_bad_lines='skip', usecols=pozycje,
+                         compression=kompresja)
+    nazwy = [str(col).strip().replace('\ufeff', '') for col in probka.columns]
+    probka.columns = nazwy
+
+    plan = _zaplanuj_typy(probka, kolumny_daty, format_daty, rozmiar_probki=len(probka))
+
+    typy = {}
+    daty = {}
+    liczbowe = {}
+    separatory_dziesietne = {}
+    for kolumna, krok in plan.items():
+        if krok['typ'] == 'data':
+            daty[kolumna] = krok['format']
+        elif krok['typ'] == 'liczba':
+            s = probka[kolumna].dropna().str.strip()
+            liczbowe[kolumna] = s[s != '']
+            separatory_dziesietne[kolumna] = krok['separator_dziesietny']
+        elif krok['typ'] == 'kategoria':
+            typy[kolumna] = 'category'
+        else:
+            typy[kolumna] = 'object'
+
+    # Jeden separator dziesiętny dla całego pliku - wybieramy najczęstszy
+    dziesietny = '.'
+    if list(separatory_dziesietne.values()).count(',') > list(separatory_dziesietne.values()).count('.'):
+        dziesietny = ','
+    if dziesietny == separator:
+        dziesietny = '.'
+
+    konwersje = {}
+    for kolumna, s in liczbowe.items():
+        sep_dziesietny = separatory_dziesietne[kolumna]
+        wzorzec = r'^-?\d+(' + re.escape(sep_dziesietny) + r'\d+)?$'
+        wszystkie_liczby = s.str.match(wzorzec).all()
+        if sep_dziesietny != dziesietny or not wszystkie_liczby:
+            # Czytamy jako tekst i konwertujemy ręcznie
+            typy[kolumna] = 'object'
+            konwersje[kolumna] = sep_dziesietny
+        elif s.str.match(r'^-?\d+$').all() and probka[kolumna].notna().all():
+            typy[kolumna] = 'int64'
+        else:
+            typy[kolumna] = 'float64'
+
+    if wyswietlaj:
+        print(f"[INFO] Schemat z próbki {len(probka)} wierszy: {typy}, daty: {daty}, "
+              f"separator dziesiętny: '{dziesietny}'")
+
+    return {'nazwy': nazwy, 'pozycje': pozycje, 'kompresja': kompresja, 'dtype': typy, 'daty': daty, 'dziesietny': dziesietny, 'konwersje': konwersje}
+
+
+def _parsuj_ze_schematem(zrodlo: Union[str, bytes], schemat: dict,
+                         separator: str, kodowanie: str) -> pd.DataFrame:
+    """
+    Parsuje plik (ścieżka) lub jego fragment (bajty z nagłówkiem) według schematu.
+
+    Szybka ścieżka przekazuje typy bezpośrednio do parsera C. Jeśli dane łamią schemat
+    (np. tekst w kolumnie liczbowej), fragment jest parsowany ponownie z kolumnami
+    liczbowymi jako tekst i konwertowany z errors='coerce'. Liczba wartości, które
+    nie dały się skonwertować, trafia do df.attrs['niezgodne_ze_schematem'].
+    """
+    def _otworz():
+        return io.BytesIO(zrodlo) if isinstance(zrodlo, bytes) else zrodlo
+
+    wspolne = dict(sep=separator, encoding=kodowanie, header=0, names=schemat['nazwy'],
+                   usecols=schemat.get('pozycje'), engine='c', on_bad_lines='warn',
+                   compression=None if isinstance(zrodlo, bytes) else schemat.get('kompresja'))
+    formaty_dat = {kol: fmt for kol, fmt in schemat['daty'].items() if fmt}
+
+    try:
+        df = pd.read_csv(_otworz(), dtype=schemat['dtype'], parse_dates=list(formaty_dat),
+                         date_format=formaty_dat or None, decimal=schemat['dziesietny'], **wspolne)
+        liczbowe_do_naprawy = {}
+    except (ValueError, TypeError, OverflowError):
+        # Ścieżka awaryjna: kolumny liczbowe czytamy jako tekst
+        typy_tekstowe = {kol: (typ if typ in ('category', 'object') else 'object')
+                         for kol, typ in schemat['dtype'].items()}
+        df = pd.read_csv(_otworz(), dtype=typy_tekstowe, **wspolne)
+        liczbowe_do_naprawy = {kol: schemat['dziesietny'] for kol, typ in schemat['dtype'].items()
+                               if typ in ('int64', 'float64')}
+
+    return _dopasuj_do_schematu(df, schemat, liczbowe_do_naprawy)
+
+
+def _dopasuj_do_schematu(df: pd.DataFrame, schemat: dict,
+                         liczbowe_do_naprawy: Dict[str, str] = None) -> pd.DataFrame:
+    """
+    Konwertuje kolumny wczytane jako tekst (konwersje schematu, naprawiane kolumny
+    liczbowe, nierozpoznane daty) i zlicza wartości, których nie dało się skonwertować.
+    """
+    niezgodne = {}
+    for kolumna, sep_dziesietny in {**schemat['konwersje'], **(liczbowe_do_naprawy or {})}.items():
+        przed = df[kolumna].notna()
+        df[kolumna] = _konwertuj_na_liczbe(df[kolumna], sep_dziesietny)
+        liczba = int((przed & df[kolumna].isna()).sum())
+        if liczba:
+            niezgodne[kolumna] = liczba
+
+    for kolumna, fmt in schemat['daty'].items():
+        if not pd.api.types.is_datetime64_any_dtype(df[kolumna]):
+            przed = df[kolumna].notna()
+            df[kolumna] = _konwertuj_na_date(df[kolumna], fmt)
+            liczba = int((przed & df[kolumna].isna()).sum())
+            if liczba:
+                niezgodne[kolumna] = liczba
+
+    if niezgodne:
+        df.attrs['niezgodne_ze_schematem'] = niezgodne
+    return df
+
+
+def _wczytaj_ze_schematem(sciezka_pliku: str, schemat: dict,
+                          separator: str, kodowanie: str,
+                          projekcja: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Wczytuje cały plik według schematu. Duże pliki (oraz pliki z filtrami wierszy)
+    są czytane zakresami bajtów, dzięki czemu fragment łamiący schemat nie wymusza
+    ponownego parsowania całości, a odrzucone wiersze nie są trzymane w pamięci.
+    Jeśli zakresu nie da się sparsować (granica we wnętrzu pola w cudzysłowie),
+    plik jest parsowany w całości.
+    """
+    rozmiar = os.path.getsize(sciezka_pliku)
+    filtrowanie = bool(projekcja and projekcja['filtry'])
+    if ((rozmiar > PROG_DUZEGO_PLIKU or filtrowanie) and _czy_kodowanie_zgodne_z_ascii(kodowanie)
+            and not schemat.get('kompresja')):
+        naglowek, zakresy = _podziel_na_zakresy(sciezka_pliku, math.ceil(rozmiar / ROZMIAR_ZAKRESU))
+        try:
+            czesci = [
+                _parsuj_zakres(sciezka_pliku, naglowek, poczatek, koniec, separator, kodowanie,
+                               schemat=schemat, projekcja=projekcja)
+                for poczatek, koniec in zakresy
+            ]
+            return _polacz_czesci(czesci)
+        except pd.errors.ParserError as e:
+            print(f"[UWAGA] Nie udało się sparsować zakresu bajtów ({e}), parsuję cały plik")
+
+    df = _parsuj_ze_schematem(sciezka_pliku, schemat, separator, kodowanie)
+    return _optymalizuj_pamiec(_filtruj_wiersze(df, projekcja))
+
+
+def wczytaj_csv_strumieniowo(
+        sciezka_pliku: str,
+        separator: str = None,
+        kolumny_daty: List[str] = None,
+        format_daty: str = None,
+        rozmiar_chunka: int = 16 * 1024**2,
+        wyswietlaj_informacje: bool = False
+) -> Iterator[pd.DataFrame]:
+    """
+    Generator wczytujący plik CSV porcjami o ograniczonym rozmiarze w pamięci.
+
+    Schemat jest wnioskowany raz z próbki, a każda porcja ma te same typy kolumn:
+    liczby całkowite jako nullable Int64 (odporne na braki), zmiennoprzecinkowe
+    jako float32, daty jako datetime64, kategorie ze wspólnym, rosnącym słownikiem
+    (słownik kolejnej porcji rozszerza poprzedni, kody pozostają zgodne).
+    Jeśli w kolumnie całkowitej pojawią się wartości niecałkowite, od tej porcji
+    kolumna ma typ obliczeń z polityki typów (zgłaszane jako [UWAGA] i w
+    attrs['poszerzone_typy'] porcji) - wartości nie są zamieniane na braki.
+    Pliki jednobajtowe bez kompresji są czytane zakresami bajtów (granice poza
+    polami w cudzysłowach, więc pola wieloliniowe są obsługiwane); jeśli zakresu
+    nie da się sparsować, reszta pliku jest czytana sekwencyjnie.
+
+    Parametry:
+    ---------
+    sciezka_pliku : str
+        Ścieżka do pliku CSV
+    separator : str, opcjonalnie
+        Separator kolumn. Jeśli None, zostanie wykryty automatycznie.
+    kolumny_daty : List[str], opcjonalnie
+        Kolumny, które mają zostać skonwertowane na daty
+    format_daty : str, opcjonalnie
+        Format dat dla kolumn z kolumny_daty
+    rozmiar_chunka : int
+        Przybliżony rozmiar porcji w bajtach pliku
+    wyswietlaj_informacje : bool
+        Czy wyświetlać informacje diagnostyczne
+
+    Zwraca:
+    ------
+    Iterator[pd.DataFrame]
+        Kolejne porcje danych
+    """
+    if not os.path.exists(sciezka_pliku):
+        raise FileNotFoundError(f"Plik nie istnieje: {sciezka_pliku}")
+
+    kompresja = _wykryj_kompresje(sciezka_pliku)
+    kodowanie = _wykryj_kodowanie(sciezka_pliku)
+    if separator is None:
+        separator = _wykryj_separator(sciezka_pliku, kodowanie)
+    schemat = _wywnioskuj_schemat(sciezka_pliku, separator, kodowanie, kolumny_daty,
+                                  format_daty, wyswietlaj_informacje, kompresja=kompresja)
+    typy = _typy_strumienia(schemat)
+    unifikator = UnifikatorKategorii()
+
+    if _czy_kodowanie_zgodne_z_ascii(kodowanie) and not kompresja:
+        czesci = _porcje_zakresami(sciezka_pliku, schemat, separator, kodowanie,
+                                   rozmiar_chunka, wyswietlaj_informacje)
+    else:
+        # Bez granic bajtowych (kodowanie wielobajtowe, kompresja)
+        czesci = _porcje_tekstowe(sciezka_pliku, schemat, separator, kodowanie, kompresja=kompresja)
+
+    for numer, czesc in enumerate(czesci):
+        czesc = unifikator.dodaj(_ustal_typy(czesc, typy))
+        if wyswietlaj_informacje:
+            print(f"[INFO] Porcja {numer + 1}: {len(czesc)} wierszy")
+        for kolumna, opis in czesc.attrs.get('poszerzone_typy', {}).items():
+            # Zawsze zgłaszane: od tej porcji typ kolumny jest inny niż we wcześniejszych
+            print(f"[UWAGA] Kolumna {kolumna}: {opis['niecalkowite']} wartości niecałkowitych "
+                  f"w porcji {numer + 1} - typ poszerzony z Int64 do {opis['typ']}")
+        yield czesc
+
+
+def _porcje_zakresami(sciezka_pliku: str, schemat: dict, separator: str, kodowanie: str,
+                      rozmiar_chunka: int, wyswietlaj: bool = False) -> Iterator[pd.DataFrame]:
+    """
+    Porcje strumienia z zakresów bajtów pliku parsowanych według schematu.
+
+    Jeśli zakresu nie da się sparsować (granica wypadła we wnętrzu pola
+    w cudzysłowie), reszta pliku od początku tego zakresu jest czytana
+    sekwencyjnie przez _porcje_tekstowe - wcześniejsze zakresy kończyły się
+    poprawnie, więc jego początek jest granicą rekordu.
+    """
+    rozmiar = os.path.getsize(sciezka_pliku)
+    naglowek, zakresy = _podziel_na_zakresy(sciezka_pliku, max(1, math.ceil(rozmiar / rozmiar_chunka)))
+    for poczatek, koniec in zakresy:
+        try:
+            # Bez _optymalizuj_pamiec - jego decyzje zależą od porcji, a typy mają być stałe
+            czesc = _parsuj_ze_schematem(naglowek + _czytaj_bajty(sciezka_pliku, poczatek, koniec),
+                                         schemat, separator, kodowanie)
+        except pd.errors.ParserError as e:
             if wyswietlaj:
-                print(f"Data wykryta: {col} (format: {fmt})")
+                print(f"[UWAGA] Nie udało się sparsować zakresu bajtów ({e}), resztę pliku czytam sekwencyjnie")
+            with open(sciezka_pliku, 'rb') as uchwyt:
+                uchwyt.seek(poczatek)
+                yield from _porcje_tekstowe(uchwyt, schemat, separator, kodowanie, naglowek=False)
+            return
+        yield czesc
+
+
+def _porcje_tekstowe(zrodlo, schemat: dict, separator: str, kodowanie: str,
+                     kompresja: Optional[str] = None, naglowek: bool = True) -> Iterator[pd.DataFrame]:
+    """
+    Porcje wierszy czytane parserem strumieniowym (ścieżka lub otwarty uchwyt,
+    naglowek=False dla uchwytu ustawionego w środku danych) jako tekst
+    i konwertowane według schematu.
+    """
+    typy_tekstowe = {kol: (typ if typ in ('category', 'object') else 'object')
+                     for kol, typ in schemat['dtype'].items()}
+    liczbowe = {kol: schemat['dziesietny'] for kol, typ in schemat['dtype'].items()
+                if typ in ('int64', 'float64')}
+    reader = pd.read_csv(zrodlo, sep=separator, encoding=kodowanie, header=0 if naglowek else None,
+                         names=schemat['nazwy'], dtype=typy_tekstowe, on_bad_lines='warn',
+                         chunksize=100_000, compression=kompresja)
+    for c in reader:
+        yield _dopasuj_do_schematu(c, schemat, liczbowe)
+
+
+def _typy_strumienia(schemat: dict) -> Dict[str, str]:
+    """Stałe typy kolumn dla wszystkich porcji strumienia"""
+    typy = {}
+    for kolumna in schemat['nazwy']:
+        if kolumna in schemat['daty']:
+            typy[kolumna] = f"datetime64[{_POLITYKA_TYPOW.rozdzielczosc_dat}]"
+        elif kolumna in schemat['konwersje']:
+            typy[kolumna] = _POLITYKA_TYPOW.typ_obliczen
+        else:
+            typ = schemat['dtype'][kolumna]
+            typ_calkowity = 'Int64' if _POLITYKA_TYPOW.calkowite_z_brakami else _POLITYKA_TYPOW.typ_obliczen
+            typy[kolumna] = {'int64': typ_calkowity, 'float64': _POLITYKA_TYPOW.typ_obliczen}.get(typ, typ)
+    return typy
+
+
+def _ustal_typy(df: pd.DataFrame, typy: Dict[str, str]) -> pd.DataFrame:
+    """
+    Rzutuje kolumny porcji na stałe typy strumienia (kategorie obsługuje UnifikatorKategorii).
+
+    Kolumna wywnioskowana jako całkowita, w której pojawiły się wartości
+    niecałkowite, jest poszerzana do typu obliczeń z polityki typów - typy jest
+    aktualizowany, więc kolejne porcje dostają już typ poszerzony. Poszerzone
+    kolumny i liczba wartości niecałkowitych trafiają do df.attrs['poszerzone_typy'].
+    """
+    poszerzone = {}
+    for kolumna, typ in typy.items():
+        if kolumna not in df.columns or typ == 'category' or str(df[kolumna].dtype) == typ:
             continue
-        # Kategorie
-        if _czy_kolumna_kategorialna(s):
-            df_copy[col] = df_copy[col].astype('category')
-            if wyswietlaj:
-                print(f"Kategoria: {col}")
-    return df_copy
+        if typ == 'Int64' and pd.api.types.is_float_dtype(df[kolumna]):
+            wartosci = df[kolumna]
+            niecalkowite = int((wartosci.notna() & (wartosci != wartosci.round())).sum())
+            if niecalkowite:
+                typ = typy[kolumna] = _POLITYKA_TYPOW.typ_obliczen
+                poszerzone[kolumna] = {'typ': typ, 'niecalkowite': niecalkowite}
+        df[kolumna] = df[kolumna].astype(typ)
+    if poszerzone:
+        df.attrs['poszerzone_typy'] = poszerzone
+    return df
 
 
+def _wyrownaj_typy(czesci: List[pd.DataFrame], typy: Dict[str, str]) -> None:
+    """Rzutuje wcześniejsze części na typy poszerzone przez _ustal_typy w późniejszych (w miejscu)"""
+    for czesc in czesci:
+        for kolumna, typ in typy.items():
+            if typ != 'category' and kolumna in czesc.columns and str(czesc[kolumna].dtype) != typ:
+                czesc[kolumna] = czesc[kolumna].astype(typ)
 
 
-def _wykryj_kodowanie(sciezka_pliku: str) -> str:
-    """Automatyczne wykrywanie kodowania pliku"""
+class PlikPrzyrostowy:
+    """
+    Przyrostowe wczytywanie pliku CSV, do którego dopisywane są nowe wiersze.
+
+    Pierwsze wczytanie wnioskuje schemat i zapamiętuje przesunięcie bajtowe
+    końca ostatniej pełnej linii, nagłówek oraz słowniki kategorii. Kolejne
+    wywołania dopisz() parsują wyłącznie nowy ogon pliku z tymi samymi typami
+    (jak w wczytaj_csv_strumieniowo: Int64, float32, datetime64, kategorie
+    z rosnącym słownikiem) i dołączają go do zgromadzonych danych. Niepełna
+    ostatnia linia (plik w trakcie zapisu) czeka na następne wywołanie.
+
+    Przykład:
+    --------
+    plik = PlikPrzyrostowy('transakcje.csv')
+    df = plik.wczytaj()
+    ...
+    nowe = plik.dopisz()   # tylko nowe wiersze; pełne dane w plik.df
+    """
+
+    def __init__(self, sciezka_pliku: str, separator: str = None, kolumny_daty: List[str] = None,
+                 format_daty: str = None, wyswietlaj_informacje: bool = False) -> None:
+        if not os.path.exists(sciezka_pliku):
+            raise FileNotFoundError(f"Plik nie istnieje: {sciezka_pliku}")
+        if _wykryj_kompresje(sciezka_pliku):
+            raise ValueError("Wczytywanie przyrostowe wymaga nieskompresowanego pliku")
+
+        self.sciezka_pliku = sciezka_pliku
+        self.kodowanie = _wykryj_kodowanie(sciezka_pliku)
+        if not _czy_kodowanie_zgodne_z_ascii(self.kodowanie):
+            raise ValueError(f"Kodowanie {self.kodowanie} nie pozwala dzielić pliku po bajtach")
+        self.separator = separator or _wykryj_separator(sciezka_pliku, self.kodowanie)
+        self.kolumny_daty = kolumny_daty
+        self.format_daty = format_daty
+        self.wyswietlaj_informacje = wyswietlaj_informacje
+
+        self.schemat: Optional[dict] = None
+        self.typy: Dict[str, str] = {}
+        self.unifikator = UnifikatorKategorii()
+        self.naglowek = b''
+        self.przesuniecie = 0
+        self.df: Optional[pd.DataFrame] = None
+
+    def wczytaj(self) -> pd.DataFrame:
+        """Wczytuje cały plik od nowa i zapamiętuje stan do dalszego dopisywania"""
+        self.schemat = _wywnioskuj_schemat(self.sciezka_pliku, self.separator, self.kodowanie,
+                                           self.kolumny_daty, self.format_daty, self.wyswietlaj_informacje)
+        self.typy = _typy_strumienia(self.schemat)
+        self.unifikator = UnifikatorKategorii()
+        with open(self.sciezka_pliku, 'rb') as f:
+            self.naglowek = f.readline()
+        self.przesuniecie = len(self.naglowek)
+        self.df = None
+
+        czesci = self._parsuj_ogon()
+        self.df = self.unifikator.polacz(czesci) if czesci else self._pusta_ramka()
+        if self.wyswietlaj_informacje:
+            print(f"[SUKCES] Wczytano {len(self.df)} wierszy (przesunięcie {self.przesuniecie} B)")
+        return self.df
+
+    def dopisz(self) -> pd.DataFrame:
+        """
+        Parsuje wiersze dopisane od ostatniego wczytania, dołącza je do self.df
+        i zwraca tylko nowe wiersze (np. do aktualizacji statystyk przyrostowych).
+        """
+        if self.df is None:
+            return self.wczytaj()
+
+        rozmiar = os.path.getsize(self.sciezka_pliku)
+        with open(self.sciezka_pliku, 'rb') as f:
+            naglowek = f.readline()
+        if rozmiar < self.przesuniecie or naglowek != self.naglowek:
+            raise ValueError("Plik został skrócony lub podmieniony - wywołaj wczytaj() ponownie")
+
+        czesci = self._parsuj_ogon()
+        if not czesci:
+            return self._pusta_ramka()
+
+        nowe = self.unifikator.polacz(czesci)
+        # Słowniki są tylko rozszerzane, więc kody wcześniejszych danych pozostają ważne
+        self.df = self.unifikator.polacz([self.df, nowe])
+        if self.wyswietlaj_informacje:
+            print(f"[INFO] Dopisano {len(nowe)} wierszy (razem {len(self.df)})")
+        return nowe
+
+    def _parsuj_ogon(self) -> List[pd.DataFrame]:
+        """Parsuje pełne linie od zapamiętanego przesunięcia i przesuwa je na koniec ostatniej"""
+        czesci = []
+        for blok, koniec in _bloki_linii(self.sciezka_pliku, self.przesuniecie):
+            czesc = _parsuj_ze_schematem(self.naglowek + blok, self.schemat, self.separator, self.kodowanie)
+            niezgodne = czesc.attrs.get('niezgodne_ze_schematem')
+            if niezgodne and self.wyswietlaj_informacje:
+                print(f"[UWAGA] Wartości niezgodne ze schematem: {niezgodne}")
+            czesc = _ustal_typy(czesc, self.typy)
+            poszerzone = czesc.attrs.get('poszerzone_typy')
+            if poszerzone:
+                print(f"[UWAGA] Wartości niecałkowite w kolumnach całkowitych - typ poszerzony: {poszerzone}")
+            czesci.append(self.unifikator.dodaj(czesc))
+            self.przesuniecie = koniec
+        # Typ poszerzony w późniejszym bloku obowiązuje też wcześniejsze bloki i zgromadzone dane
+        _wyrownaj_typy(czesci + ([self.df] if self.df is not None else []), self.typy)
+        return czesci
+
+    def _pusta_ramka(self) -> pd.DataFrame:
+        if self.df is not None:
+            return self.df.iloc[:0]
+        return _ustal_typy(pd.DataFrame({k: pd.Series(dtype=object) for k in self.schemat['nazwy']}),
+                           {k: t for k, t in self.typy.items() if t != 'category'})
+
+
+def _bloki_linii(sciezka_pliku: str, poczatek: int,
+                 rozmiar_bloku: int = ROZMIAR_ZAKRESU) -> Iterator[Tuple[bytes, int]]:
+    """
+    Czyta plik od podanego przesunięcia blokami zakończonymi pełną linią.
+    Zwraca pary (bajty bloku, przesunięcie końca bloku); niepełna ostatnia linia jest pomijana.
+    """
+    with open(sciezka_pliku, 'rb') as f:
+        f.seek(poczatek)
+        pozycja = poczatek
+        reszta = b''
+        while True:
+            dane = f.read(rozmiar_bloku)
+            if not dane:
+                break
+            dane = reszta + dane
+            koniec_linii = dane.rfind(b'\n')
+            if koniec_linii < 0:
+                reszta = dane
+                continue
+            blok, reszta = dane[:koniec_linii + 1], dane[koniec_linii + 1:]
+            pozycja += len(blok)
+            yield blok, pozycja
+
+
+def _skrot_zawartosci(sciezka_pliku: str, rozmiar_bloku: int = BLOK_SKROTU) -> str:
+    """
+    Skrót zawartości pliku liczony z bloków na początku, w środku i na końcu.
+    Wraz z rozmiarem i czasem modyfikacji wystarcza do wykrycia zmian bez czytania całości.
+    """
+    rozmiar = os.path.getsize(sciezka_pliku)
+    skrot = hashlib.blake2b(digest_size=16)
+    with open(sciezka_pliku, 'rb') as f:
+        for pozycja in sorted({0, max(0, rozmiar // 2 - rozmiar_bloku // 2), max(0, rozmiar - rozmiar_bloku)}):
+            f.seek(pozycja)
+            skrot.update(f.read(rozmiar_bloku))
+    return skrot.hexdigest()
+
+
+def _klucz_cache(sciezka_pliku: str, **parametry) -> str:
+    """Klucz cache: ścieżka, rozmiar, czas modyfikacji, skrót zawartości i parametry wczytywania"""
+    stat = os.stat(sciezka_pliku)
+    opis = json.dumps({
+        'sciezka': os.path.abspath(sciezka_pliku),
+        'rozmiar': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'skrot': _skrot_zawartosci(sciezka_pliku),
+        'parametry': parametry
+    }, sort_keys=True, default=str)
+    return hashlib.blake2b(opis.encode('utf-8'), digest_size=20).hexdigest()
+
+
+def _sciezka_cache(klucz: str, katalog_cache: Optional[str] = None) -> str:
+    return os.path.join(katalog_cache or KATALOG_CACHE, f"{klucz}.feather")
+
+
+def _odczytaj_z_cache(klucz: str, katalog_cache: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """Czyta DataFrame z cache (mmap, bez kompresji), zwraca None przy braku wpisu"""
+    sciezka = _sciezka_cache(klucz, katalog_cache)
+    if not os.path.exists(sciezka):
+        return None
+    try:
+        import pyarrow.feather as feather
+        tabela = feather.read_table(sciezka, memory_map=True)
+        df = tabela.to_pandas()
+        atrybuty = (tabela.schema.metadata or {}).get(b'atrybuty')
+        if atrybuty:
+            df.attrs = json.loads(atrybuty)
+        # Aktualizacja czasu dostępu - eviction usuwa najdawniej używane wpisy
+        os.utime(sciezka)
+        return df
+    except Exception:
+        return None
+
+
+def _zapisz_do_cache(df: pd.DataFrame, klucz: str, katalog_cache: Optional[str] = None,
+                     wyswietlaj: bool = False) -> None:
+    """Zapisuje DataFrame do cache i przycina cache do MAKS_ROZMIAR_CACHE"""
+    try:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+    except ImportError:
+        if wyswietlaj:
+            print("[UWAGA] Brak pakietu pyarrow - cache wyłączony")
+        return
+
+    katalog = katalog_cache or KATALOG_CACHE
+    sciezka = _sciezka_cache(klucz, katalog)
+    try:
+        os.makedirs(katalog, exist_ok=True)
+        tymczasowa = f"{sciezka}.{os.getpid()}.tmp"
+        tabela = pa.Table.from_pandas(df)
+        if df.attrs:
+            # Feather nie przenosi df.attrs (np. opisu próbkowania) - zapisujemy je w metadanych
+            metadane = {**(tabela.schema.metadata or {}), b'atrybuty': json.dumps(df.attrs, default=str).encode()}
+            tabela = tabela.replace_schema_metadata(metadane)
+        # Bez kompresji, aby odczyt mógł być mapowaniem pamięci bez dekompresji
+        feather.write_feather(tabela, tymczasowa, compression='uncompressed')
+        os.replace(tymczasowa, sciezka)
+    except Exception as e:
+        if wyswietlaj:
+            print(f"[UWAGA] Nie udało się zapisać cache: {e}")
+        return
+
+    przytnij_cache(katalog)
+
+
+def przytnij_cache(katalog_cache: Optional[str] = None, maks_rozmiar: int = None) -> int:
+    """
+    Usuwa najdawniej używane wpisy cache, dopóki łączny rozmiar przekracza limit.
+
+    Parametry:
+    ---------
+    katalog_cache : str, opcjonalnie
+        Katalog cache (domyślnie KATALOG_CACHE)
+    maks_rozmiar : int, opcjonalnie
+        Limit łącznego rozmiaru w bajtach (domyślnie MAKS_ROZMIAR_CACHE)
+
+    Zwraca:
+    ------
+    int
+        Liczba usuniętych wpisów
+    """
+    katalog = katalog_cache or KATALOG_CACHE
+    maks_rozmiar = MAKS_ROZMIAR_CACHE if maks_rozmiar is None else maks_rozmiar
+    if not os.path.isdir(katalog):
+        return 0
+
+    wpisy = []
+    for nazwa in os.listdir(katalog):
+        if nazwa.endswith('.feather'):
+            stat = os.stat(os.path.join(katalog, nazwa))
+            wpisy.append((stat.st_mtime, stat.st_size, nazwa))
+
+    laczny_rozmiar = sum(rozmiar for _, rozmiar, _ in wpisy)
+    usuniete = 0
+    for _, rozmiar, nazwa in sorted(wpisy):
+        if laczny_rozmiar <= maks_rozmiar:
+            break
+        try:
+            os.remove(os.path.join(katalog, nazwa))
+            laczny_rozmiar -= rozmiar
+            usuniete += 1
+        except OSError:
+            pass
+    return usuniete
+
+
+def wyczysc_cache(katalog_cache: Optional[str] = None) -> int:
+    """Usuwa wszystkie wpisy cache i zwraca ich liczbę"""
+    return przytnij_cache(katalog_cache, maks_rozmiar=0)
+
+
+def _wykryj_kompresje(sciezka_pliku: str) -> Optional[str]:
+    """Rozpoznaje kompresję po sygnaturze pliku (nazwa metody jak w parametrze compression pandas)"""
+    with open(sciezka_pliku, 'rb') as f:
+        poczatek = f.read(8)
+    for sygnatura, metoda in SYGNATURY_KOMPRESJI:
+        if poczatek.startswith(sygnatura):
+            return metoda
+    return None
+
+
+def _otworz_dane(sciezka_pliku: str, kompresja: Optional[str] = None):
+    """Otwiera plik jako binarny strumień danych po dekompresji (bez pliku tymczasowego)"""
+    if kompresja is None:
+        return open(sciezka_pliku, 'rb')
+    if kompresja == 'gzip':
+        return gzip.open(sciezka_pliku, 'rb')
+    if kompresja == 'bz2':
+        return bz2.open(sciezka_pliku, 'rb')
+    if kompresja == 'xz':
+        return lzma.open(sciezka_pliku, 'rb')
+    if kompresja == 'zip':
+        archiwum = zipfile.ZipFile(sciezka_pliku)
+        pliki = [nazwa for nazwa in archiwum.namelist() if not nazwa.endswith('/')]
+        if not pliki:
+            raise ValueError(f"Archiwum zip jest puste: {sciezka_pliku}")
+        return archiwum.open(pliki[0])
+    if kompresja == 'zstd':
+        import zstandard
+        return zstandard.ZstdDecompressor().stream_reader(open(sciezka_pliku, 'rb'), closefd=True)
+    raise ValueError(f"Nieobsługiwana kompresja: {kompresja}")
+
+
+def _szacuj_rozmiar_danych(sciezka_pliku: str, kompresja: Optional[str] = None) -> int:
+    """
+    Rozmiar danych po dekompresji: dokładny, gdy format go zapisuje (zip, zstd,
+    gzip < 4 GB), a w pozostałych przypadkach szacowany z współczynnika kompresji
+    początkowego fragmentu pliku.
+    """
+    rozmiar = os.path.getsize(sciezka_pliku)
+    if kompresja is None:
+        return rozmiar
+
+    if kompresja == 'zip':
+        with zipfile.ZipFile(sciezka_pliku) as archiwum:
+            return sum(info.file_size for info in archiwum.infolist())
+
+    with open(sciezka_pliku, 'rb') as f:
+        if kompresja == 'gzip':
+            # Stopka gzip (ISIZE) to rozmiar danych modulo 2^32 - wiarygodna, gdy plik
+            # skompresowany jest na tyle mały, że dane nie mogą przekroczyć 4 GB
+            f.seek(max(0, rozmiar - 4))
+            isize = int.from_bytes(f.read(4), 'little')
+            if rozmiar < 2**32 // 16 and isize >= rozmiar:
+                return isize
+            f.seek(0)
+        probka = f.read(PROBKA_KOMPRESJI)
+
+    if kompresja == 'zstd':
+        import zstandard
+        zadeklarowany = zstandard.frame_content_size(probka)
+        if zadeklarowany > 0:
+            return zadeklarowany
+        dekompresor = zstandard.ZstdDecompressor().decompressobj()
+    elif kompresja == 'gzip':
+        dekompresor = zlib.decompressobj(wbits=31)
+    elif kompresja == 'bz2':
+        dekompresor = bz2.BZ2Decompressor()
+    else:
+        dekompresor = lzma.LZMADecompressor()
+
+    try:
+        zdekompresowane = len(dekompresor.decompress(probka))
+    except Exception:
+        return rozmiar
+    if len(probka) >= rozmiar or zdekompresowane == 0:
+        return max(zdekompresowane, rozmiar)
+    return int(rozmiar * zdekompresowane / len(probka))
+
+
+def _czytaj_poczatek(sciezka_pliku: str, kompresja: Optional[str] = None,
+                     rozmiar: int = ROZMIAR_BUFORA_PROFILU) -> bytes:
+    """Jednorazowy, ograniczony odczyt początku danych (po dekompresji)"""
+    with _otworz_dane(sciezka_pliku, kompresja) as f:
+        return f.read(rozmiar)
+
+
+def _linie_z_bajtow(dane: bytes, kodowanie: str, liczba: Optional[int] = None) -> List[str]:
+    """Dekoduje bufor (ucięty znak wielobajtowy na końcu jest pomijany) i dzieli go na linie"""
+    linie = codecs.getincrementaldecoder(kodowanie)(errors='replace').decode(dane).splitlines(keepends=True)
+    return linie[:liczba] if liczba is not None else linie
+
+
+def _kodowanie_z_bajtow(raw_data: bytes) -> str:
+    """Wykrywanie kodowania na podstawie bufora z początkiem pliku"""
     try:
         # Próba importu modułu chardet
         try:
             import chardet
-            with open(sciezka_pliku, 'rb') as f:
-                raw_data = f.read(10000)
-            result = chardet.detect(raw_data)
+            result = chardet.detect(raw_data[:10000])
             return result['encoding'] if result['encoding'] else 'utf-8'
         except ImportError:
             # Jeśli nie ma modułu chardet, próbujemy bez niego
             encodings = ['utf-8', 'latin-1', 'cp1250', 'windows-1250']
             for enc in encodings:
                 try:
-                    with open(sciezka_pliku, 'r', encoding=enc) as f:
-                        f.read(1000)
+                    # Ucięty na końcu znak wielobajtowy nie świadczy o złym kodowaniu
+                    codecs.getincrementaldecoder(enc)().decode(raw_data[:1000])
                     return enc
                 except UnicodeDecodeError:
                     continue
@@ -160,162 +2002,235 @@ def _wykryj_kodowanie(sciezka_pliku: str) -> str:
         return 'utf-8'
 
 
-def _wykryj_separator(sciezka_pliku: str, kodowanie: str = 'utf-8') -> str:
-    """Ulepszone automatyczne wykrywanie separatora w CSV"""
+def _wykryj_kodowanie(sciezka_pliku: str) -> str:
+    """Automatyczne wykrywanie kodowania pliku (z danych po dekompresji)"""
     try:
-        with open(sciezka_pliku, 'r', encoding=kodowanie, errors='replace') as f:
-            # Czytamy więcej linii dla lepszej detekcji
-            pierwsze_linie = [f.readline() for _ in range(5)]
+        return _kodowanie_z_bajtow(_czytaj_poczatek(sciezka_pliku, _wykryj_kompresje(sciezka_pliku), 10000))
+    except Exception:
+        return 'utf-8'
 
-        separatory = {',': 0, ';': 0, '\t': 0, '|': 0}
 
-        for linia in pierwsze_linie:
-            if not linia.strip():
-                continue
+def _separator_z_linii(pierwsze_linie: List[str]) -> str:
+    """Wybiera separator zliczając jego wystąpienia w pierwszych liniach"""
+    separatory = {',': 0, ';': 0, '\t': 0, '|': 0}
 
-            for sep, count in separatory.items():
-                # Liczymy separatory tylko jeśli są otoczone danymi
-                if sep == '\t':
-                    # Specjalna obsługa dla tabulatorów
-                    separatory[sep] += linia.count(sep)
-                else:
-                    # Dla innych separatorów liczymy tylko te, które rozdzielają dane
-                    potencjalne_pola = linia.split(sep)
-                    if len(potencjalne_pola) > 1:
-                        separatory[sep] += len(potencjalne_pola) - 1
-
-        # Wybierz separator z najwyższą liczbą wystąpień
-        najlepszy_separator = max(separatory.items(), key=lambda x: x[1])
-
-        # Jeśli żaden separator nie został znaleziony, użyj przecinka
-        if najlepszy_separator[1] == 0:
-            return ','
-
-        return najlepszy_separator[0]
+    for linia in pierwsze_linie:
+        if not linia.strip():
+            continue
+
+        for sep, count in separatory.items():
+            # Liczymy separatory tylko jeśli są otoczone danymi
+            if sep == '\t':
+                # Specjalna obsługa dla tabulatorów
+                separatory[sep] += linia.count(sep)
+            else:
+                # Dla innych separatorów liczymy tylko te, które rozdzielają dane
+                potencjalne_pola = linia.split(sep)
+                if len(potencjalne_pola) > 1:
+                    separatory[sep] += len(potencjalne_pola) - 1
+
+    # Wybierz separator z najwyższą liczbą wystąpień
+    najlepszy_separator = max(separatory.items(), key=lambda x: x[1])
+
+    # Jeśli żaden separator nie został znaleziony, użyj przecinka
+    if najlepszy_separator[1] == 0:
+        return ','
+
+    return najlepszy_separator[0]
+
+
+def _wykryj_separator(sciezka_pliku: str, kodowanie: str = 'utf-8') -> str:
+    """Ulepszone automatyczne wykrywanie separatora w CSV"""
+    try:
+        poczatek = _czytaj_poczatek(sciezka_pliku, _wykryj_kompresje(sciezka_pliku), ROZMIAR_BUFORA_DETEKCJI)
+        # Czytamy więcej linii dla lepszej detekcji
+        return _separator_z_linii(_linie_z_bajtow(poczatek, kodowanie, 5))
     except Exception as e:
         print(f"Błąd wykrywania separatora: {str(e)}")
         return ","  # Domyślnie przecinek w przypadku problemu
 
 
+def _probka_dat(kolumna: pd.Series, rozmiar: int = ROZMIAR_PROBKI_DATY) -> Tuple[str, ...]:
+    """Stałej wielkości próbka niepustych wartości jako krotka napisów (klucz cache formatów)"""
+    probka = kolumna.dropna().head(rozmiar)
+    return tuple(probka.astype(str).str.strip())
+
+
 def _wykryj_format_daty(sample: pd.Series) -> str:
     """Wykrywanie formatu daty na podstawie próbki danych"""
-    # Lista popularnych formatów dat do przetestowania
-    formaty = [
-        "%Y-%m-%d", "%d-%m-%Y", "%m-%d-%Y",
-        "%Y/%m/%d", "%d/%m/%Y", "%m/%d/%Y",
-        "%Y.%m.%d", "%d.%m.%Y", "%m.%d.%Y",
-        "%Y-%m-%d %H:%M:%S", "%d-%m-%Y %H:%M:%S",
-        "%Y/%m/%d %H:%M:%S", "%d/%m/%Y %H:%M:%S",
-        "%d.%m.%Y %H:%M:%S", "%Y.%m.%d %H:%M:%S",
-        "%H:%M:%S %d-%m-%Y", "%H:%M:%S %Y-%m-%d"
-    ]
-
-    # Pobierz kilka przykładowych wartości jako string
-    sample_vals = sample.dropna().astype(str).head(10).tolist()
-
-    # Sprawdź każdy format dla każdej wartości próbki
-    wyniki = {}
-    for format_daty in formaty:
-        poprawnych = 0
-        for val in sample_vals:
-            try:
-                datetime.strptime(val.strip(), format_daty)
-                poprawnych += 1
-            except:
-                pass
+    return _format_daty_dla_probki(_probka_dat(sample))
+
+
+@lru_cache(maxsize=256)
+def _format_daty_dla_probki(wartosci: Tuple[str, ...]) -> Optional[str]:
+    """
+    Testuje formaty z FORMATY_DAT wektorowo (pd.to_datetime z errors='coerce').
+    Wynik jest zapamiętywany, więc kolejne wywołania dla tej samej kolumny
+    (sprawdzenie typu, wykrycie formatu, konwersja) nie powtarzają testów.
+    """
+    if not wartosci:
+        return None
 
+    probka = pd.Series(wartosci, dtype=object)
+    wyniki = {}
+    for format_daty in FORMATY_DAT:
+        poprawnych = int(pd.to_datetime(probka, format=format_daty, errors='coerce').notna().sum())
         if poprawnych > 0:
             wyniki[format_daty] = poprawnych
+        if poprawnych == len(probka):
+            # Pełne dopasowanie - żaden późniejszy format nie wygra remisu
+            break
 
     # Wybierz format z największą liczbą poprawnych konwersji
     if wyniki:
-        najlepszy_format = max(wyniki.items(), key=lambda x: x[1])[0]
-        return najlepszy_format
+        return max(wyniki.items(), key=lambda x: x[1])[0]
 
     # Jeśli nie znaleziono żadnego dopasowania, zwróć None
     return None
 
 
+def _konwertuj_na_date(kolumna: pd.Series, format_daty: Optional[str] = None) -> pd.Series:
+    """
+    Konwersja na daty przez słownik unikalnych wartości - powtarzające się znaczniki
+    czasu (np. InvoiceDate) są parsowane tylko raz.
+    """
+    if pd.api.types.is_datetime64_any_dtype(kolumna):
+        return kolumna
+
+    kody, unikalne = pd.factorize(kolumna)
+    daty = pd.to_datetime(pd.Series(unikalne, dtype=object), format=format_daty, errors='coerce')
+    # Kod -1 (brak wartości) trafia na dodany na końcu NaT
+    wartosci = np.append(daty.to_numpy(), np.datetime64('NaT'))[kody]
+    return pd.Series(wartosci, index=kolumna.index, name=kolumna.name)
+
+
 def _automatyczna_detekcja_typow(df: pd.DataFrame, kolumny_daty: List[str] = None,
-                                 format_daty: str = None, wyswietlaj: bool = False) -> pd.DataFrame:
-    """Ulepszona automatyczna detekcja typów danych dla wszystkich kolumn"""
-    # Utwórz kopię DataFrame, aby uniknąć ostrzeżeń o modyfikacji podczas iteracji
-    df_copy = df.copy()
-
-    # Najpierw przetwarzamy kolumny dat (jeśli są określone)
-    if kolumny_daty:
-        for kolumna in kolumny_daty:
-            if kolumna in df_copy.columns:
-                try:
-                    # Jeżeli format daty jest podany, używamy go
-                    if format_daty:
-                        df_copy[kolumna] = pd.to_datetime(df_copy[kolumna], format=format_daty, errors='coerce')
-                    else:
-                        # Wykrywamy format daty na podstawie danych
-                        wykryty_format = _wykryj_format_daty(df_copy[kolumna])
-                        if wykryty_format:
-                            df_copy[kolumna] = pd.to_datetime(df_copy[kolumna], format=wykryty_format, errors='coerce')
-                        else:
-                            df_copy[kolumna] = pd.to_datetime(df_copy[kolumna], errors='coerce')
-
-                    if wyswietlaj:
-                        print(f"Konwersja na datę (z listy): {kolumna}")
-                except Exception as e:
-                    if wyswietlaj:
-                        print(f"Błąd konwersji daty {kolumna}: {str(e)}")
+                                 format_daty: str = None, wyswietlaj: bool = False,
+                                 liczba_watkow: Optional[int] = None) -> pd.DataFrame:
+    """Automatyczna detekcja typów: plan z próbki, konwersje kolumn w puli wątków"""
+    plan = _zaplanuj_typy(df, kolumny_daty, format_daty, liczba_watkow=liczba_watkow)
+    return _zastosuj_plan(df, plan, wyswietlaj, liczba_watkow)
 
-    # Przetwarzanie pozostałych kolumn
-    for kolumna in df_copy.columns:
-        # Pomijamy już przetworzone daty
-        if kolumny_daty and kolumna in kolumny_daty:
-            continue
 
-        # Pomijamy puste kolumny
-        if df_copy[kolumna].isna().all():
-            if wyswietlaj:
-                print(f"Pominięto pustą kolumnę: {kolumna}")
-            continue
+def _zaplanuj_typy(df: pd.DataFrame, kolumny_daty: List[str] = None, format_daty: str = None,
+                   rozmiar_probki: int = ROZMIAR_PROBKI_TYPOW,
+                   liczba_watkow: Optional[int] = None) -> Dict[str, dict]:
+    """
+    Jedyny silnik wnioskowania typów. Pracuje na losowej próbce wierszy
+    i sprawdza kolumny równolegle w puli wątków.
+
+    Zwraca:
+    ------
+    Dict[str, dict]
+        Plan {kolumna: krok}, gdzie krok zawiera:
+        - 'typ': 'liczba', 'data', 'kategoria', 'tekst' lub 'pusta'
+        - 'pewnosc': udział wartości próbki zgodnych z wybranym typem (0-1)
+        - 'format' (daty) lub 'separator_dziesietny' (liczby)
+    """
+    probka = df.sample(n=rozmiar_probki, random_state=42) if len(df) > rozmiar_probki else df
+    kolumny_daty = set(kolumny_daty or [])
 
-        try:
-            # Próbujemy wykryć liczby (przed datami!)
-            if _czy_kolumna_numeryczna(df_copy[kolumna]):
-                separator_dziesietny = _wykryj_separator_dziesietny(df_copy[kolumna])
-                try:
-                    df_copy[kolumna] = _konwertuj_na_liczbe(df_copy[kolumna], separator_dziesietny)
-                    if wyswietlaj:
-                        print(f"Wykryto kolumnę numeryczną: {kolumna}")
-                    continue
-                except Exception as e:
-                    if wyswietlaj:
-                        print(f"Błąd konwersji liczby {kolumna}: {str(e)}")
+    def zaplanuj(kolumna):
+        return _zaplanuj_kolumne(probka[kolumna], kolumna in kolumny_daty, format_daty)
 
-            # Wykrywanie dat (tylko jeśli nie są liczbami)
-            if _czy_kolumna_zawiera_daty(df_copy[kolumna]):
-                try:
-                    # Wykrywamy format daty i używamy go
-                    wykryty_format = _wykryj_format_daty(df_copy[kolumna])
-                    if wykryty_format:
-                        df_copy[kolumna] = pd.to_datetime(df_copy[kolumna], format=wykryty_format, errors='coerce')
-                    else:
-                        df_copy[kolumna] = pd.to_datetime(df_copy[kolumna], errors='coerce')
+    return dict(zip(df.columns, _mapuj_w_watkach(zaplanuj, list(df.columns), liczba_watkow)))
 
-                    if wyswietlaj:
-                        print(f"Wykryto kolumnę daty: {kolumna}")
-                    continue
-                except Exception as e:
-                    if wyswietlaj:
-                        print(f"Błąd konwersji daty {kolumna}: {str(e)}")
-
-            # Wykrywanie kategorii (jeśli nie są ani liczbami, ani datami)
-            if _czy_kolumna_kategorialna(df_copy[kolumna]):
-                df_copy[kolumna] = df_copy[kolumna].astype('category')
-                if wyswietlaj:
-                    print(f"Wykryto kolumnę kategoryczną: {kolumna}")
+
+def _zaplanuj_kolumne(probka: pd.Series, czy_data: bool = False, format_daty: str = None) -> dict:
+    """Wybiera typ jednej kolumny na podstawie próbki i ocenia pewność wyboru"""
+    if pd.api.types.is_datetime64_any_dtype(probka):
+        return {'typ': 'data', 'pewnosc': 1.0, 'format': None}
+    if pd.api.types.is_numeric_dtype(probka) and not czy_data:
+        return {'typ': 'liczba', 'pewnosc': 1.0, 'separator_dziesietny': '.'}
+
+    wartosci = probka.dropna().astype(str).str.strip()
+    wartosci = wartosci[wartosci != '']
+
+    if czy_data:
+        fmt = format_daty or _wykryj_format_daty(wartosci)
+        return {'typ': 'data', 'pewnosc': _udzial_dat(wartosci, fmt), 'format': fmt}
+    if len(wartosci) == 0:
+        return {'typ': 'pusta', 'pewnosc': 1.0}
+
+    # Liczby sprawdzamy przed datami
+    udzial = _udzial_liczb(wartosci)
+    if len(wartosci) >= 3 and udzial > 0.7:
+        return {'typ': 'liczba', 'pewnosc': udzial,
+                'separator_dziesietny': _wykryj_separator_dziesietny(wartosci)}
+
+    if _czy_kolumna_zawiera_daty(wartosci):
+        fmt = _wykryj_format_daty(wartosci)
+        return {'typ': 'data', 'pewnosc': _udzial_dat(wartosci, fmt), 'format': fmt}
+
+    if _czy_kolumna_kategorialna(wartosci):
+        return {'typ': 'kategoria', 'pewnosc': 1.0 - wartosci.nunique() / len(wartosci)}
+
+    return {'typ': 'tekst', 'pewnosc': 1.0}
+
+
+def _zastosuj_plan(df: pd.DataFrame, plan: Dict[str, dict], wyswietlaj: bool = False,
+                   liczba_watkow: Optional[int] = None) -> pd.DataFrame:
+    """Konwertuje kolumny według planu typów, każdą kolumnę w osobnym zadaniu puli wątków"""
+    bledy = {}
+
+    def konwertuj(kolumna):
+        krok = plan[kolumna]
+        seria = df[kolumna]
+        try:
+            if krok['typ'] == 'liczba' and not pd.api.types.is_numeric_dtype(seria):
+                return _konwertuj_na_liczbe(seria, krok['separator_dziesietny'])
+            if krok['typ'] == 'data':
+                return _konwertuj_na_date(seria, krok.get('format'))
+            if krok['typ'] == 'kategoria' and not isinstance(seria.dtype, pd.CategoricalDtype):
+                return seria.astype('category')
         except Exception as e:
-            if wyswietlaj:
-                print(f"Błąd podczas przetwarzania kolumny {kolumna}: {str(e)}")
+            bledy[kolumna] = e
+        return None
+
+    kolumny = list(plan)
+    wynik = df.copy(deep=False)
+    for kolumna, nowa in zip(kolumny, _mapuj_w_watkach(konwertuj, kolumny, liczba_watkow)):
+        if nowa is not None:
+            wynik[kolumna] = nowa
+
+    if wyswietlaj:
+        opisy = {'liczba': 'numeryczną', 'data': 'daty', 'kategoria': 'kategoryczną'}
+        for kolumna, krok in plan.items():
+            if kolumna in bledy:
+                print(f"Błąd konwersji kolumny {kolumna}: {bledy[kolumna]}")
+            elif krok['typ'] == 'pusta':
+                print(f"Pominięto pustą kolumnę: {kolumna}")
+            elif krok['typ'] in opisy:
+                print(f"Wykryto kolumnę {opisy[krok['typ']]}: {kolumna} (pewność {krok['pewnosc']:.2f})")
+
+    return wynik
 
-    return df_copy
+
+def _mapuj_w_watkach(funkcja, elementy: list, liczba_watkow: Optional[int] = None) -> list:
+    """map() w puli wątków - pandas zwalnia GIL w dużej części operacji na kolumnach"""
+    liczba_watkow = min(len(elementy), liczba_watkow or os.cpu_count() or 1)
+    if liczba_watkow <= 1:
+        return [funkcja(e) for e in elementy]
+    with ThreadPoolExecutor(max_workers=liczba_watkow) as pula:
+        return list(pula.map(funkcja, elementy))
+
+
+def _udzial_liczb(wartosci: pd.Series) -> float:
+    """Udział wartości pasujących do wzorca liczby (przecinek lub kropka dziesiętna)"""
+    if len(wartosci) == 0:
+        return 0.0
+    oczyszczone = wartosci.astype(str).str.strip().str.replace(',', '.')
+    return float(oczyszczone.str.match(r'^-?\d+(\.\d+)?$').mean())
+
+
+def _udzial_dat(wartosci: pd.Series, format_daty: Optional[str]) -> float:
+    """Udział wartości próbki, które dają się sparsować jako data"""
+    if len(wartosci) == 0:
+        return 0.0
+    try:
+        return float(pd.to_datetime(wartosci, format=format_daty, errors='coerce').notna().mean())
+    except (ValueError, TypeError):
+        return 0.0
 
 
 def _czy_kolumna_numeryczna(kolumna: pd.Series) -> bool:
@@ -325,19 +2240,12 @@ def _czy_kolumna_numeryczna(kolumna: pd.Series) -> bool:
         return True
 
     # Pobieramy próbkę niepustych wartości
-    sample = kolumna.dropna().astype(str).head(20)
+    sample = kolumna.dropna().head(20).astype(str)
     if len(sample) < 3:
         return False
 
-    # Usuwamy białe znaki i zamieniamy przecinki na kropki
-    sample_clean = sample.str.strip().str.replace(',', '.')
-
-    # Sprawdzamy wzór liczby (dopuszczamy liczby ujemne i zmiennoprzecinkowe)
-    pattern = r'^-?\d+(\.\d+)?$'
-    matches = sample_clean.str.match(pattern)
-
     # Jeśli większość wartości pasuje do wzorca liczby
-    return matches.mean() > 0.7
+    return _udzial_liczb(sample) > 0.7
 
 
 def _czy_kolumna_zawiera_daty(kolumna: pd.Series) -> bool:
@@ -346,13 +2254,13 @@ def _czy_kolumna_zawiera_daty(kolumna: pd.Series) -> bool:
     if pd.api.types.is_datetime64_any_dtype(kolumna):
         return True
 
-    # Konwertujemy na string dla bezpieczeństwa
-    sample = kolumna.dropna().astype(str).head(10)
+    # Konwertujemy na string dla bezpieczeństwa (tylko próbkę, nie całą kolumnę)
+    sample = kolumna.dropna().head(10).astype(str)
     if len(sample) < 3:
         return False
 
-    # Sprawdzamy, czy możemy znaleźć format daty
-    wykryty_format = _wykryj_format_daty(sample)
+    # Sprawdzamy, czy możemy znaleźć format daty (ta sama próbka co przy konwersji)
+    wykryty_format = _wykryj_format_daty(kolumna)
     if wykryty_format:
         return True
 
@@ -396,15 +2304,23 @@ def _wykryj_separator_dziesietny(kolumna: pd.Series) -> str:
 def _konwertuj_na_liczbe(kolumna: pd.Series, separator: str) -> pd.Series:
     """Ulepszona konwersja na liczby"""
     try:
-        # Usuwamy białe znaki
-        cleaned = kolumna.astype(str).str.strip()
+        # Usuwamy białe znaki (tekst Arrow zostaje w Arrow, bez kopii jako object)
+        if _czy_typ_tekstowy(kolumna) and not pd.api.types.is_object_dtype(kolumna):
+            cleaned = kolumna.str.strip()
+        else:
+            cleaned = kolumna.astype(str).str.strip()
 
         # Zamieniamy separator na kropkę, jeśli jest inny
         if separator == ',':
             cleaned = cleaned.str.replace(',', '.')
 
         # Konwertujemy na liczby
-        return pd.to_numeric(cleaned, errors='coerce')
+        wynik = pd.to_numeric(cleaned, errors='coerce')
+        if isinstance(wynik.dtype, pd.api.extensions.ExtensionDtype):
+            # Typy nullable (Int64/Float64) z tekstu string - sprowadzamy do NumPy
+            calkowite = pd.api.types.is_integer_dtype(wynik) and not wynik.hasnans
+            wynik = wynik.astype('int64' if calkowite else 'float64')
+        return wynik
     except Exception as e:
         print(f"Błąd konwersji na liczbę: {str(e)}")
         # W przypadku błędu, zwracamy oryginalną kolumnę
@@ -412,113 +2328,377 @@ def _konwertuj_na_liczbe(kolumna: pd.Series, separator: str) -> pd.Series:
 
 
 def _czy_kolumna_kategorialna(kolumna: pd.Series) -> bool:
-    """Ulepszone sprawdzanie czy kolumna powinna być kategoryczna"""
+    """
+    Sprawdza czy kolumna powinna być kategoryczna - na podstawie szacowanej
+    oszczędności pamięci (słownik + kody zamiast napisu w każdym wierszu)
+    """
     # Jeśli już jest typem kategorycznym
-    if pd.api.types.is_categorical_dtype(kolumna):
+    if isinstance(kolumna.dtype, pd.CategoricalDtype):
         return True
 
-    # Jeśli jest tekstem, sprawdzamy unikalność
-    if pd.api.types.is_object_dtype(kolumna):
+    # Jeśli jest tekstem, porównujemy szacowaną pamięć obu reprezentacji
+    if _czy_typ_tekstowy(kolumna) and len(kolumna) > 0:
         try:
-            unikalne = kolumna.nunique()
-            całkowita_liczba = len(kolumna)
-            # Zabezpieczenie przed dzieleniem przez zero
-            if całkowita_liczba > 0:
-                # Mniej niż 50% unikalnych wartości i mniej niż 100 unikalnych wartości
-                return (unikalne / całkowita_liczba < 0.5) and unikalne < 100
-        except:
+            bajty_tekstu, bajty_kategorii = _szacuj_pamiec_kategorii(kolumna)
+            return bajty_kategorii <= MAKS_UDZIAL_PAMIECI_KATEGORII * bajty_tekstu
+        except Exception:
             pass
     return False
 
 
-def _optymalizuj_pamiec(df: pd.DataFrame) -> pd.DataFrame:
+def _szacuj_liczbe_unikalnych(kolumna: pd.Series, k: int = ROZMIAR_SZKICU_KMV) -> int:
+    """
+    Przybliżona liczba unikalnych wartości (szkic KMV - k najmniejszych skrótów).
+
+    Skróty 64-bitowe są liczone wektorowo, a zamiast tablicy haszującej
+    wszystkich wartości (jak w nunique) wyznaczanych jest tylko k najmniejszych
+    różnych skrótów: D ≈ (k - 1) / (k-ty najmniejszy skrót / 2^64).
+    """
+    wartosci = kolumna.dropna()
+    if isinstance(wartosci.dtype, pd.CategoricalDtype):
+        return int(len(wartosci.cat.categories))
+    skroty = pd.util.hash_pandas_object(wartosci, index=False).to_numpy()
+    if len(skroty) <= k:
+        return int(len(np.unique(skroty)))
+
+    # Próg obejmujący oczekiwanie ok. 2k różnych skrótów; przy wielu powtórzeniach rośnie
+    udzial = min(1.0, 2.0 * k / len(skroty))
+    while True:
+        prog = np.uint64(min(2**64 - 1, int(udzial * 2**64)))
+        najmniejsze = np.unique(skroty[skroty <= prog])
+        if len(najmniejsze) >= k or udzial >= 1.0:
+            break
+        udzial = min(1.0, udzial * 4)
+    if len(najmniejsze) < k:
+        # Wszystkie różne skróty zmieściły się pod progiem - wynik dokładny
+        return int(len(najmniejsze))
+    return int((k - 1) / (float(najmniejsze[k - 1]) / 2**64))
+
+
+def _szacuj_pamiec_kategorii(kolumna: pd.Series, liczba_unikalnych: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Szacuje pamięć kolumny tekstowej: obecną i po zamianie na kategorię.
+
+    Zwraca:
+    ------
+    Tuple[int, int]
+        (bajty jako tekst, bajty jako kategoria) - tekst object: wskaźnik + obiekt
+        napisu na wiersz (rozmiar z próbki), kategoria: kody + słownik unikalnych
+    """
+    n = len(kolumna)
+    d = liczba_unikalnych if liczba_unikalnych is not None else _szacuj_liczbe_unikalnych(kolumna)
+    niepuste = kolumna.dropna()
+    probka = niepuste.sample(n=min(len(niepuste), ROZMIAR_PROBKI_TYPOW), random_state=42)
+    sredni_napis = float(probka.map(sys.getsizeof).mean()) if len(probka) else 0.0
+
+    if pd.api.types.is_object_dtype(kolumna):
+        bajty_tekstu = int(n * 8 + len(niepuste) * sredni_napis)
+    else:
+        # string / string[pyarrow]: bufory tekstu, rozmiar znany bez przeglądania wartości
+        bajty_tekstu = int(kolumna.memory_usage(index=False, deep=True))
+
+    szerokosc_kodu = 1 if d < 2**7 else 2 if d < 2**15 else 4 if d < 2**31 else 8
+    # Słownik: obiekt napisu i wpis indeksu kategorii (wskaźnik + skrót) na unikalną wartość
+    bajty_kategorii = int(n * szerokosc_kodu + d * (sredni_napis + 16))
+    return bajty_tekstu, bajty_kategorii
+
+
+class PolitykaTypow:
+    """
+    Wspólne zasady typów dla wczytywania i funkcji z Backendu.
+
+    Atrybuty:
+    --------
+    calkowite_z_brakami : bool
+        Kolumny float zawierające tylko liczby całkowite i braki (np. Customer ID)
+        stają się najmniejszym typem nullable Int8/Int16/Int32/Int64 zamiast float64.
+    typ_obliczen : str
+        'float32' lub 'float64' - typ wyników obliczeń (skalowanie, kodowanie
+        docelowe) i docelowy typ downcastu liczb zmiennoprzecinkowych.
+    rozdzielczosc_dat : str
+        Jednostka kolumn datetime64: 's', 'ms', 'us' lub 'ns'.
+    """
+
+    def __init__(self, calkowite_z_brakami: bool = True, typ_obliczen: str = 'float32',
+                 rozdzielczosc_dat: str = 'ns') -> None:
+        self.calkowite_z_brakami = calkowite_z_brakami
+        self.typ_obliczen = typ_obliczen
+        self.rozdzielczosc_dat = rozdzielczosc_dat
+
+    def __repr__(self) -> str:
+        return (f"PolitykaTypow(calkowite_z_brakami={self.calkowite_z_brakami}, "
+                f"typ_obliczen='{self.typ_obliczen}', rozdzielczosc_dat='{self.rozdzielczosc_dat}')")
+
+
+# Polityka typów używana przez _optymalizuj_pamiec, strumienie i Backend
+_POLITYKA_TYPOW = PolitykaTypow()
+
+
+def ustaw_polityke_typow(**zmiany) -> PolitykaTypow:
+    """
+    Zmienia globalną politykę typów, np. ustaw_polityke_typow(typ_obliczen='float64').
+
+    Parametry:
+    ---------
+    **zmiany
+        Nowe wartości atrybutów PolitykaTypow (calkowite_z_brakami, typ_obliczen,
+        rozdzielczosc_dat)
+
+    Zwraca:
+    ------
+    PolitykaTypow
+        Aktualna polityka po zmianie
+    """
+    for nazwa, wartosc in zmiany.items():
+        if not hasattr(_POLITYKA_TYPOW, nazwa):
+            raise ValueError(f"Nieznany parametr polityki typów: {nazwa}")
+        if nazwa == 'typ_obliczen' and wartosc not in ('float32', 'float64'):
+            raise ValueError("Parametr 'typ_obliczen' musi być 'float32' lub 'float64'.")
+        if nazwa == 'rozdzielczosc_dat' and wartosc not in ('s', 'ms', 'us', 'ns'):
+            raise ValueError("Parametr 'rozdzielczosc_dat' musi być 's', 'ms', 'us' lub 'ns'.")
+    for nazwa, wartosc in zmiany.items():
+        setattr(_POLITYKA_TYPOW, nazwa, wartosc)
+    return _POLITYKA_TYPOW
+
+
+def pobierz_polityke_typow() -> PolitykaTypow:
+    """Zwraca aktualną globalną politykę typów"""
+    return _POLITYKA_TYPOW
+
+
+def _jako_liczby_obliczen(kolumna: pd.Series) -> np.ndarray:
+    """Wartości kolumny liczbowej jako tablica typu obliczeń polityki (braki -> NaN, także z Int*)"""
+    return kolumna.to_numpy(dtype=_POLITYKA_TYPOW.typ_obliczen, na_value=np.nan)
+
+
+def _typ_calkowity_z_brakami(wartosci: np.ndarray) -> Optional[str]:
+    """
+    Najmniejszy typ nullable Int dla kolumny float z brakami, jeśli wszystkie
+    pozostałe wartości są całkowite; None, gdy braków nie ma lub są ułamki.
+    """
+    niepuste = wartosci[~np.isnan(wartosci)]
+    if len(niepuste) == len(wartosci) or len(niepuste) == 0:
+        return None
+    if not np.array_equal(niepuste, np.trunc(niepuste)):
+        return None
+    najmniejsza, najwieksza = niepuste.min(), niepuste.max()
+    for typ in (np.int8, np.int16, np.int32, np.int64):
+        zakres = np.iinfo(typ)
+        if zakres.min <= najmniejsza and najwieksza <= zakres.max:
+            return f"Int{zakres.bits}"
+    return None
+
+
+def _optymalizuj_pamiec(df: pd.DataFrame, raport: bool = False,
+                        kolumny: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Zmniejsza pamięć DataFrame'u zgodnie z polityką typów (PolitykaTypow):
+    downcast liczb, liczby całkowite z brakami jako nullable Int*, daty
+    w wybranej rozdzielczości i zamiana tekstu na kategorie tam, gdzie szacowany
+    słownik z kodami jest co najmniej o połowę mniejszy od tekstu
+    (MAKS_UDZIAL_PAMIECI_KATEGORII).
+
+    Jeśli raport=True, w df.attrs['raport_pamieci'] trafia zestawienie
+    {kolumna: {'typ_przed', 'typ_po', 'bajty_przed', 'bajty_po'}}
+    (liczenie pamięci przed zmianą przegląda kolumny tekstowe, stąd opcjonalnie).
+    Jeśli podano kolumny, optymalizowane są tylko one (np. kolumny nowo
+    utworzone w Backendzie), bez ponownego przeglądania reszty.
+    """
+    polityka = _POLITYKA_TYPOW
+    zakres = None if kolumny is None else set(kolumny)
+
+    def wybierz(typy: List[str]) -> List[str]:
+        return [col for col in df.select_dtypes(include=typy).columns if zakres is None or col in zakres]
+
+    przed = {}
+    if raport:
+        przed = {col: (str(df[col].dtype), int(df[col].memory_usage(index=False, deep=True)))
+                 for col in df.columns if zakres is None or col in zakres}
+
     # Liczby zmiennoprzecinkowe
-    for col in df.select_dtypes(include=['float64']).columns:
+    for col in wybierz(['float64', 'float32']):
         try:
-            df[col] = pd.to_numeric(df[col], downcast='float')
+            typ_calkowity = None
+            if polityka.calkowite_z_brakami:
+                typ_calkowity = _typ_calkowity_z_brakami(df[col].to_numpy())
+            if typ_calkowity:
+                df[col] = df[col].astype(typ_calkowity)
+            elif polityka.typ_obliczen == 'float32' and df[col].dtype == np.float64:
+                df[col] = pd.to_numeric(df[col], downcast='float')
         except:
             pass
     # Liczby całkowite
-    for col in df.select_dtypes(include=['int64']).columns:
+    for col in wybierz(['int64']):
         try:
             df[col] = pd.to_numeric(df[col], downcast='integer')
         except:
             pass
-    # Kategorie
-    for col in df.select_dtypes(include=['object']).columns:
+    # Daty w rozdzielczości z polityki
+    for col in wybierz(['datetime64']):
         try:
-            if df[col].nunique() / df.shape[0] < 0.5 and df[col].nunique() < 100:
+            if np.datetime_data(df[col].dtype)[0] != polityka.rozdzielczosc_dat:
+                df[col] = df[col].astype(f"datetime64[{polityka.rozdzielczosc_dat}]")
+        except:
+            pass
+    # Liczby w typach Arrow (bez powrotu do object)
+    for col in df.columns:
+        if zakres is not None and col not in zakres:
+            continue
+        if isinstance(df[col].dtype, pd.ArrowDtype) and pd.api.types.is_numeric_dtype(df[col]):
+            try:
+                downcast = 'integer' if pd.api.types.is_integer_dtype(df[col]) else 'float'
+                df[col] = pd.to_numeric(df[col], downcast=downcast)
+            except:
+                pass
+    # Kategorie (tekst jako object lub string/string[pyarrow]) - decyzja wg szacowanej pamięci
+    for col in wybierz(['object', 'string']):
+        try:
+            if len(df) and _czy_kolumna_kategorialna(df[col]):
                 df[col] = df[col].astype('category')
         except:
             pass
+
+    if raport:
+        df.attrs['raport_pamieci'] = {
+            col: {'typ_przed': typ, 'typ_po': str(df[col].dtype), 'bajty_przed': bajty,
+                  'bajty_po': int(df[col].memory_usage(index=False, deep=True))}
+            for col, (typ, bajty) in przed.items()
+        }
     return df
 
 
+def _wyswietl_raport_pamieci(raport: Dict[str, dict]) -> None:
+    """Wypisuje raport pamięci z _optymalizuj_pamiec(..., raport=True)"""
+    print("[INFO] Pamięć kolumn (przed -> po):")
+    for kolumna, r in raport.items():
+        print(f"  - {kolumna}: {r['typ_przed']} {r['bajty_przed'] / 1024**2:.2f} MB -> "
+              f"{r['typ_po']} {r['bajty_po'] / 1024**2:.2f} MB")
+    suma_przed = sum(r['bajty_przed'] for r in raport.values())
+    suma_po = sum(r['bajty_po'] for r in raport.values())
+    print(f"  Razem: {suma_przed / 1024**2:.2f} MB -> {suma_po / 1024**2:.2f} MB")
+
 
 # Funkcja pomocnicza do analizy pliku CSV
-def analizuj_csv(sciezka_pliku: str) -> None:
+def profiluj_csv(sciezka_pliku: str, rozmiar_bufora: int = ROZMIAR_BUFORA_PROFILU) -> dict:
     """
-    Analizuje strukturę pliku CSV i wyświetla informacje o zawartości
+    Profiluje plik CSV na podstawie jednego, ograniczonego odczytu jego początku.
+
+    Z tego samego bufora wykrywane są: kodowanie, dialekt (separator i znak
+    cudzysłowu, z uwzględnieniem pól w cudzysłowach), obecność nagłówka
+    i sugerowane typy kolumn. Liczba wierszy jest szacowana ze średniej
+    liczby bajtów na wiersz w buforze i rozmiaru danych (po dekompresji).
 
     Parametry:
     ---------
     sciezka_pliku : str
-        Ścieżka do pliku CSV
+        Ścieżka do pliku CSV (także skompresowanego)
+    rozmiar_bufora : int
+        Maksymalna liczba bajtów danych czytanych z początku pliku
+
+    Zwraca:
+    ------
+    dict
+        Słownik z kluczami:
+        - 'kompresja', 'kodowanie', 'separator', 'cudzyslow', 'naglowek'
+        - 'kolumny': nazwy kolumn (lub numery, gdy plik nie ma nagłówka)
+        - 'typy': plan typów {kolumna: krok} jak w _zaplanuj_typy
+        - 'probka': DataFrame z wierszami z bufora (jako tekst)
+        - 'rozmiar_danych': rozmiar danych w bajtach (szacowany dla kompresji)
+        - 'liczba_wierszy': liczba wierszy danych (dokładna, gdy bufor objął cały plik)
+        - 'liczba_wierszy_dokladna': czy liczba wierszy jest dokładna
     """
-    try:
-        print(f"\n[INFO] Analiza pliku {os.path.basename(sciezka_pliku)}...")
+    if not os.path.exists(sciezka_pliku):
+        raise FileNotFoundError(f"Plik nie istnieje: {sciezka_pliku}")
 
-        # Sprawdzenie, czy plik istnieje
-        if not os.path.exists(sciezka_pliku):
-            raise FileNotFoundError(f"Plik nie istnieje: {sciezka_pliku}")
+    kompresja = _wykryj_kompresje(sciezka_pliku)
+    bufor = _czytaj_poczatek(sciezka_pliku, kompresja, rozmiar_bufora)
+    rozmiar_danych = _szacuj_rozmiar_danych(sciezka_pliku, kompresja)
+    caly_plik = len(bufor) < rozmiar_bufora
 
-        # Wykrywanie kodowania
-        kodowanie = _wykryj_kodowanie(sciezka_pliku)
-        print(f"Wykryte kodowanie: {kodowanie}")
+    kodowanie = _kodowanie_z_bajtow(bufor)
+    linie = _linie_z_bajtow(bufor, kodowanie)
+    if not caly_plik and len(linie) > 1 and not linie[-1].endswith(('\n', '\r')):
+        # Ostatnia linia została ucięta w połowie rekordu
+        linie = linie[:-1]
+    tekst = ''.join(linie)
 
-        # Testowanie różnych separatorów
-        separatory = [',', ';', '\t', '|']
-        wyniki = {}
+    # Dialekt: Sniffer rozumie cudzysłowy; gdy zawiedzie - zliczanie separatorów
+    fragment = tekst[:64 * 1024]
+    try:
+        dialekt = csv.Sniffer().sniff(fragment, delimiters=',;\t|')
+        separator, cudzyslow = dialekt.delimiter, dialekt.quotechar or '"'
+    except csv.Error:
+        separator, cudzyslow = _separator_z_linii(linie[:5]), '"'
+    try:
+        naglowek = csv.Sniffer().has_header(fragment)
+    except csv.Error:
+        naglowek = True
+
+    probka = pd.read_csv(io.StringIO(tekst), sep=separator, quotechar=cudzyslow,
+                         header=0 if naglowek else None, dtype=str, engine='c',
+                         on_bad_lines='skip')
+    if naglowek:
+        probka.columns = [str(col).strip().replace('\ufeff', '') for col in probka.columns]
+
+    typy = _zaplanuj_typy(probka) if len(probka) else {}
+
+    # Szacowanie liczby wierszy ze średniego rozmiaru wiersza w buforze
+    bajty_naglowka = len(linie[0].encode(kodowanie, errors='replace')) if naglowek and linie else 0
+    bajty_danych = len(tekst.encode(kodowanie, errors='replace')) - bajty_naglowka
+    if caly_plik or not len(probka):
+        liczba_wierszy = len(probka)
+    else:
+        liczba_wierszy = int((rozmiar_danych - bajty_naglowka) * len(probka) / max(1, bajty_danych))
+
+    return {
+        'kompresja': kompresja,
+        'kodowanie': kodowanie,
+        'separator': separator,
+        'cudzyslow': cudzyslow,
+        'naglowek': naglowek,
+        'kolumny': list(probka.columns),
+        'typy': typy,
+        'probka': probka,
+        'rozmiar_danych': rozmiar_danych,
+        'liczba_wierszy': liczba_wierszy,
+        'liczba_wierszy_dokladna': caly_plik
+    }
 
-        for sep in separatory:
-            try:
-                df_test = pd.read_csv(sciezka_pliku, sep=sep, encoding=kodowanie,
-                                      nrows=5, engine='python')
-                wyniki[sep] = len(df_test.columns)
-            except:
-                wyniki[sep] = 0
 
-        najlepszy_sep = max(wyniki.items(), key=lambda x: x[1])[0]
-        print(f"Testowane separatory: {wyniki}")
-        print(f"Zalecany separator: '{najlepszy_sep}'")
+def analizuj_csv(sciezka_pliku: str) -> None:
+    """
+    Analizuje strukturę pliku CSV i wyświetla informacje o zawartości
+    (na podstawie profiluj_csv - jeden odczyt początku pliku)
 
-        # Próbka danych
-        try:
-            df_sample = pd.read_csv(sciezka_pliku, sep=najlepszy_sep,
-                                    encoding=kodowanie, nrows=5, engine='python')
-            print("\nPróbka danych (pierwsze 5 wierszy):")
-            print(df_sample)
-
-            print("\nSugerowane typy danych:")
-            for kolumna in df_sample.columns:
-                sample = df_sample[kolumna].dropna().astype(str)
-
-                if _czy_kolumna_numeryczna(sample):
-                    print(f"  - {kolumna}: numeryczna")
-                elif _czy_kolumna_zawiera_daty(sample):
-                    # Sprawdź, czy możemy określić format daty
-                    format_daty = _wykryj_format_daty(sample)
-                    if format_daty:
-                        print(f"  - {kolumna}: data (format: {format_daty})")
-                    else:
-                        print(f"  - {kolumna}: data (nieznany format)")
-                elif _czy_kolumna_kategorialna(sample):
-                    print(f"  - {kolumna}: kategorialna")
-                else:
-                    print(f"  - {kolumna}: tekst")
-        except Exception as e:
-            print(f"Błąd podczas analizy próbki: {str(e)}")
+    Parametry:
+    ---------
+    sciezka_pliku : str
+        Ścieżka do pliku CSV
+    """
+    try:
+        print(f"\n[INFO] Analiza pliku {os.path.basename(sciezka_pliku)}...")
+
+        profil = profiluj_csv(sciezka_pliku)
+        if profil['kompresja']:
+            print(f"Kompresja: {profil['kompresja']}")
+        print(f"Wykryte kodowanie: {profil['kodowanie']}")
+        print(f"Zalecany separator: '{profil['separator']}' (cudzysłów: {profil['cudzyslow']})")
+        print(f"Nagłówek: {'tak' if profil['naglowek'] else 'nie'}")
+        przyblizenie = '' if profil['liczba_wierszy_dokladna'] else '~'
+        print(f"Liczba wierszy: {przyblizenie}{profil['liczba_wierszy']}")
+
+        print("\nPróbka danych (pierwsze 5 wierszy):")
+        print(profil['probka'].head())
+
+        print("\nSugerowane typy danych:")
+        nazwy_typow = {'liczba': 'numeryczna', 'kategoria': 'kategorialna',
+                       'tekst': 'tekst', 'pusta': 'pusta'}
+        for kolumna, krok in profil['typy'].items():
+            if krok['typ'] == 'data':
+                opis = f"data (format: {krok['format'] or 'nieznany'})"
+            else:
+                opis = nazwy_typow[krok['typ']]
+            print(f"  - {kolumna}: {opis} (pewność {krok['pewnosc']:.2f})")
 
     except Exception as e:
         print(f"[BŁĄD] Nie udało się przeanalizować pliku: {str(e)}")
-
@@ -1,6 +1,9 @@
 import tkinter as tk
+import os
 import traceback
-from tkinter import ttk, filedialog, messagebox
+import threading
+import queue
+from tkinter import ttk, filedialog, messagebox, simpledialog
 import pandas as pd
 import numpy  as np
 from matplotlib import pyplot as plt
@@ -11,13 +14,14 @@ from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
 from Backend.AI import RANDOM_SEED, classify_and_return_predictions, cluster_kmeans
 from Backend.Czyszczenie import ekstrakcja_podtablicy
 from Backend.Duplikaty import usun_duplikaty
+from Backend.Eksport import eksportuj_dane, ROZSZERZENIA_EKSPORTU
 from Backend.Kodowanie import jedno_gorace_kodowanie, binarne_kodowanie, kodowanie_docelowe
 from Backend.Skalowanie import minmax_scaler, standard_scaler
 from Backend.Uzupelniane import uzupelnij_braki, usun_braki
 from Backend.Wartosci import zamien_wartosci
 from Backend.Wykresy import rysuj_wykres
-from Dane.Dane  import wczytaj_csv
-from Backend.Statystyka import analizuj_dane_numeryczne
+from Dane.Dane  import wczytaj_csv, wczytaj_poczatek_csv, wczytaj_excel, ROZSZERZENIA_EXCEL, KATALOG_CACHE
+from Backend.Statystyka import analizuj_dane_numeryczne, oblicz_statystyki_plikow, DOMYSLNY_BLAD_KWANTYLI
 from Backend.Korelacje  import oblicz_korelacje_pearsona, oblicz_korelacje_spearmana
 
 
@@ -34,6 +38,9 @@ class MainApp(tk.Tk):
         self.current_result_df = None
         self.df = None
         self.path = None
+        self._sample_info = None  # opis próbkowania, gdy wczytano tylko próbkę pliku
+        self._load_queue = None  # kolejka komunikatów wątku wczytującego plik
+        self._disabled_widgets = []  # przyciski wyłączone na czas wczytywania
         self._replacement_rules = {}  # Dodane: inicjalizacja słownika reguł zamiany
 
         # Informacje o pliku
@@ -47,6 +54,7 @@ class MainApp(tk.Tk):
         self.chart_history = []
         # Menu "Akcje"
         akcje_menu = tk.Menu(self.menubar, tearoff=0)
+        self.akcje_menu = akcje_menu
         self.menubar.add_cascade(label="Akcje", menu=akcje_menu)
         akcje_menu.add_command(label="Pre-processing", command=self._load_pre)
         akcje_menu.add_command(label="Statystyka", command=self._load_stats)
@@ -56,8 +64,11 @@ class MainApp(tk.Tk):
 
         # Nowe menu "Opcje"
         plik_menu = tk.Menu(self.menubar, tearoff=0)
+        self.plik_menu = plik_menu
         self.menubar.add_cascade(label="Plik", menu=plik_menu)
         plik_menu.add_command(label="Wczytaj CSV", command=self._load_csv_from_menu)
+        plik_menu.add_command(label="Wczytaj próbkę CSV…", command=self._load_csv_sample_from_menu)
+        plik_menu.add_command(label="Wczytaj pełne dane", command=self._load_full_data)
         plik_menu.add_command(label="Zapisz wynik", command=self._save_result)
 
 
@@ -134,24 +145,137 @@ class MainApp(tk.Tk):
             messagebox.showwarning("Brak danych", "Najpierw wczytaj plik CSV!")
 
     def _load_csv_from_menu(self):
-        """Metoda wywoływana przez Plik → Wczytaj CSV"""
+        """Metoda wywoływana przez Plik → Wczytaj CSV (także skoroszyty Excela)"""
+        fp = filedialog.askopenfilename(
+            title="Wybierz plik CSV",
+            filetypes=[("CSV", "*.csv"), ("Excel", "*.xlsx *.xlsm"), ("Wszystkie", "*.*")]
+        )
+        if not fp:
+            return
+        self._load_csv_file(fp)
+
+    def _load_csv_sample_from_menu(self):
+        """Plik → Wczytaj próbkę CSV: losowa próbka wierszy z jednego przejścia po pliku"""
         fp = filedialog.askopenfilename(
             title="Wybierz plik CSV",
             filetypes=[("CSV", "*.csv"), ("Wszystkie", "*.*")]
         )
         if not fp:
             return
+        n = simpledialog.askinteger("Próbka", "Liczba wierszy próbki:",
+                                    initialvalue=100_000, minvalue=1, parent=self)
+        if not n:
+            return
+        self._load_csv_file(fp, rozmiar_probki=n)
 
-        self._set_busy("Wczytywanie pliku…")
-        df = wczytaj_csv(fp, separator=None, wyswietlaj_informacje=True)
-        if df is None:
+    def _load_full_data(self):
+        """Plik → Wczytaj pełne dane: zastępuje próbkę całym plikiem"""
+        if self.path is None or self.df is None:
+            messagebox.showwarning("Brak danych", "Najpierw wczytaj plik CSV!")
+            return
+        if self._sample_info is None:
+            messagebox.showinfo("Informacja", "Wczytano już pełne dane.")
+            return
+        self._load_csv_file(self.path)
+
+    def _load_csv_file(self, fp: str, rozmiar_probki: int | None = None):
+        """
+        Wczytuje plik (całość lub próbkę) progresywnie: pierwsza strona jest
+        pokazywana od razu, a reszta wczytywana w wątku roboczym. Do czasu
+        wczytania całości analizy są wyłączone.
+        """
+        if self._load_queue is not None:
+            messagebox.showwarning("Wczytywanie", "Trwa wczytywanie innego pliku.")
+            return
+
+        self._set_busy("Wczytywanie próbki…" if rozmiar_probki else "Wczytywanie pliku…")
+        self._set_analyses_enabled(False)
+        is_excel = fp.lower().endswith(ROZSZERZENIA_EXCEL)
+
+        # Pierwsza strona - tylko początkowe wiersze, od razu w tabeli wyników
+        # (skoroszyt Excela nie ma taniego podglądu - arkusze wczytywane są w tle)
+        self.file_info_var.set(f"Wczytywanie: {fp.split('/')[-1]}…")
+        if not is_excel:
+            try:
+                preview = wczytaj_poczatek_csv(fp, liczba_wierszy=max(self.page_size, 5000))
+                if hasattr(self, 'result_tree'):
+                    self._display_dataframe(preview)
+                self.file_info_var.set(f"Wczytywanie: {fp.split('/')[-1]} (podgląd {len(preview)} wierszy)…")
+            except Exception:
+                traceback.print_exc()
+
+        self._load_queue = queue.Queue()
+        load_queue = self._load_queue
+
+        def on_progress(read_bytes: int, total_bytes: int, rows: int) -> None:
+            load_queue.put(("progress", read_bytes, total_bytes, rows))
+
+        def on_sheet_progress(done_sheets: int, total_sheets: int, rows: int) -> None:
+            load_queue.put(("sheets", done_sheets, total_sheets, rows))
+
+        def worker() -> None:
+            try:
+                if is_excel:
+                    # Arkusze w osobnych procesach, wynik w cache kolumnowym
+                    df = wczytaj_excel(fp, wyswietlaj_informacje=True, uzyj_cache=True,
+                                       postep=on_sheet_progress)
+                else:
+                    # Błędne linie trafiają do pliku kwarantanny w katalogu cache
+                    quarantine = os.path.join(KATALOG_CACHE, 'kwarantanna', os.path.basename(fp) + '.csv')
+                    df = wczytaj_csv(fp, separator=None, wyswietlaj_informacje=True, uzyj_cache=True,
+                                     rozmiar_probki=rozmiar_probki, postep=on_progress,
+                                     plik_kwarantanny=quarantine)
+                load_queue.put(("done", df))
+            except Exception as e:
+                traceback.print_exc()
+                load_queue.put(("error", e))
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.after(100, self._poll_loading, fp)
+
+    def _poll_loading(self, fp: str) -> None:
+        """Odbiera komunikaty wątku wczytującego (Tk można aktualizować tylko z wątku głównego)"""
+        result = None
+        try:
+            while True:
+                msg = self._load_queue.get_nowait()
+                if msg[0] == "progress":
+                    _, read_bytes, total_bytes, rows = msg
+                    self.status_var.set(f"Wczytywanie… {read_bytes / 1024**2:.1f}/{total_bytes / 1024**2:.1f} MB"
+                                        f" ({read_bytes / max(1, total_bytes):.0%}), {rows:,} wierszy")
+                elif msg[0] == "sheets":
+                    _, done_sheets, total_sheets, rows = msg
+                    self.status_var.set(f"Wczytywanie… arkusze {done_sheets}/{total_sheets}, {rows:,} wierszy")
+                else:
+                    result = msg
+                    break
+        except queue.Empty:
+            pass
+
+        if result is None:
+            self.after(100, self._poll_loading, fp)
+            return
+
+        self._load_queue = None
+        self._set_analyses_enabled(True)
+        if result[0] == "error" or result[1] is None:
             self._set_ready()
             messagebox.showerror("Błąd", "Nie udało się wczytać pliku.")
             return
+        self._on_full_frame_loaded(fp, result[1])
 
+    def _on_full_frame_loaded(self, fp: str, df: pd.DataFrame) -> None:
+        """Podmienia podgląd na pełny DataFrame i odświeża wszystkie sekcje GUI"""
         self.df = df
         self.path = fp
-        self.file_info_var.set(f"Wczytano: {fp.split('/')[-1]} ({len(df)}×{len(df.columns)})")
+        self._sample_info = df.attrs.get('probkowanie')
+        opis = f"Wczytano: {fp.split('/')[-1]} ({len(df)}×{len(df.columns)})"
+        if self._sample_info is not None:
+            opis += f" – próbka {self._sample_info['czestosc']:.2%} wierszy"
+        quarantine = df.attrs.get('kwarantanna')
+        if quarantine:
+            opis += f" – {quarantine['liczba_linii']:,} błędnych linii w kwarantannie"
+        self.file_info_var.set(opis)
 
         # Ustaw current_result_df na oryginalne dane
         self.current_result_df = df.copy()
@@ -164,9 +288,40 @@ class MainApp(tk.Tk):
         if hasattr(self, 'result_tree'):
             self._display_dataframe(df)
 
-        messagebox.showinfo("OK", "Plik wczytany pomyślnie!")
+        if quarantine:
+            gdzie = f"\nZapisano je w pliku:\n{quarantine['plik']}" if quarantine.get('plik') else ""
+            messagebox.showwarning("Kwarantanna",
+                                   f"Plik wczytany, ale pominięto {quarantine['liczba_linii']:,} "
+                                   f"błędnych linii.{gdzie}")
+        else:
+            messagebox.showinfo("OK", "Plik wczytany pomyślnie!")
         self._set_ready()
 
+    def _set_analyses_enabled(self, enabled: bool) -> None:
+        """Włącza/wyłącza menu akcji, operacje na pliku i przyciski analiz w zakładkach"""
+        state = "normal" if enabled else "disabled"
+        self.menubar.entryconfig("Akcje", state=state)
+        for label in ("Wczytaj CSV", "Wczytaj próbkę CSV…", "Wczytaj pełne dane", "Zapisz wynik"):
+            self.plik_menu.entryconfig(label, state=state)
+
+        if enabled:
+            for widget in self._disabled_widgets:
+                if widget.winfo_exists():
+                    widget.state(["!disabled"])
+            self._disabled_widgets = []
+            return
+
+        # Paginacja tabeli wyników zostaje aktywna - można przeglądać podgląd
+        pagination = {getattr(self, name, None) for name in ("prev_btn", "next_btn")}
+        stack = [self.nb]
+        while stack:
+            widget = stack.pop()
+            stack.extend(widget.winfo_children())
+            if isinstance(widget, ttk.Button) and widget not in pagination \
+                    and not widget.instate(["disabled"]):
+                widget.state(["disabled"])
+                self._disabled_widgets.append(widget)
+
     def _commit_df(self, result, *, dict_key: str | None = None) -> None:
         """
         Przyjmuje:
@@ -239,12 +394,13 @@ class MainApp(tk.Tk):
             if not fp:
                 return
             self._set_busy("Wczytywanie pliku…")
-            df = wczytaj_csv(fp, separator=None, wyswietlaj_informacje=True)
+            df = wczytaj_csv(fp, separator=None, wyswietlaj_informacje=True, uzyj_cache=True)
             if df is None:
                 self._set_ready()
                 messagebox.showerror("Błąd", "Nie udało się wczytać pliku.")
                 return
             self.df, self.path = df, fp
+            self._sample_info = None
             self.file_info_var.set(f"Wczytano: {fp.split('/')[-1]} ({len(df)}×{len(df.columns)})")
             self.current_result_df = df.copy()
             if on_success:
@@ -695,7 +851,7 @@ class MainApp(tk.Tk):
         self.next_btn.state(["!disabled"] if page_num < total_pages else ["disabled"])
 
     def _save_result(self) -> None:
-        """Zapis wyniku do CSV"""
+        """Zapis wyniku (CSV, skompresowany CSV, Parquet, Feather) w tle z postępem"""
         if self.df is None:
             messagebox.showwarning("Brak danych", "Najpierw wczytaj plik CSV!")
             return
@@ -703,16 +859,58 @@ class MainApp(tk.Tk):
         # Jeśli nie ma wyników przetwarzania, zapisz oryginalne dane
         df_to_save = self.current_result_df if self.current_result_df is not None else self.df
 
-        file_path = filedialog.asksaveasfilename(
-            defaultextension=".csv",
-            filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")]
-        )
-        if file_path:
+        filetypes = [("CSV Files", "*.csv"), ("CSV gzip", "*.csv.gz")]
+        if ".csv.zst" in ROZSZERZENIA_EKSPORTU:
+            filetypes.append(("CSV zstd", "*.csv.zst"))
+        filetypes += [("Parquet", "*.parquet"), ("Feather", "*.feather"), ("All Files", "*.*")]
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=filetypes)
+        if not file_path:
+            return
+
+        export_queue = queue.Queue()
+
+        def on_progress(written: int, total: int) -> None:
+            export_queue.put(("progress", written, total))
+
+        def worker() -> None:
             try:
-                df_to_save.to_csv(file_path, index=False)
-                messagebox.showinfo("Sukces", f"Dane zapisano w: {file_path}")
+                eksportuj_dane(df_to_save, file_path, postep=on_progress, wyswietlaj_informacje=True)
+                export_queue.put(("done", None))
             except Exception as e:
-                messagebox.showerror("Błąd", f"Błąd podczas zapisu: {str(e)}")
+                traceback.print_exc()
+                export_queue.put(("error", e))
+
+        self.plik_menu.entryconfig("Zapisz wynik", state="disabled")
+        self._set_busy("Zapisywanie…")
+        threading.Thread(target=worker, daemon=True).start()
+        self.after(100, self._poll_export, export_queue, file_path)
+
+    def _poll_export(self, export_queue: queue.Queue, file_path: str) -> None:
+        """Odbiera postęp zapisu z wątku roboczego"""
+        result = None
+        try:
+            while True:
+                msg = export_queue.get_nowait()
+                if msg[0] == "progress":
+                    _, written, total = msg
+                    self.status_var.set(f"Zapisywanie… {written:,}/{total:,} wierszy "
+                                        f"({written / max(1, total):.0%})")
+                else:
+                    result = msg
+                    break
+        except queue.Empty:
+            pass
+
+        if result is None:
+            self.after(100, self._poll_export, export_queue, file_path)
+            return
+
+        self.plik_menu.entryconfig("Zapisz wynik", state="normal")
+        self._set_ready()
+        if result[0] == "error":
+            messagebox.showerror("Błąd", f"Błąd podczas zapisu: {str(result[1])}")
+        else:
+            messagebox.showinfo("Sukces", f"Dane zapisano w: {file_path}")
 
     def _build_duplicates_tab(self, parent):
         control_frame = ttk.Frame(parent)
@@ -1444,9 +1642,14 @@ class MainApp(tk.Tk):
         self.stats_tree = tree
 
         # Przycisk do obliczania statystyk
-        ttk.Button(tab, text="Oblicz statystyki",
-                   command=self._calculate_numeric_stats) \
-            .pack(anchor="w", padx=10, pady=(0, 6))
+        buttons = ttk.Frame(tab)
+        buttons.pack(fill="x", padx=10, pady=(0, 6))
+        ttk.Button(buttons, text="Oblicz statystyki",
+                   command=self._calculate_numeric_stats).pack(side="left")
+        # Pliki większe niż pamięć: statystyki porcjami, bez wczytywania do self.df
+        ttk.Button(buttons, text="Statystyki z plików (strumieniowo)…",
+                   command=self._calculate_numeric_stats_from_files).pack(side="left", padx=(6, 0))
+        self.numeric_stats_buttons = buttons
 
         # ARMATURA: loader CSV (ale bez automatycznego obliczania)
         self._add_loader(tab, on_success=None)
@@ -1464,7 +1667,7 @@ class MainApp(tk.Tk):
         self._set_busy("Obliczanie statystyk...")
         try:
             # Przekazujemy dataframe do funkcji analizującej
-            _, wyniki = analizuj_dane_numeryczne(self.df)
+            _, wyniki = analizuj_dane_numeryczne(self.df, zwroc_wartosci=False)
 
             # Odśwież Treeview
             self.stats_tree.delete(*self.stats_tree.get_children())
@@ -1472,7 +1675,7 @@ class MainApp(tk.Tk):
                 self.stats_tree.insert("", "end", values=(
                     kol,
                     staty["średnia"],
-                    staty["mediana"],
+                    self._median_text(staty),
                     staty["min"],
                     staty["max"],
                     staty["odchylenie_std"],
@@ -1486,6 +1689,85 @@ class MainApp(tk.Tk):
         finally:
             self._set_ready()
 
+    @staticmethod
+    def _median_text(staty: dict):
+        """Mediana do tabeli: z błędem, gdy przybliżona; '—' gdy niedostępna"""
+        if staty["mediana"] is None:
+            return "—"
+        if "błąd_mediany" in staty:
+            return f"{staty['mediana']:g} ± {staty['błąd_mediany']:g}"
+        return staty["mediana"]
+
+    def _calculate_numeric_stats_from_files(self):
+        """Statystyki liczbowe jednego lub kilku plików CSV liczone strumieniowo (mediana ze szkicu kwantyli)"""
+        paths = filedialog.askopenfilenames(
+            title="Wybierz pliki CSV",
+            filetypes=[("CSV", "*.csv *.csv.gz *.csv.bz2 *.csv.xz *.csv.zst"), ("Wszystkie", "*.*")]
+        )
+        if not paths:
+            return
+
+        def show(wyniki: dict) -> None:
+            self.stats_tree.delete(*self.stats_tree.get_children())
+            for kol, staty in wyniki.items():
+                self.stats_tree.insert("", "end", values=(
+                    kol,
+                    staty["średnia"],
+                    self._median_text(staty),
+                    staty["min"],
+                    staty["max"],
+                    staty["odchylenie_std"],
+                    staty["liczba_wartości"]
+                ))
+            if not wyniki:
+                messagebox.showinfo("Informacja", "Brak kolumn numerycznych do analizy.")
+
+        # Przebieg po plikach większych niż pamięć trwa długo - w wątku roboczym
+        self._run_in_background(
+            lambda: oblicz_statystyki_plikow(list(paths), blad_kwantyli=DOMYSLNY_BLAD_KWANTYLI,
+                                             wyswietlaj_informacje=True),
+            show, self.numeric_stats_buttons, "Obliczanie statystyk z plików...",
+            "Wystąpił problem podczas obliczania statystyk")
+
+    def _run_in_background(self, task, on_done, buttons: ttk.Frame, busy_msg: str, error_msg: str) -> None:
+        """
+        Uruchamia task() w wątku roboczym; wynik odbiera _poll_background (after)
+        i przekazuje do on_done w wątku Tk. Przyciski z ramki buttons są w tym czasie wyłączone.
+        """
+        result_queue = queue.Queue()
+
+        def worker() -> None:
+            try:
+                result_queue.put(("done", task()))
+            except Exception as e:
+                traceback.print_exc()
+                result_queue.put(("error", e))
+
+        for button in buttons.winfo_children():
+            button.configure(state="disabled")
+        self._set_busy(busy_msg)
+        threading.Thread(target=worker, daemon=True).start()
+        self.after(100, self._poll_background, result_queue, on_done, buttons, error_msg)
+
+    def _poll_background(self, result_queue: queue.Queue, on_done, buttons: ttk.Frame, error_msg: str) -> None:
+        """Odbiera wynik zadania z _run_in_background"""
+        try:
+            status, result = result_queue.get_nowait()
+        except queue.Empty:
+            self.after(100, self._poll_background, result_queue, on_done, buttons, error_msg)
+            return
+
+        self._set_ready()
+        # Zakładka mogła zostać zamknięta w trakcie obliczeń
+        if not buttons.winfo_exists():
+            return
+        for button in buttons.winfo_children():
+            button.configure(state="normal")
+        if status == "error":
+            messagebox.showerror("Błąd", f"{error_msg}: {str(result)}")
+        else:
+            on_done(result)
+
     def _calculate_and_display_stats(self, df):
         """Oblicza i wyświetla statystyki liczbowe dla wszystkich kolumn numerycznych"""
         if df is None:
@@ -1508,7 +1790,7 @@ class MainApp(tk.Tk):
         self._set_busy("Obliczanie statystyk...")
         try:
             # Przekazujemy dataframe do funkcji analizującej
-            _, wyniki = analizuj_dane_numeryczne(df)
+            _, wyniki = analizuj_dane_numeryczne(df, zwroc_wartosci=False)
 
             # Odśwież Treeview
             tree.delete(*tree.get_children())
@@ -1516,7 +1798,7 @@ class MainApp(tk.Tk):
                 tree.insert("", "end", values=(
                     kol,
                     staty["średnia"],
-                    staty["mediana"],
+                    self._median_text(staty),
                     staty["min"],
                     staty["max"],
                     staty["odchylenie_std"],
@@ -1551,10 +1833,14 @@ class MainApp(tk.Tk):
         tree, ybar, xbar = self._make_treeview(tab, cols)
         tree.pack(fill="both", expand=True, padx=10, pady=5)
 
-        # Przycisk analizy
-        ttk.Button(tab, text="Oblicz statystyki nieliczbowe",
-                   command=lambda: self._run_non_numeric_stats(tree)) \
-            .pack(anchor="w", padx=10, pady=(0, 6))
+        # Przyciski analizy
+        buttons = ttk.Frame(tab)
+        buttons.pack(fill="x", padx=10, pady=(0, 6))
+        ttk.Button(buttons, text="Oblicz statystyki nieliczbowe",
+                   command=lambda: self._run_non_numeric_stats(tree)).pack(side="left")
+        # Pliki większe niż pamięć: szkice HyperLogLog / Space-Saving porcjami
+        ttk.Button(buttons, text="Z plików (strumieniowo)…",
+                   command=lambda: self._run_non_numeric_stats_from_files(tree, buttons)).pack(side="left", padx=(6, 0))
 
     def _run_non_numeric_stats(self, tree: ttk.Treeview) -> None:
         if self.df is None:
@@ -1564,21 +1850,42 @@ class MainApp(tk.Tk):
         try:
             from Backend.Statystyka import oblicz_statystyki_nie_numeryczne
             stats = oblicz_statystyki_nie_numeryczne(self.df)
-            tree.delete(*tree.get_children())
-            for col_name, col_stats in stats.items():
-                tree.insert("", "end", values=(
-                    col_name,
-                    col_stats["liczba_wystapien"],
-                    col_stats["wartosci_unikalne"],
-                    col_stats["najczestsza_wartosc"],
-                    f"{col_stats['czestotliwosc_najczestszej'] * 100:.2f}",
-                    f"{col_stats['procent_wypelnienia']:.2f}"
-                ))
+            self._fill_non_numeric_tree(tree, stats)
         except Exception as e:
             messagebox.showerror("Błąd", str(e))
         finally:
             self._set_ready()
 
+    def _run_non_numeric_stats_from_files(self, tree: ttk.Treeview, buttons: ttk.Frame) -> None:
+        paths = filedialog.askopenfilenames(
+            title="Wybierz pliki CSV",
+            filetypes=[("CSV", "*.csv *.csv.gz *.csv.bz2 *.csv.xz *.csv.zst"), ("Wszystkie", "*.*")]
+        )
+        if not paths:
+            return
+        from Backend.Statystyka import oblicz_statystyki_nie_numeryczne_plikow
+        self._run_in_background(
+            lambda: oblicz_statystyki_nie_numeryczne_plikow(list(paths)),
+            lambda stats: self._fill_non_numeric_tree(tree, stats),
+            buttons, "Analiza nieliczbowa plików…",
+            "Wystąpił problem podczas analizy nieliczbowej")
+
+    @staticmethod
+    def _fill_non_numeric_tree(tree: ttk.Treeview, stats: dict) -> None:
+        tree.delete(*tree.get_children())
+        for col_name, col_stats in stats.items():
+            unique = col_stats["wartosci_unikalne"]
+            if "blad_unikalnych" in col_stats:
+                unique = f"~{unique} (±{col_stats['blad_unikalnych'] * 100:.1f}%)"
+            tree.insert("", "end", values=(
+                col_name,
+                col_stats["liczba_wystapien"],
+                unique,
+                col_stats["najczestsza_wartosc"],
+                f"{col_stats['czestotliwosc_najczestszej'] * 100:.2f}",
+                f"{col_stats['procent_wypelnienia']:.2f}"
+            ))
+
     # ---------- Korelacje -------------------------------------------------
     # wewnątrz klasy MainApp
     def _build_corr_tab(self) -> None:
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Pakiety Dane i Backend importowane są z katalogu głównego repozytorium
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,30 @@
+import pandas as pd
+
+from Dane.Dane import UnifikatorKategorii, wczytaj_csv
+
+
+def test_kolumna_liczbowa_w_jednej_czesci_kategoria_w_innej():
+    liczbowa = pd.DataFrame({'kod': pd.array([10001, None, 10002], dtype='Int32')})
+    tekstowa = pd.DataFrame({'kod': pd.Categorical(['10001A', '10002'])})
+
+    for czesci in ([liczbowa.copy(), tekstowa.copy()], [tekstowa.copy(), liczbowa.copy()]):
+        unifikator = UnifikatorKategorii()
+        df = unifikator.polacz([unifikator.dodaj(c) for c in czesci])
+
+        assert isinstance(df['kod'].dtype, pd.CategoricalDtype)
+        assert sorted(df['kod'].dropna().tolist()) == ['10001', '10001A', '10002', '10002']
+        assert df['kod'].isna().sum() == 1
+
+
+def test_wczytaj_csv_kod_zmienia_typ_miedzy_chunkami(tmp_path):
+    # Pierwszy chunk (100 tys. wierszy) ma same liczby, dalsze kody z literą
+    liczba_wierszy = 200_000
+    kody = [str(10_000 + i % 300) for i in range(liczba_wierszy)]
+    kody[120_000:] = [kod + 'A' for kod in kody[120_000:]]
+    sciezka = tmp_path / 'mixed.csv'
+    pd.DataFrame({'x': [i % 100 for i in range(liczba_wierszy)], 'StockCode': kody}).to_csv(sciezka, index=False)
+
+    df = wczytaj_csv(str(sciezka), filtry=[('x', '>=', 0)], wyswietlaj_informacje=False)
+
+    assert len(df) == liczba_wierszy
+    assert df['StockCode'].astype(str).tolist() == kody
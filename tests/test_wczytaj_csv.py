@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+import Dane.Dane as dane
+
+
+def test_schemat_z_filtrami_i_polami_w_cudzyslowach(tmp_path, monkeypatch):
+    # Małe zakresy, żeby plik był dzielony; cudzysłów w polu bez cudzysłowów
+    # przesuwa granicę do wnętrza pola wieloliniowego
+    monkeypatch.setattr(dane, 'ROZMIAR_ZAKRESU', 16 * 1024)
+    wiersze = ['id,opis']
+    for i in range(20_000):
+        wiersze.append(f'{i},12" pizza' if i % 5 == 0 else (f'{i},"a\nb"' if i % 7 == 0 else f'{i},zwykly'))
+    sciezka = tmp_path / 'cudzyslowy.csv'
+    sciezka.write_text('\n'.join(wiersze) + '\n')
+
+    df = dane.wczytaj_csv(str(sciezka), schemat_z_probki=True, filtry=[('id', '>=', 10)],
+                          wyswietlaj_informacje=False)
+
+    oczekiwane = pd.read_csv(sciezka)
+    oczekiwane = oczekiwane[oczekiwane['id'] >= 10]
+    assert df['id'].tolist() == oczekiwane['id'].tolist()
+    assert df['opis'].astype(str).tolist() == oczekiwane['opis'].tolist()
+
+
+def test_probka_przechodzi_na_silnik_python(tmp_path):
+    # Separator wieloznakowy nie jest obsługiwany przez silnik c (ValueError)
+    sciezka = tmp_path / 'separator.csv'
+    sciezka.write_text('a::k\n' + ''.join(f'{i}::{"xy"[i % 2]}\n' for i in range(100)))
+
+    df = dane.wczytaj_csv(str(sciezka), separator='::', rozmiar_probki=10, kolumna_warstw='k',
+                          ziarno=1, wyswietlaj_informacje=False)
+
+    assert len(df) == 10
+    assert sorted(df['k'].astype(str).unique()) == ['x', 'y']
+
+
+def test_probka_bez_kolumny_warstw(tmp_path):
+    sciezka = tmp_path / 'bez_warstw.csv'
+    sciezka.write_text('a,b\n1,2\n3,4\n')
+
+    with pytest.raises(dane.BrakKolumnyWarstw):
+        dane.wczytaj_csv(str(sciezka), rozmiar_probki=1, kolumna_warstw='k', wyswietlaj_informacje=False)
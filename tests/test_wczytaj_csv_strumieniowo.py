@@ -0,0 +1,29 @@
+import pandas as pd
+
+from Dane.Dane import wczytaj_csv_strumieniowo
+
+
+def test_pola_wieloliniowe_w_cudzyslowach(tmp_path):
+    liczba_wierszy = 20_000
+    opisy = [f'linia {i}\nciąg dalszy, "cytat"' if i % 3 == 0 else f'opis {i}' for i in range(liczba_wierszy)]
+    sciezka = tmp_path / 'wieloliniowe.csv'
+    pd.DataFrame({'id': range(liczba_wierszy), 'opis': opisy}).to_csv(sciezka, index=False)
+
+    df = pd.concat(wczytaj_csv_strumieniowo(str(sciezka), rozmiar_chunka=64 * 1024), ignore_index=True)
+
+    assert df['id'].tolist() == list(range(liczba_wierszy))
+    assert df['opis'].astype(str).tolist() == opisy
+
+
+def test_cudzyslow_w_polu_bez_cudzyslowow(tmp_path):
+    # Cudzysłów w środku pola psuje parzystość - reszta pliku czytana sekwencyjnie
+    wiersze = ['id,opis']
+    for i in range(20_000):
+        wiersze.append(f'{i},12" pizza' if i % 5 == 0 else (f'{i},"a\nb"' if i % 7 == 0 else f'{i},zwykly'))
+    sciezka = tmp_path / 'cudzyslowy.csv'
+    sciezka.write_text('\n'.join(wiersze) + '\n')
+
+    df = pd.concat(wczytaj_csv_strumieniowo(str(sciezka), rozmiar_chunka=16 * 1024), ignore_index=True)
+
+    assert df['id'].tolist() == list(range(20_000))
+    assert df['opis'].astype(str).tolist() == pd.read_csv(sciezka)['opis'].tolist()